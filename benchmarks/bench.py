@@ -0,0 +1,88 @@
+import argparse, json, os, subprocess, sys, tempfile, time
+from pathlib import Path
+from .mockserver import MockGitHub, MockSettings
+
+# Each case runs in its own interpreter so that peak memory is measured per run.
+CHILD = """
+import resource, sys
+from gitfo.main import app
+try:
+    app(sys.argv[1:], standalone_mode=False)
+finally:
+    print("maxrss_kb", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, file=sys.stderr)
+"""
+
+def writeSource(path: Path, command: str, size: int)-> None:
+    with open(path, "w") as f:
+        for i in range(size):
+            f.write(f"bench-owner{i % 50}/repo{i}\n" if command == "repobatch" else f"bench-user{i}\n")
+
+def runCase(mock: MockGitHub, workdir: Path, command: str, size: int, fileType: str, workers: int, extra: list)-> dict:
+    source = workdir/f"{command}-{size}.txt"
+    if not source.exists():
+        writeSource(source, command, size)
+    output = workdir/f"{command}-{size}.{fileType}"
+
+    args = ["--api-url", mock.url, "--no-cache", command, str(source), str(output), "--workers", str(workers)] + extra
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(Path(__file__).resolve().parent.parent), os.environ.get("PYTHONPATH", "")]))
+
+    startRequests = mock.requests
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", CHILD] + args, capture_output=True, text=True, env=env)
+    wall = time.perf_counter() - start
+    requests = mock.requests - startRequests
+
+    maxrss = None
+    for line in proc.stderr.splitlines():
+        if line.startswith("maxrss_kb"):
+            maxrss = int(line.split()[1])
+
+    return {
+        "command": command,
+        "targets": size,
+        "format": fileType,
+        "workers": workers,
+        "exit_code": proc.returncode,
+        "requests": requests,
+        "wall_s": round(wall, 3),
+        "requests_per_s": round(requests / wall, 1) if wall else None,
+        "peak_memory_mb": round(maxrss / 1024, 1) if maxrss else None,
+    }
+
+def main(argv: list=None)-> list:
+    parser = argparse.ArgumentParser(description="End-to-end throughput benchmark against a local mock Github API.")
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated batch sizes, e.g. 1000,10000,100000.")
+    parser.add_argument("--formats", default="json,jsonl,csv,txt")
+    parser.add_argument("--commands", default="repobatch,userbatch")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated per-request latency in seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--branches", type=int, default=3)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    parser.add_argument("--full", action="store_true", help="Pass --full to repobatch.")
+    parser.add_argument("--backend", choices=["rest", "graphql"], default="rest", help="Backend used by repobatch. GraphQL runs with a dummy token.")
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this file.")
+    args = parser.parse_args(argv)
+
+    settings = MockSettings(args.latency, args.error_rate, args.branches, args.rate_limit)
+    results = []
+    with MockGitHub(settings) as mock, tempfile.TemporaryDirectory() as tmp:
+        for command in args.commands.split(","):
+            extra = []
+            if command == "repobatch":
+                extra += ["--full"] if args.full else []
+                extra += ["--backend", "graphql", "-a", "bench-token"] if args.backend == "graphql" else []
+            for size in [int(size) for size in args.sizes.split(",")]:
+                for fileType in args.formats.split(","):
+                    result = runCase(mock, Path(tmp), command, size, fileType, args.workers, extra)
+                    results.append(result)
+                    print(json.dumps(result), flush=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+import hashlib, json, random, re, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+class MockSettings:
+    def __init__(self, latency: float=0.0, errorRate: float=0.0, branches: int=3, rateLimit: int=None, rateWindow: float=3600.0, seed: int=0, ownerRepos: int=150):
+        self.latency = latency
+        self.errorRate = errorRate
+        self.branches = branches
+        self.ownerRepos = ownerRepos
+        self.rateLimit = rateLimit
+        self.rateWindow = rateWindow
+        self.random = random.Random(seed)
+
+def _number(name: str, mod: int)-> int:
+    return int(hashlib.md5(name.lower().encode()).hexdigest()[:8], 16) % mod
+
+def _repo(owner: str, name: str)-> dict:
+    fullName = f"{owner}/{name}"
+    return {
+        "name": name,
+        "full_name": fullName,
+        "description": f"Mock repository {fullName}",
+        "html_url": f"https://github.com/{fullName}",
+        "visibility": "public",
+        "license": {"name": "MIT License"},
+        "stargazers_count": _number(fullName, 10000),
+        "forks_count": _number(fullName + "forks", 1000),
+        "subscribers_count": _number(fullName + "watchers", 500),
+        "open_issues_count": _number(fullName + "issues", 100),
+        "default_branch": "main",
+        "created_at": "2020-01-01T00:00:00Z",
+        "updated_at": "2025-01-01T00:00:00Z",
+        "pushed_at": "2025-01-01T00:00:00Z",
+        "topics": ["mock"],
+        "owner": {"login": owner, "type": "Organization" if _number(owner, 2) else "User"},
+    }
+
+def _user(login: str)-> dict:
+    return {
+        "login": login,
+        "id": _number(login, 10 ** 8),
+        "type": "User",
+        "name": login.title(),
+        "company": None,
+        "blog": "",
+        "location": None,
+        "email": None,
+        "bio": None,
+        "twitter_username": None,
+        "public_repos": _number(login, 300),
+        "public_gists": 0,
+        "followers": _number(login + "followers", 5000),
+        "following": 0,
+        "created_at": "2015-01-01T00:00:00Z",
+        "updated_at": "2025-01-01T00:00:00Z",
+    }
+
+GRAPHQL_REPOSITORY = re.compile(r"(?:(\w+)\s*:\s*)?repository\(owner:\s*\$(\w+),\s*name:\s*\$(\w+)\)")
+
+def _repoNode(owner: str, name: str, branches: int)-> dict:
+    # Every field the client may select is returned, extra ones are simply ignored.
+    data = _repo(owner, name)
+    fullName = data["full_name"]
+    pullRequests = _number(fullName, 50)
+    languages = [("Python", 1000 + _number(fullName, 9000)), ("Shell", _number(fullName + "sh", 500))]
+    return {
+        "name": name,
+        "nameWithOwner": fullName,
+        "description": data["description"],
+        "url": data["html_url"],
+        "visibility": "PUBLIC",
+        "licenseInfo": data["license"],
+        "stargazerCount": data["stargazers_count"],
+        "forkCount": data["forks_count"],
+        "watchers": {"totalCount": data["subscribers_count"]},
+        "issues": {"totalCount": max(data["open_issues_count"] - pullRequests, 0)},
+        "pullRequests": {"totalCount": pullRequests},
+        "defaultBranchRef": {"name": data["default_branch"]},
+        "createdAt": data["created_at"],
+        "updatedAt": data["updated_at"],
+        "pushedAt": data["pushed_at"],
+        "repositoryTopics": {"nodes": [{"topic": {"name": topic}} for topic in data["topics"]]},
+        "owner": {"login": owner, "__typename": data["owner"]["type"]},
+        "latestRelease": {"tagName": "v1.0.0", "name": "v1.0.0", "publishedAt": "2025-01-01T00:00:00Z", "description": "Release notes", "url": f"https://github.com/{fullName}/releases/tag/v1.0.0"},
+        "refs": {"totalCount": branches, "nodes": [{"name": f"branch-{i}"} for i in range(min(branches, 100))]},
+        "languages": {"totalSize": sum(size for _, size in languages), "edges": [{"size": size, "node": {"name": language}} for language, size in languages]},
+    }
+
+class MockGitHub:
+    def __init__(self, settings: MockSettings=None, host: str="127.0.0.1", port: int=0):
+        self.settings = settings or MockSettings()
+        self.requests = 0
+        self.notModified = 0
+        self._lock = threading.Lock()
+        self._windowStart = time.time()
+        self._used = 0
+        self.server = ThreadingHTTPServer((host, port), self._handlerClass())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self)-> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self)-> None:
+        self._thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+
+    def stop(self)-> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _spend(self)-> tuple:
+        with self._lock:
+            self.requests += 1
+            now = time.time()
+            if now - self._windowStart >= self.settings.rateWindow:
+                self._windowStart = now
+                self._used = 0
+            self._used += 1
+            limit = self.settings.rateLimit or 5000
+            remaining = limit - self._used if self.settings.rateLimit else limit
+            return limit, remaining, int(self._windowStart + self.settings.rateWindow)
+
+    def _paginate(self, path: str, total: int, makeItem, page: int, perPage: int)-> tuple:
+        lastPage = max((total + perPage - 1) // perPage, 1)
+        start = (page - 1) * perPage
+        items = [makeItem(i) for i in range(start, min(start + perPage, total))]
+        headers = {}
+        if lastPage > 1:
+            headers["Link"] = f'<{self.url}{path}?per_page={perPage}&page={lastPage}>; rel="last"'
+        return 200, items, headers
+
+    def route(self, path: str, query: dict)-> tuple:
+        page = int(query.get("page", ["1"])[0])
+        perPage = int(query.get("per_page", ["30"])[0])
+
+        if path == "/rate_limit":
+            limit = self.settings.rateLimit or 5000
+            resources = {name: {"limit": limit, "used": 0, "remaining": limit, "reset": int(time.time() + 3600)} for name in ["core", "search", "graphql"]}
+            return 200, {"resources": resources}, {}
+        if path == "/search/issues":
+            target = query.get("q", [""])[0].split("+")[0].split(" ")[0].removeprefix("repo:")
+            return 200, {"total_count": _number(target, 50), "items": []}, {}
+
+        match = re.fullmatch(r"/(?:orgs|users)/([^/]+)/repos", path)
+        if match:
+            owner = match.group(1)
+            if "missing" in owner:
+                return 404, {"message": "Not Found"}, {}
+            # Listings leave out subscribers_count, like the real API.
+            listed = lambda i: {key: value for key, value in _repo(owner, f"repo{i}").items() if key != "subscribers_count"}
+            return self._paginate(path, self.settings.ownerRepos, listed, page, perPage)
+
+        match = re.fullmatch(r"/users/([^/]+)", path)
+        if match:
+            login = match.group(1)
+            if "missing" in login:
+                return 404, {"message": "Not Found"}, {}
+            return 200, {**_user(login), "public_repos": self.settings.ownerRepos}, {}
+
+        match = re.fullmatch(r"/repos/([^/]+)/([^/]+)(/.*)?", path)
+        if not match:
+            return 404, {"message": "Not Found"}, {}
+
+        owner, name, rest = match.group(1), match.group(2), match.group(3) or ""
+        if "missing" in name:
+            return 404, {"message": "Not Found"}, {}
+
+        fullName = f"{owner}/{name}"
+        match rest:
+            case "":
+                return 200, _repo(owner, name), {}
+            case "/languages":
+                return 200, {"Python": 1000 + _number(fullName, 9000), "Shell": _number(fullName + "sh", 500)}, {}
+            case "/releases/latest":
+                return 200, {"tag_name": "v1.0.0", "name": "v1.0.0", "published_at": "2025-01-01T00:00:00Z", "body": "Release notes", "html_url": f"https://github.com/{fullName}/releases/tag/v1.0.0"}, {}
+            case "/branches":
+                return self._paginate(path, self.settings.branches, lambda i: {"name": f"branch-{i}"}, page, perPage)
+        return 404, {"message": "Not Found"}, {}
+
+    def graphql(self, payload: dict)-> dict:
+        # Only the aliased repository lookups that gitfo sends are understood.
+        variables = payload.get("variables") or {}
+        data = {}
+        errors = []
+        for alias, ownerVar, nameVar in GRAPHQL_REPOSITORY.findall(payload.get("query") or ""):
+            owner, name = variables.get(ownerVar), variables.get(nameVar)
+            key = alias or "repository"
+            if not owner or not name or "missing" in name:
+                data[key] = None
+                errors.append({"type": "NOT_FOUND", "path": [key], "message": f"Could not resolve to a Repository with the name '{owner}/{name}'."})
+                continue
+            data[key] = _repoNode(owner, name, self.settings.branches)
+
+        response = {"data": data}
+        if errors:
+            response["errors"] = errors
+        return response
+
+    def _handlerClass(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, headers: dict)-> None:
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _start(self, resource: str)-> tuple:
+                settings = mock.settings
+                if settings.latency:
+                    time.sleep(settings.latency)
+
+                limit, remaining, reset = mock._spend()
+                headers = {
+                    "Content-Type": "application/json",
+                    "X-RateLimit-Limit": str(limit),
+                    "X-RateLimit-Remaining": str(max(remaining, 0)),
+                    "X-RateLimit-Reset": str(reset),
+                    "X-RateLimit-Resource": resource,
+                }
+                failed = settings.errorRate and settings.random.random() < settings.errorRate
+                return headers, remaining, failed
+
+            def do_POST(self):
+                if urlsplit(self.path).path != "/graphql":
+                    self._send(404, b'{"message": "Not Found"}', {"Content-Type": "application/json"})
+                    return
+
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                headers, remaining, failed = self._start("graphql")
+
+                # Like GitHub, a spent GraphQL quota is answered with a 200 carrying a RATE_LIMITED error.
+                if remaining < 0:
+                    self._send(200, b'{"data": null, "errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded."}]}', headers)
+                    return
+                if failed:
+                    self._send(502, b"Bad Gateway", {"Content-Type": "text/plain"})
+                    return
+
+                self._send(200, json.dumps(mock.graphql(payload)).encode(), headers)
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                headers, remaining, failed = self._start("search" if parts.path.startswith("/search/") else "core")
+
+                if remaining < 0:
+                    self._send(403, b'{"message": "API rate limit exceeded."}', headers)
+                    return
+                if failed:
+                    self._send(502, b"Bad Gateway", {"Content-Type": "text/plain"})
+                    return
+
+                status, data, extra = mock.route(parts.path, parse_qs(parts.query))
+                body = json.dumps(data).encode()
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                headers.update(extra)
+                headers["ETag"] = etag
+
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    with mock._lock:
+                        mock.notModified += 1
+                    self._send(304, b"", headers)
+                    return
+
+                self._send(status, body, headers)
+
+        return Handler
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local stand-in for the Github REST and GraphQL APIs.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--branches", type=int, default=3)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    parser.add_argument("--owner-repos", type=int, default=150)
+    args = parser.parse_args()
+
+    mock = MockGitHub(MockSettings(args.latency, args.error_rate, args.branches, args.rate_limit, ownerRepos=args.owner_repos), port=args.port)
+    print(f"Serving mock Github API on {mock.url}")
+    mock.server.serve_forever()
@@ -0,0 +1,135 @@
+import hashlib, json, os, threading, time, uuid
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+PRUNE_RATIO = 0.9
+STALE_TMP_AGE = 3600
+
+def getDefaultCacheDir()-> Path:
+    if os.environ.get("GITFO_CACHE_DIR"):
+        return Path(os.environ["GITFO_CACHE_DIR"])
+
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home()/".cache"
+    return Path(base)/"gitfo"
+
+def makeKey(url: str, token: str)-> str:
+    owner = hashlib.sha256(token.encode()).hexdigest()[:16] if token else "anonymous"
+    return f"{owner} {url}"
+
+class ResponseCache:
+    def __init__(self, directory: Path, maxBytes: int=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)/"responses"
+        self.maxBytes = maxBytes
+        self._lock = threading.Lock()
+        self._size = None
+
+    def _path(self, key: str)-> Path:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.directory/digest[:2]/f"{digest}.json"
+
+    def _files(self)-> list:
+        if not self.directory.is_dir():
+            return []
+        return [path for path in self.directory.glob("*/*.json")]
+
+    def _sweepTmp(self)-> None:
+        # A write that died before os.replace leaves its temporary file behind. Recent ones may still be in flight.
+        if not self.directory.is_dir():
+            return
+
+        cutoff = time.time() - STALE_TMP_AGE
+        for path in self.directory.glob("*/*.tmp"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                continue
+
+    def get(self, key: str)-> dict | None:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("key") != key:
+            return None
+
+        # The modification time doubles as the last-used time for LRU eviction.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return entry
+
+    def put(self, key: str, entry: dict)-> None:
+        path = self._path(key)
+        # Entries hold authenticated responses, possibly of private repositories, so only the owner may read them.
+        for directory in (self.directory.parent, self.directory, path.parent):
+            directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+        data = json.dumps({"key": key, **entry}, ensure_ascii=False).encode("utf-8")
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+
+        with self._lock:
+            try:
+                previous = path.stat().st_size
+            except OSError:
+                previous = 0
+            os.replace(tmp, path)
+
+            if self._size is None:
+                self._size = sum(p.stat().st_size for p in self._files())
+            else:
+                self._size += len(data) - previous
+
+            overLimit = self._size > self.maxBytes
+
+        if overLimit:
+            self.prune(int(self.maxBytes * PRUNE_RATIO))
+
+    def prune(self, maxBytes: int=None)-> int:
+        if maxBytes is None:
+            maxBytes = self.maxBytes
+
+        with self._lock:
+            self._sweepTmp()
+            files = []
+            for path in self._files():
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+            files.sort()
+            total = sum(size for _, size, _ in files)
+            removed = 0
+            for _, size, path in files:
+                if total <= maxBytes:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+
+            self._size = total
+            return removed
+
+    def stats(self)-> dict:
+        files = self._files()
+        size = sum(path.stat().st_size for path in files)
+
+        return {
+            "directory": str(self.directory),
+            "entries": len(files),
+            "size_bytes": size,
+            "max_bytes": self.maxBytes,
+        }
@@ -0,0 +1,192 @@
+import json, os, typer
+from pathlib import Path
+from .cache import getDefaultCacheDir
+
+STATE_FILE = "daemon.json"
+DEFAULT_PORT = 8787
+KEY_HEADER = "X-Gitfo-Key"
+LOOKUP_TIMEOUT = 300
+
+_forwarding = False
+_settings = {}
+
+def getStatePath()-> Path:
+    return getDefaultCacheDir()/STATE_FILE
+
+def setForwarding(enabled: bool, settings: dict=None)-> None:
+    global _forwarding, _settings
+    _forwarding = enabled
+    _settings = settings or {}
+
+def getSettings()-> dict:
+    return _settings
+
+def readState()-> dict | None:
+    try:
+        with open(getStatePath(), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) else None
+
+def getRunning()-> dict | None:
+    state = readState()
+    return state if state is not None and _isAlive(state.get("pid")) else None
+
+def _isAlive(pid)-> bool:
+    if not isinstance(pid, int):
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _writeState(state: dict)-> None:
+    path = getStatePath()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # The state file holds the request key, so only the owner may read it.
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+def _removeState(state: dict)-> None:
+    if readState() == state:
+        try:
+            getStatePath().unlink()
+        except OSError:
+            pass
+
+class DaemonServer:
+    def __init__(self, operations: dict, host: str="127.0.0.1", port: int=DEFAULT_PORT, apiUrl: str=None, settings: dict=None):
+        from http.server import ThreadingHTTPServer
+
+        self.operations = operations
+        self.apiUrl = apiUrl
+        self.settings = settings or {}
+        self.key = os.urandom(16).hex()
+        self.server = ThreadingHTTPServer((host, port), self._handlerClass())
+        self.server.daemon_threads = True
+        self.state = None
+
+    @property
+    def url(self)-> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve(self)-> None:
+        self.state = {"url": self.url, "pid": os.getpid(), "key": self.key, "api_url": self.apiUrl, "settings": self.settings}
+        _writeState(self.state)
+        try:
+            self.server.serve_forever(poll_interval=0.2)
+        finally:
+            self.server.server_close()
+            _removeState(self.state)
+
+    def stop(self)-> None:
+        self.server.shutdown()
+
+    def _handlerClass(self):
+        from http.server import BaseHTTPRequestHandler
+        from collections.abc import Mapping
+        from .transport import ApiUnavailable
+        from .util import toPlain
+
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _sendJson(self, status: int, data: dict)-> None:
+                body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path != "/health":
+                    self._sendJson(404, {"message": "Not Found"})
+                    return
+                self._sendJson(200, {"pid": os.getpid()})
+
+            def do_POST(self):
+                if self.headers.get(KEY_HEADER) != daemon.key:
+                    self._sendJson(403, {"message": "Bad daemon key"})
+                    return
+
+                operation = daemon.operations.get(self.path.strip("/"))
+                if operation is None:
+                    self._sendJson(404, {"message": "Not Found"})
+                    return
+
+                try:
+                    params = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                    result = operation(params)
+                    if isinstance(result, Mapping):
+                        self._sendJson(200, toPlain(result))
+                        return
+
+                    # Streamed results are written as JSON lines and end when the connection closes.
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/x-ndjson")
+                    self.end_headers()
+                    for row in result:
+                        self.wfile.write((json.dumps(toPlain(row), ensure_ascii=False) + "\n").encode("utf-8"))
+                        self.wfile.flush()
+                except ApiUnavailable as e:
+                    self._sendJson(502, {"unavailable": e.url})
+                except (ValueError, KeyError) as e:
+                    self._sendJson(400, {"message": f"Bad request: {e}"})
+
+        return Handler
+
+def _readLines(response):
+    with response:
+        for line in response:
+            yield json.loads(line)
+
+def forward(operation: str, params: dict, stream: bool=False):
+    if not _forwarding:
+        return None
+
+    from .github_api import getApiUrl
+    state = readState()
+    # The daemon answers with its own cache and retry settings, so a command asking for others runs locally.
+    if state is None or state.get("api_url") != getApiUrl() or state.get("settings", {}) != _settings:
+        return None
+
+    import urllib.request, urllib.error
+    request = urllib.request.Request(
+        f"{state['url']}/{operation}",
+        data=json.dumps(params).encode("utf-8"),
+        headers={"Content-Type": "application/json", KEY_HEADER: state.get("key", "")},
+        method="POST",
+    )
+    try:
+        # Proxies from the environment are skipped, since the daemon is local.
+        opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+        response = opener.open(request, timeout=None if stream else LOOKUP_TIMEOUT)
+    except urllib.error.HTTPError as e:
+        if e.code == 502:
+            from .transport import ApiUnavailable
+            typer.secho("Api not responding. Try again later.", fg=typer.colors.RED, err=True)
+            raise ApiUnavailable(json.load(e).get("unavailable"))
+        return None
+    except OSError:
+        # A daemon that died without cleaning up leaves its state file behind.
+        if not _isAlive(state.get("pid")):
+            _removeState(state)
+        return None
+
+    if stream:
+        return _readLines(response)
+    with response:
+        return json.load(response)
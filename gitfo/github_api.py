@@ -1,31 +1,47 @@
-import requests, typer
-from .util import getHeaders
+import re, os
+from . import transport
+from .stats import instrument
+from .util import mapOrdered
+from .records import makeRepo, makeOwner, makeUser, ReleaseRecord, LanguagesRecord
 
-def getRepoInfo(target: str, token: str)-> dict:
+DEFAULT_API_URL = "https://api.github.com"
+API_URL = os.environ.get("GITFO_API_URL", DEFAULT_API_URL).rstrip("/")
+PER_PAGE = 100
+PAGE_WORKERS = 4
 
-    headers = getHeaders(token)
+def setApiUrl(url: str)-> None:
+    global API_URL
+    API_URL = url.rstrip("/")
 
-    try:
-        req = requests.get(f"https://api.github.com/repos/{target}", headers=headers, timeout=10)
-    except requests.exceptions.RequestException:
-        typer.secho("Api not responding. Try again later.", fg=typer.colors.RED)
-        raise typer.Exit()
+def getApiUrl()-> str:
+    return API_URL
 
-    data = req.json()
+def getGraphqlUrl()-> str:
+    return f"{API_URL}/graphql"
 
-    msg = data.get("message")
-    if msg != None:
-        if "Not Found" in msg:
-            return {
-                "full_name": target,
-                "error": msg
-            }
-        else:
-            return {
-                "message": msg,
-            }
+def getLastPage(link)-> int | None:
+    if not isinstance(link, str):
+        return None
 
-    return {
+    match = re.search(r'<[^>]*[?&]page=(\d+)[^>]*>;\s*rel="last"', link)
+    return int(match.group(1)) if match else None
+
+def getPages(url: str, token: str):
+    separator = "&" if "?" in url else "?"
+    req = transport.get(f"{url}{separator}per_page={PER_PAGE}", token)
+    first = req.json()
+    yield first
+
+    lastPage = getLastPage(req.headers.get("Link"))
+    if not isinstance(first, list) or lastPage is None:
+        return
+
+    # The last page number is known up front, so the remaining pages are fetched together.
+    fetchPage = lambda page: transport.get(f"{url}{separator}per_page={PER_PAGE}&page={page}", token).json()
+    yield from mapOrdered(fetchPage, range(2, lastPage + 1), PAGE_WORKERS)
+
+def _projectRepo(data: dict)-> dict:
+    return makeRepo({
         "name": data.get("name"),
         "full_name": data.get("full_name"),
         "description": data.get("description"),
@@ -39,21 +55,47 @@ def getRepoInfo(target: str, token: str)-> dict:
         "default_branch": data.get("default_branch"),
         "created_at": data.get("created_at"),
         "updated_at": data.get("updated_at"),
+        "pushed_at": data.get("pushed_at"),
         "topics": data.get("topics", []),
-        "owner": {
-            "login": data["owner"]["login"],
-            "type": data["owner"]["type"]
-        }
-    }
+        "owner": makeOwner(data["owner"]["login"], data["owner"]["type"]),
+    })
 
-def getLanguagesInfo(target: str, token: str)-> dict:
-    headers = getHeaders(token)
+@instrument
+def getRepoInfo(target: str, token: str)-> dict:
+    req = transport.get(f"{API_URL}/repos/{target}", token)
+
+    data = req.json()
+
+    msg = data.get("message")
+    if msg != None:
+        if "Not Found" in msg:
+            return {
+                "full_name": target,
+                "error": msg
+            }
+        else:
+            return {
+                "message": msg,
+            }
 
-    try:
-        req = requests.get(f"https://api.github.com/repos/{target}/languages", headers=headers, timeout=10)
-    except requests.exceptions.RequestException:
-        typer.secho("Api not responding. Try again later.", fg=typer.colors.RED)
-        raise typer.Exit()
+    return _projectRepo(data)
+
+@instrument
+def getOwnerRepos(owner: str, token: str, kind: str="users"):
+    # Listed repositories are full objects except for subscribers_count, so watchers stays None.
+    for data in getPages(f"{API_URL}/{kind}/{owner}/repos", token):
+        if isinstance(data, dict):
+            yield {
+                "message": data.get("message"),
+            }
+            return
+
+        for item in data:
+            yield _projectRepo(item)
+
+@instrument
+def getLanguagesInfo(target: str, token: str)-> dict:
+    req = transport.get(f"{API_URL}/repos/{target}/languages", token)
     
     data = req.json()
 
@@ -64,25 +106,23 @@ def getLanguagesInfo(target: str, token: str)-> dict:
     
     total = sum(data.values())
     if total == 0:
-        return {"languages": {}}
+        return {"languages": LanguagesRecord(), "language_bytes": LanguagesRecord()}
 
-    percentages = {
-        lang: round((bytes_ / total) * 100, 2)
-        for lang, bytes_ in sorted(data.items(), key=lambda x: x[1], reverse=True)
-    }
+    # The rounded percentages cannot be summed across repositories, so the raw byte counts are kept too.
+    sizes = sorted(data.items(), key=lambda x: x[1], reverse=True)
+    percentages = LanguagesRecord(
+        (lang, round((bytes_ / total) * 100, 2))
+        for lang, bytes_ in sizes
+    )
 
     return {
         "languages": percentages,
+        "language_bytes": LanguagesRecord(sizes),
     }
 
+@instrument
 def getReleasesInfo(target: str, token: str)-> dict:
-    headers = getHeaders(token)
-
-    try:
-        req = requests.get(f"https://api.github.com/repos/{target}/releases/latest", headers=headers, timeout=10)
-    except requests.exceptions.RequestException:
-        typer.secho("Api not responding. Try again later.", fg=typer.colors.RED)
-        raise typer.Exit()
+    req = transport.get(f"{API_URL}/repos/{target}/releases/latest", token)
     
     data = req.json()
 
@@ -92,53 +132,74 @@ def getReleasesInfo(target: str, token: str)-> dict:
         }
     
     return {
-        "latest_release": {
-            "tag_name": data.get("tag_name"),
-            "name": data.get("name"),
-            "published_at": data.get("published_at"),
-            "body": data.get("body", "").split("\n")[0],
-            "html_url": data.get("html_url"),
-        }
+        "latest_release": ReleaseRecord(
+            tag_name=data.get("tag_name"),
+            name=data.get("name"),
+            published_at=data.get("published_at"),
+            body=data.get("body", "").split("\n")[0],
+            html_url=data.get("html_url"),
+        )
     }
     
-def getOpenPRCount(target: str, token: str)-> dict:
-    headers = getHeaders(token)
+OPEN_PR_QUERY = "query($owner: String!, $name: String!) { repository(owner: $owner, name: $name) { pullRequests(states: OPEN) { totalCount } } }"
 
+def _getOpenPRCountGraphql(owner: str, name: str, token: str)-> int | None:
+    req = transport.post(getGraphqlUrl(), token, {"query": OPEN_PR_QUERY, "variables": {"owner": owner, "name": name}})
+
+    data = req.json()
+
+    repository = (data.get("data") or {}).get("repository") if isinstance(data, dict) else None
+    if not isinstance(repository, dict):
+        return None
+    return repository["pullRequests"]["totalCount"]
+
+@instrument
+def getOpenPRCount(target: str, token: str)-> dict:
     parts = target.split("/")
 
-    try:
-        req = requests.get(f"https://api.github.com/search/issues?q=repo:{parts[0]}/{parts[1]}+type:pr+state:open", headers=headers, timeout=10)
-    except requests.exceptions.RequestException:
-        typer.secho("Api not responding. Try again later.", fg=typer.colors.RED)
-        raise typer.Exit()
+    # The search API allows only 30 requests per minute, so authenticated runs count through GraphQL instead.
+    if token != None or transport.getTokenPool() is not None:
+        count = _getOpenPRCountGraphql(parts[0], parts[1], token)
+        if count is not None:
+            return {"open_pull_requests": count}
+
+    req = transport.get(f"{API_URL}/search/issues?q=repo:{parts[0]}/{parts[1]}+type:pr+state:open", token)
 
     data = req.json()
 
-    return {"open_pull_requests": data.get("total_count", 0)}
+    return {"open_pull_requests": data.get("total_count")}
 
-def getBranchesInfo(target: str, token: str)-> dict:
-    headers = getHeaders(token)
+@instrument
+def getBranchesInfo(target: str, token: str, countOnly: bool=False)-> dict:
+    if countOnly:
+        req = transport.get(f"{API_URL}/repos/{target}/branches?per_page=1", token)
 
-    try:
-        req = requests.get(f"https://api.github.com/repos/{target}/branches", headers=headers, timeout=10)
-    except requests.exceptions.RequestException:
-        typer.secho("Api not responding. Try again later.", fg=typer.colors.RED)
-        raise typer.Exit()
+        data = req.json()
 
-    data = req.json()
+        if isinstance(data, dict):
+            return {
+                "message": data.get("message"),
+            }
+
+        return {
+            "branches_count": getLastPage(req.headers.get("Link")) or len(data)
+        }
+
+    names = []
+    for data in getPages(f"{API_URL}/repos/{target}/branches", token):
+        if isinstance(data, dict):
+            return {
+                "message": data.get("message"),
+            }
+        names += [b["name"] for b in data]
 
     return {
-        "branches": "|".join([b["name"] for b in data])
+        "branches": "|".join(names)
     }
 
-def getRateLimit(token: str)-> dict:
-    headers = getHeaders(token)
-
-    try:
-        req = requests.get("https://api.github.com/rate_limit", headers=headers, timeout=10)
-    except requests.exceptions.RequestException:
-        typer.secho("Api not responding. Try again later.", fg=typer.colors.RED)
-        raise typer.Exit()
+@instrument
+def getRateLimitResources(token: str)-> dict:
+    req = transport.get(f"{API_URL}/rate_limit", token)
 
     data = req.json()
 
@@ -146,21 +207,33 @@ def getRateLimit(token: str)-> dict:
         return {
             "message": data.get("message"),
         }
+
+    return {
+        resource: {
+            "limit": data.get("resources").get(resource, {}).get("limit"),
+            "used": data.get("resources").get(resource, {}).get("used"),
+            "remaining": data.get("resources").get(resource, {}).get("remaining"),
+            "reset": data.get("resources").get(resource, {}).get("reset"),
+        }
+        for resource in ["core", "search", "graphql"]
+    }
+
+@instrument
+def getRateLimit(token: str)-> dict:
+    resources = getRateLimitResources(token)
+
+    if "message" in resources:
+        return resources
     
     return {
-        "limit": data.get("resources").get("core", {}).get("limit"),
-        "used": data.get("resources").get("core", {}).get("used"),
-        "remaining": data.get("resources").get("core", {}).get("remaining"),
+        "limit": resources["core"]["limit"],
+        "used": resources["core"]["used"],
+        "remaining": resources["core"]["remaining"],
     }
 
+@instrument
 def getUserInfo(target: str, token: str)-> dict:
-    headers = getHeaders(token)
-
-    try:
-        req = requests.get(f"https://api.github.com/users/{target}", headers=headers, timeout=10)
-    except requests.exceptions.RequestException:
-        typer.secho("Api not responding. Try again later.", fg=typer.colors.RED)
-        raise typer.Exit()
+    req = transport.get(f"{API_URL}/users/{target}", token)
 
     data = req.json()
 
@@ -176,7 +249,7 @@ def getUserInfo(target: str, token: str)-> dict:
                 "message": msg,
             }
     
-    return {
+    return makeUser({
         "login": data.get("login"),
         "id": data.get("id"),
         "type": data.get("type"),
@@ -193,4 +266,4 @@ def getUserInfo(target: str, token: str)-> dict:
         "following": data.get("following"),
         "created_at": data.get("created_at"),
         "updated_at": data.get("updated_at"),
-    }
\ No newline at end of file
+    })
@@ -0,0 +1,154 @@
+from . import transport
+from .stats import instrument
+from .github_api import getBranchesInfo, getGraphqlUrl
+from .records import makeRepo, makeOwner, ReleaseRecord, LanguagesRecord
+
+BATCH_SIZE = 50
+FULL_BATCH_SIZE = 20
+MAX_REFS = 100
+
+REPO_FRAGMENT = """
+fragment repo on Repository {
+  name
+  nameWithOwner
+  description
+  url
+  visibility
+  licenseInfo { name }
+  stargazerCount
+  forkCount
+  watchers { totalCount }
+  issues(states: OPEN) { totalCount }
+  pullRequests(states: OPEN) { totalCount }
+  defaultBranchRef { name }
+  createdAt
+  updatedAt
+  pushedAt
+  repositoryTopics(first: 100) { nodes { topic { name } } }
+  owner { login __typename }
+  %s
+}
+"""
+
+RELEASE_FIELDS = "latestRelease { tagName name publishedAt description url }"
+BRANCH_FIELDS = 'refs(refPrefix: "refs/heads/", first: %d, orderBy: {field: ALPHABETICAL, direction: ASC}) { totalCount nodes { name } }' % MAX_REFS
+LANGUAGE_FIELDS = "languages(first: 100, orderBy: {field: SIZE, direction: DESC}) { totalSize edges { size node { name } } }"
+
+def buildQuery(targets: list, full: bool, languages: bool, branchCount: bool=False)-> tuple:
+    extra = []
+    if full:
+        extra.append(RELEASE_FIELDS)
+    if full or branchCount:
+        extra.append(BRANCH_FIELDS)
+    if full or languages:
+        extra.append(LANGUAGE_FIELDS)
+
+    params = []
+    fields = []
+    variables = {}
+    for i, target in enumerate(targets):
+        owner, name = target.split("/", 1)
+        params.append(f"$o{i}: String!, $n{i}: String!")
+        fields.append(f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...repo }}")
+        variables[f"o{i}"] = owner
+        variables[f"n{i}"] = name
+
+    query = f"query({', '.join(params)}) {{\n" + "\n".join(fields) + "\n}\n" + REPO_FRAGMENT % "\n  ".join(extra)
+    return query, variables
+
+def _toRepoInfo(node: dict)-> dict:
+    return makeRepo({
+        "name": node.get("name"),
+        "full_name": node.get("nameWithOwner"),
+        "description": node.get("description"),
+        "html_url": node.get("url"),
+        "visibility": (node.get("visibility") or "public").lower(),
+        "license": node["licenseInfo"].get("name") if node.get("licenseInfo") else None,
+        "stars": node.get("stargazerCount"),
+        "forks": node.get("forkCount"),
+        "watchers": node["watchers"]["totalCount"],
+        "open_issues": node["issues"]["totalCount"] + node["pullRequests"]["totalCount"],
+        "default_branch": node["defaultBranchRef"]["name"] if node.get("defaultBranchRef") else None,
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+        "pushed_at": node.get("pushedAt"),
+        "topics": [n["topic"]["name"] for n in node["repositoryTopics"]["nodes"]],
+        "owner": makeOwner(node["owner"]["login"], node["owner"]["__typename"]),
+    })
+
+def _toReleaseInfo(node: dict)-> dict:
+    release = node.get("latestRelease")
+    if release is None:
+        return {"latest_release": None}
+
+    return {
+        "latest_release": ReleaseRecord(
+            tag_name=release.get("tagName"),
+            name=release.get("name"),
+            published_at=release.get("publishedAt"),
+            body=(release.get("description") or "").split("\n")[0],
+            html_url=release.get("url"),
+        )
+    }
+
+def _toBranchesInfo(node: dict, target: str, token: str, countOnly: bool=False)-> dict:
+    refs = node["refs"]
+    if countOnly:
+        return {"branches_count": refs["totalCount"]}
+
+    if refs["totalCount"] > len(refs["nodes"]):
+        return getBranchesInfo(target, token)
+
+    return {
+        "branches": "|".join([ref["name"] for ref in refs["nodes"]])
+    }
+
+def _toLanguagesInfo(node: dict)-> dict:
+    total = node["languages"]["totalSize"]
+    if total == 0:
+        return {"languages": LanguagesRecord(), "language_bytes": LanguagesRecord()}
+
+    edges = node["languages"]["edges"]
+    return {
+        "languages": LanguagesRecord(
+            (edge["node"]["name"], round((edge["size"] / total) * 100, 2))
+            for edge in edges
+        ),
+        "language_bytes": LanguagesRecord((edge["node"]["name"], edge["size"]) for edge in edges),
+    }
+
+@instrument
+def getRepoInfoBatch(targets: list, token: str, full: bool=False, languages: bool=False, branchCount: bool=False)-> list:
+    valid = [target for target in targets if target.count("/") == 1 and all(target.split("/"))]
+    if not valid:
+        return [{"full_name": target, "error": "Not Found"} for target in targets]
+
+    query, variables = buildQuery(valid, full, languages, branchCount)
+    req = transport.post(getGraphqlUrl(), token, {"query": query, "variables": variables})
+    data = req.json()
+
+    if data.get("data") is None:
+        msg = data.get("message") or "; ".join(e.get("message", "") for e in data.get("errors", []))
+        return [{"message": msg} for _ in targets]
+
+    nodes = data["data"]
+    aliases = {target: f"r{i}" for i, target in enumerate(valid)}
+    infos = []
+    for target in targets:
+        node = nodes.get(aliases[target]) if target in aliases else None
+        if node is None:
+            infos.append({"full_name": target, "error": "Not Found"})
+            continue
+
+        info = _toRepoInfo(node)
+        if full:
+            info.update(_toReleaseInfo(node))
+            info.update({"open_pull_requests": node["pullRequests"]["totalCount"]})
+            info.update(_toBranchesInfo(node, target, token, branchCount))
+        if full or languages:
+            info.update(_toLanguagesInfo(node))
+        if branchCount and not full:
+            info.update(_toBranchesInfo(node, target, token, True))
+        infos.append(info)
+
+    return infos
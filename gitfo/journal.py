@@ -0,0 +1,107 @@
+import json, os
+from .util import toPlain
+
+def getJournalPath(output: str)-> str:
+    return f"{output}.journal"
+
+def getDeadLetterPath(output: str)-> str:
+    if output == "-":
+        return "gitfo.failed.txt"
+    return f"{output}.failed.txt"
+
+class DeadLetter:
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._tmp = f"{path}.{os.getpid()}.tmp"
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, *exc):
+        self.close(excType is None)
+
+    def record(self, target: str)-> None:
+        # Failures go to a temporary file, since the previous list may be the source this batch is still reading.
+        if self._file is None:
+            self._file = open(self._tmp, "w", encoding="utf-8")
+        self._file.write(f"{target}\n")
+        self._file.flush()
+        self.count += 1
+
+    def close(self, finished: bool=True)-> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            if finished:
+                os.replace(self._tmp, self.path)
+            else:
+                os.remove(self._tmp)
+        elif finished and os.path.isfile(self.path):
+            # A list left by an earlier run would name targets that have succeeded since.
+            os.remove(self.path)
+
+class Journal:
+    def __init__(self, path: str):
+        self.path = path
+        self.offsets = {}
+        self._writer = None
+        self._reader = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def load(self)-> dict:
+        self.offsets = {}
+        if not os.path.isfile(self.path):
+            return self.offsets
+
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                # A run that died mid-write can leave a truncated last line behind.
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self.offsets[entry["target"]] = offset
+                offset += len(line)
+
+        with open(self.path, "rb+") as f:
+            f.truncate(offset)
+
+        return self.offsets
+
+    def record(self, target: str, info: dict)-> None:
+        if self._writer is None:
+            self._writer = open(self.path, "ab")
+
+        offset = self._writer.tell()
+        self._writer.write((json.dumps({"target": target, "info": toPlain(info)}, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._writer.flush()
+        self.offsets[target] = offset
+
+    def read(self, target: str)-> dict:
+        if self._writer is not None:
+            self._writer.flush()
+        if self._reader is None:
+            self._reader = open(self.path, "rb")
+
+        self._reader.seek(self.offsets[target])
+        return json.loads(self._reader.readline())["info"]
+
+    def close(self)-> None:
+        for f in (self._writer, self._reader):
+            if f is not None:
+                f.close()
+        self._writer = None
+        self._reader = None
+
+    def remove(self)-> None:
+        self.close()
+        if os.path.isfile(self.path):
+            os.remove(self.path)
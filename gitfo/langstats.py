@@ -0,0 +1,133 @@
+import typer
+from array import array
+from pathlib import Path
+from .merge import iterRows
+
+LANGSTATS_TYPES = ["json", "jsonl", "csv"]
+DEFAULT_TOP = 10
+
+def importNumpy():
+    # NumPy is optional, so it is only imported once language statistics are asked for.
+    try:
+        import numpy
+    except ImportError:
+        typer.secho("langstats requires NumPy. Install it with 'pip install numpy'.", fg=typer.colors.RED)
+        raise typer.Exit()
+    return numpy
+
+def checkInputs(paths: list)-> None:
+    for path in paths:
+        fileType = path.split(".")[-1]
+        if fileType not in LANGSTATS_TYPES:
+            typer.secho(f"File type '.{fileType}' is not supported as langstats input. Use .json|.jsonl|.csv.", fg=typer.colors.RED)
+            raise typer.Exit()
+        if not Path(path).is_file():
+            typer.secho(f"Input file '{path}' does not exist.", fg=typer.colors.RED)
+            raise typer.Exit()
+
+def _parseBytes(value)-> dict | None:
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str):
+        # CSV outputs flatten the mapping to "Python:1234|C:56".
+        pairs = (part.rpartition(":") for part in value.split("|") if part)
+        return {language: int(size) for language, _, size in pairs}
+    return None
+
+# The repository × language matrix is sparse, so it is kept as (repository, language, bytes) triples.
+class LanguageMatrix:
+    def __init__(self):
+        self.languages = {}
+        self.owners = {}
+        self.repoOwners = array("q")
+        self.repoIndexes = array("q")
+        self.languageIndexes = array("q")
+        self.sizes = array("q")
+        self.skipped = 0
+
+    @property
+    def repoCount(self)-> int:
+        return len(self.repoOwners)
+
+    def add(self, row: dict)-> None:
+        fullName = row.get("full_name")
+        if not fullName or row.get("error") or row.get("message"):
+            return
+
+        sizes = _parseBytes(row.get("language_bytes"))
+        if sizes is None:
+            self.skipped += 1
+            return
+
+        owner = fullName.partition("/")[0]
+        repo = self.repoCount
+        self.repoOwners.append(self.owners.setdefault(owner.lower(), len(self.owners)))
+        for language, size in sizes.items():
+            self.repoIndexes.append(repo)
+            self.languageIndexes.append(self.languages.setdefault(language, len(self.languages)))
+            self.sizes.append(size)
+
+    @classmethod
+    def load(cls, paths: list):
+        matrix = cls()
+        for path in paths:
+            for row in iterRows(path):
+                matrix.add(row)
+        return matrix
+
+def _shares(np, sizes, totals):
+    return np.round(np.divide(sizes * 100, totals, out=np.zeros(len(sizes)), where=totals > 0), 2)
+
+def languageTotals(matrix: LanguageMatrix, top: int=DEFAULT_TOP)-> list:
+    np = importNumpy()
+    names = list(matrix.languages)
+    columns = np.frombuffer(matrix.languageIndexes, dtype=np.int64)
+    sizes = np.frombuffer(matrix.sizes, dtype=np.int64).astype(np.float64)
+
+    totals = np.bincount(columns, weights=sizes, minlength=len(names))
+    repos = np.bincount(columns, minlength=len(names))
+    order = np.argsort(-totals, kind="stable")[:top]
+    shares = _shares(np, totals[order], np.full(len(order), totals.sum()))
+
+    return [
+        {"language": names[i], "bytes": int(totals[i]), "share": float(share), "repos": int(repos[i])}
+        for i, share in zip(order, shares)
+    ]
+
+def ownerTotals(matrix: LanguageMatrix, top: int=DEFAULT_TOP)-> list:
+    np = importNumpy()
+    names, owners = list(matrix.languages), list(matrix.owners)
+    languageCount = max(len(names), 1)
+    columns = np.frombuffer(matrix.languageIndexes, dtype=np.int64)
+    sizes = np.frombuffer(matrix.sizes, dtype=np.int64).astype(np.float64)
+    repoOwners = np.frombuffer(matrix.repoOwners, dtype=np.int64)
+    rowOwners = repoOwners[np.frombuffer(matrix.repoIndexes, dtype=np.int64)]
+
+    # Only the owner × language pairs that occur are summed, so many owners do not need a dense matrix.
+    pairs, inverse = np.unique(rowOwners * languageCount + columns, return_inverse=True)
+    totals = np.bincount(inverse, weights=sizes)
+    repos = np.bincount(inverse)
+    pairOwners, pairLanguages = pairs // languageCount, pairs % languageCount
+    ownerBytes = np.bincount(pairOwners, weights=totals, minlength=len(owners))
+
+    order = np.lexsort((-totals, pairOwners))
+    pairOwners, pairLanguages, totals, repos = pairOwners[order], pairLanguages[order], totals[order], repos[order]
+    starts = np.flatnonzero(np.r_[True, pairOwners[1:] != pairOwners[:-1]]) if len(order) else np.array([], dtype=np.int64)
+    ranks = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    keep = ranks < top
+    shares = _shares(np, totals[keep], ownerBytes[pairOwners[keep]])
+
+    return [
+        {"owner": owners[owner], "language": names[language], "bytes": int(size), "share": float(share), "repos": int(count)}
+        for owner, language, size, share, count in zip(pairOwners[keep], pairLanguages[keep], totals[keep], shares, repos[keep])
+    ]
+
+def printStats(rows: list)-> None:
+    owner = None
+    for row in rows:
+        if row.get("owner") is not None and row["owner"] != owner:
+            owner = row["owner"]
+            typer.secho(f"{owner}:", fg=typer.colors.BLUE)
+        indent = "\t" if owner is not None else ""
+        language = typer.style(row["language"], fg=typer.colors.GREEN)
+        typer.echo(f"{indent}{language}: {row['bytes']} bytes, {row['share']}%, {row['repos']} repositories")
@@ -1,24 +1,93 @@
-import typer
-from typing_extensions import Annotated, Optional
+import typer, itertools, contextvars, json, signal, sys, threading
+from typing_extensions import Annotated, Optional, List
 from pathlib import Path
+from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
 from gitfo import __appName__, __version__
-from .github_api import getRepoInfo, getLanguagesInfo,getReleasesInfo, getOpenPRCount, getBranchesInfo, getRateLimit, getUserInfo
-from .util import printOutput, printOutputToFile, printMultipleToFile, getItems, removeNotFound
+from . import transport, stats, daemon
+from .cache import ResponseCache, getDefaultCacheDir
+from .github_api import setApiUrl, getApiUrl, DEFAULT_API_URL, getRepoInfo, getLanguagesInfo,getReleasesInfo, getOpenPRCount, getBranchesInfo, getRateLimit, getUserInfo, getOwnerRepos
+from .tokens import TokenPool, readTokens
+from .journal import Journal, DeadLetter, getJournalPath, getDeadLetterPath
+from .graphql import getRepoInfoBatch, BATCH_SIZE, FULL_BATCH_SIZE
+from .snapshot import Snapshot, getCarriedFields
+from .planner import OwnerPlanner, countOwners
+from .watch import Watcher, DEFAULT_INTERVAL
+from .merge import mergeShards, checkShards, readFieldnames
+from .langstats import LanguageMatrix, checkInputs, languageTotals, ownerTotals, printStats, DEFAULT_TOP
+from .util import JsonlWriter, printOutput, printOutputToFile, openWriter, checkOutputType, iterItems, inShard, isNotFound, mapOrdered, chunked, getRepoFields, USER_FIELDS, SQLITE_TYPES
 
 app = typer.Typer(name=__appName__)
 
+FORWARD_BATCH_SIZE = 1000
+
+class Backend(str, Enum):
+    rest = "rest"
+    graphql = "graphql"
+
 def _versionCallback(value: bool, ctx: typer.Context):
     if value:
         typer.echo(f"{__appName__} v{__version__}")
         raise typer.Exit()
 
+cacheApp = typer.Typer(help="Manage the on-disk response cache.")
+app.add_typer(cacheApp, name="cache")
+
 @app.callback()
-def version(version: Annotated[Optional[bool], typer.Option("--version", help="Show the application's version.", callback=_versionCallback, is_eager=True)]=False):
-    return
+def version(
+    version: Annotated[Optional[bool], typer.Option("--version", help="Show the application's version.", callback=_versionCallback, is_eager=True)]=False,
+    cache: Annotated[bool, typer.Option("--cache/--no-cache", help="Revalidate API responses against the on-disk cache.")]=True,
+    cacheSize: Annotated[int, typer.Option("--cache-size", min=1, help="Maximum size of the on-disk cache in MB.")]=256,
+    retries: Annotated[int, typer.Option("--retries", min=0, help="How many times a failed or 5xx request is retried with exponential backoff.")]=transport.DEFAULT_RETRIES,
+    apiUrl: Annotated[str, typer.Option("--api-url", envvar="GITFO_API_URL", help="Base URL of the Github API.")]=DEFAULT_API_URL,
+    showStats: Annotated[Optional[bool], typer.Option("--stats", help="Print per-endpoint timing and quota statistics when the command finishes.")]=False,
+    statsFile: Annotated[Optional[str], typer.Option("--stats-file", help="Write per-endpoint statistics as JSON to this file.")]=None,
+    useDaemon: Annotated[bool, typer.Option("--daemon/--no-daemon", help="Forward repo, user, repobatch and limit to a running 'gitfo serve'.")]=True,
+    ctx: typer.Context=None,
+):
+    if showStats or statsFile:
+        collector = stats.enable()
+        ctx.call_on_close(lambda: _emitStats(collector, showStats, statsFile))
+    else:
+        stats.disable()
+
+    # Statistics are collected in this process, so a command with --stats always runs locally.
+    daemon.setForwarding(useDaemon and not (showStats or statsFile), {"cache": cache, "cache_size": cacheSize, "retries": retries})
+
+    setApiUrl(apiUrl)
+    transport.configureRetries(retries)
+    if cache:
+        transport.configureCache(ResponseCache(getDefaultCacheDir(), cacheSize * 1024 * 1024))
+    else:
+        transport.configureCache(None)
+
+def _emitStats(collector: stats.StatsCollector, showStats: bool, statsFile: str)-> None:
+    report = collector.report()
+    if showStats:
+        stats.printReport(report)
+    if statsFile:
+        stats.writeReport(report, statsFile)
+
+def _getCache()-> ResponseCache:
+    return transport.getCache() or ResponseCache(getDefaultCacheDir())
+
+@cacheApp.command("stats")
+def cacheStats():
+    printOutput(_getCache().stats())
+
+@cacheApp.command("prune")
+def cachePrune(
+    maxSize: Annotated[Optional[int], typer.Option("--max-size", min=0, help="Evict least recently used responses until the cache fits in this many MB.")]=None,
+):
+    cache = _getCache()
+    removed = cache.prune(maxSize * 1024 * 1024 if maxSize is not None else None)
+    typer.secho(f"Removed {removed} cached responses.", fg=typer.colors.GREEN)
 
 @app.command()
 def limit(auth: Annotated[str, typer.Argument(help="Your Github token for authorization.")]):
-    info = getRateLimit(auth)
+    info = daemon.forward("limit", {"auth": auth})
+    if info is None:
+        info = getRateLimit(auth)
 
     if "message" in info and info["message"] == "Bad credentials":
         typer.secho(f"Authorization token incorrect!", fg=typer.colors.RED)
@@ -26,15 +95,63 @@ def limit(auth: Annotated[str, typer.Argument(help="Your Github token for author
 
     printOutput(info)
 
+def _getDetails(target: str, auth: str, full: bool, languages: bool, branchCount: bool=False)-> dict:
+    countBranches = lambda target, auth: getBranchesInfo(target, auth, countOnly=True)
+    fetchers = []
+    if full:
+        fetchers = [getReleasesInfo, getOpenPRCount, countBranches if branchCount else getBranchesInfo, getLanguagesInfo]
+    elif languages:
+        fetchers = [getLanguagesInfo]
+    if branchCount and not full:
+        fetchers.append(countBranches)
+
+    details = {}
+    if len(fetchers) <= 1:
+        for fetch in fetchers:
+            details.update(fetch(target, auth))
+        return details
+
+    # The sub-requests are independent, so they run together and are merged in a fixed order.
+    with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, fetch, target, auth) for fetch in fetchers]
+        for future in futures:
+            details.update(future.result())
+
+    return details
+
+def _fetchRepo(target: str, auth: str, full: bool, languages: bool, branchCount: bool=False)-> dict:
+    info = getRepoInfo(target, auth)
+
+    if "message" in info:
+        return info
+
+    info.update(_getDetails(target, auth, full, languages, branchCount))
+    return info
+
+def _collectRepo(target: str, auth: str, full: bool, languages: bool, branchCount: bool=False, snapshot: Snapshot=None, planner: OwnerPlanner=None)-> dict:
+    info = planner.getRepoInfo(target) if planner is not None else getRepoInfo(target, auth)
+
+    if "error" in info or "message" in info:
+        return info
+
+    if snapshot is not None and snapshot.carryForward(info):
+        return info
+
+    info.update(_getDetails(target, auth, full, languages, branchCount))
+    return info
+
 @app.command()
 def repo(
     target: Annotated[str, typer.Argument(help="Target Github repository.(owner/repository)")], 
-    output: Annotated[Optional[str], typer.Option("--output", "-o", help="Name of output file. Supported file types: .txt|.csv|.json.")]=None,
+    output: Annotated[Optional[str], typer.Option("--output", "-o", help="Name of output file. Supported file types: .txt|.csv|.json|.sqlite|.db.")]=None,
     full: Annotated[Optional[bool], typer.Option("--full", help="Retrieve full details about the repository.(Requires more requests)")]=False,
     languages: Annotated[Optional[bool], typer.Option("--with-languages", help="Get full language breakdown.(Requires more requests)")]=False,
+    branchCount: Annotated[Optional[bool], typer.Option("--branches-count", help="Count branches instead of listing their names.(Requires one request)")]=False,
     auth: Annotated[Optional[str], typer.Option("--auth", "-a", help="Your Github token for authorization.")]=None,
 ):
-    info = getRepoInfo(target, auth)
+    info = daemon.forward("repo", {"target": target, "auth": auth, "full": full, "languages": languages, "branchCount": branchCount})
+    if info is None:
+        info = _fetchRepo(target, auth, full, languages, branchCount)
 
     if "message" in info:
         msg = info["message"]
@@ -48,78 +165,227 @@ def repo(
             typer.secho("Rate limit exceeded! Try again tomorrow or use authorization.", fg=typer.colors.RED)
             return
 
-    if full:
-        releasesInfo = getReleasesInfo(target, auth)
-        info.update(releasesInfo)
-
-        pRCountInfo = getOpenPRCount(target, auth)
-        info.update(pRCountInfo)
-
-        branchesInfo = getBranchesInfo(target, auth)
-        info.update(branchesInfo)
-
-        langInfo = getLanguagesInfo(target, auth)
-        info.update(langInfo)
-    
-    if languages:
-        langInfo = getLanguagesInfo(target, auth)
-        info.update(langInfo)
-    
     if output:
         printOutputToFile(info, output)
     else:
         printOutput(info)
 
+def _resolveAuth(auth: list, authFile: str)-> str:
+    tokens = list(auth or [])
+    if authFile:
+        if not Path(authFile).is_file():
+            typer.secho(f"Token file '{authFile}' does not exist.", fg=typer.colors.RED)
+            raise typer.Exit()
+        tokens += readTokens(authFile)
+
+    tokens = list(dict.fromkeys(tokens))
+    if len(tokens) <= 1:
+        return tokens[0] if tokens else None
+
+    pool = TokenPool(tokens)
+    pool.refresh()
+    if not pool.tokens:
+        typer.secho("Authorization token incorrect!", fg=typer.colors.RED)
+        raise typer.Exit()
+
+    transport.useTokenPool(pool)
+    return None
+
+def _writeResults(infos, output: str, fields: list, skipNotFound: bool)-> None:
+    with openWriter(output, fields) as writer:
+        for info in infos:
+            if skipNotFound and isNotFound(info):
+                continue
+            writer.write(info)
+
+def _checkSource(source: str)-> None:
+    if source != "-" and not Path(source).is_file():
+        typer.secho(f"Source file '{source}' does not exist.", fg=typer.colors.RED)
+        raise typer.Exit()
+
+def _tryFetch(fetchOne, target):
+    try:
+        return target, fetchOne(target)
+    except (transport.ApiUnavailable, json.JSONDecodeError):
+        # A body that is not JSON, e.g. an HTML error page, fails the target rather than the whole batch.
+        return target, None
+
+def _succeeded(results, deadLetter: DeadLetter):
+    for target, info in results:
+        if info is None:
+            deadLetter.record(target)
+            continue
+        yield target, info
+
+def _reportFailures(deadLetter: DeadLetter)-> None:
+    if deadLetter.count:
+        typer.secho(f"{deadLetter.count} target(s) failed after retries. They were written to '{deadLetter.path}', which can be used as a source file.", fg=typer.colors.YELLOW, err=True)
+
+def _parseShard(shard: str)-> tuple | None:
+    if shard is None:
+        return None
+
+    index, _, count = shard.partition("/")
+    if not (index.isdigit() and count.isdigit()) or not 1 <= int(index) <= int(count):
+        typer.secho(f"Invalid shard '{shard}'. Use i/n with 1 <= i <= n, e.g. 2/4.", fg=typer.colors.RED)
+        raise typer.Exit()
+    return int(index), int(count)
+
+def _iterTargets(source: str, shard: tuple=None):
+    items = iterItems(source)
+    if shard is None:
+        return items
+    return (item for item in items if inShard(item, shard))
+
+def _runBatch(source: str, fetch, output: str, fields: list, skipNotFound: bool, resume: bool, failedFile: str=None, shard: tuple=None)-> None:
+    deadLetter = DeadLetter(failedFile or getDeadLetterPath(output))
+
+    if not resume:
+        with deadLetter:
+            _writeResults((info for _, info in _succeeded(fetch(_iterTargets(source, shard)), deadLetter)), output, fields, skipNotFound)
+        _reportFailures(deadLetter)
+        return
+
+    if output == "-" or source == "-":
+        typer.secho("Resuming requires a source file and an output file.", fg=typer.colors.RED)
+        raise typer.Exit()
+    # The writer is only opened once every target is journaled, so a bad output type has to fail before fetching.
+    checkOutputType(output)
+
+    with Journal(getJournalPath(output)) as journal, deadLetter:
+        done = journal.load()
+        if done:
+            typer.secho(f"Resuming: {len(done)} target(s) already completed.", fg=typer.colors.YELLOW, err=True)
+
+        for target, info in _succeeded(fetch(target for target in _iterTargets(source, shard) if target not in done), deadLetter):
+            journal.record(target, info)
+
+        _writeResults((journal.read(target) for target in _iterTargets(source, shard) if target in journal.offsets), output, fields, skipNotFound)
+
+    _reportFailures(deadLetter)
+    # Failed targets stay out of the journal, so another --resume run retries only those.
+    if not deadLetter.count:
+        journal.remove()
+
+def _refreshBatch(batch: list, auth: str, full: bool, languages: bool, branchCount: bool, snapshot: Snapshot)-> list:
+    infos = getRepoInfoBatch(batch, auth)
+
+    # Only repositories that changed since the snapshot are queried again with the expensive fields.
+    changed = [i for i, info in enumerate(infos) if "error" not in info and "message" not in info and not snapshot.carryForward(info)]
+    for indexes in chunked(changed, FULL_BATCH_SIZE):
+        for i, info in zip(indexes, getRepoInfoBatch([batch[i] for i in indexes], auth, full, languages, branchCount)):
+            infos[i] = info
+
+    return infos
+
+def _fetchRepos(auth: str, full: bool, languages: bool, branchCount: bool, backend: Backend, workers: int, snapshot: Snapshot=None, planner: OwnerPlanner=None):
+    def fetch(repos):
+        if backend == Backend.graphql:
+            if snapshot is not None:
+                batches = chunked(repos, BATCH_SIZE)
+                fetchBatch = lambda batch: _refreshBatch(batch, auth, full, languages, branchCount, snapshot)
+            else:
+                batches = chunked(repos, FULL_BATCH_SIZE if full else BATCH_SIZE)
+                fetchBatch = lambda batch: getRepoInfoBatch(batch, auth, full, languages, branchCount)
+            for batch, infos in mapOrdered(lambda batch: _tryFetch(fetchBatch, batch), batches, workers):
+                yield from zip(batch, infos or [None] * len(batch))
+        else:
+            fetchRepo = lambda repo: _collectRepo(repo, auth, full, languages, branchCount, snapshot, planner)
+            yield from mapOrdered(lambda repo: _tryFetch(fetchRepo, repo), repos, workers)
+
+    return fetch
+
+def _forwardRepos(local, params: dict):
+    def fetch(repos):
+        for batch in chunked(repos, FORWARD_BATCH_SIZE):
+            rows = daemon.forward("repobatch", {**params, "targets": batch}, stream=True)
+            if rows is None:
+                yield from local(batch)
+                continue
+
+            done = 0
+            try:
+                for row in rows:
+                    yield row["target"], row["info"]
+                    done += 1
+            except (OSError, ValueError):
+                # The daemon went away mid-batch, so the rest of the batch runs locally.
+                yield from local(batch[done:])
+
+    return fetch
+
 @app.command()
 def repobatch(
-    source: Annotated[str, typer.Argument(help="Path to your .txt file with GitHub repositories — one per line.(owner/repository)")],
-    output: Annotated[str, typer.Argument(help="Name of output file. Supported file types: .txt|.csv|.json.")],
+    source: Annotated[str, typer.Argument(help="Path to your .txt or .gz file with GitHub repositories — one per line.(owner/repository) Use - for stdin.")],
+    output: Annotated[str, typer.Argument(help="Name of output file, or - for stdout. Supported file types: .txt|.csv|.json|.jsonl|.sqlite|.db.")],
     full: Annotated[Optional[bool], typer.Option("--full", help="Retrieve full details about the repository.(Requires more requests)")]=False,
     languages: Annotated[Optional[bool], typer.Option("--with-languages", help="Get full language breakdown.(Requires more requests)")]=False,
+    branchCount: Annotated[Optional[bool], typer.Option("--branches-count", help="Count branches instead of listing their names.(Requires one request)")]=False,
     skipNotFound: Annotated[Optional[bool], typer.Option("--skip-not-found", help="Skip non-existing repositories.")]=False,
-    auth: Annotated[Optional[str], typer.Option("--auth", "-a", help="Your Github token for authorization.")]=None,
+    resume: Annotated[Optional[bool], typer.Option("--resume", help="Skip targets completed by an interrupted run with the same output file.")]=False,
+    failedFile: Annotated[Optional[str], typer.Option("--failed-file", help="Where targets that still fail after retries are listed.(Default: <output>.failed.txt)")]=None,
+    sinceSnapshot: Annotated[Optional[str], typer.Option("--since-snapshot", help="Previous .json|.jsonl output. Details of repositories unchanged since then are carried forward instead of fetched.")]=None,
+    shard: Annotated[Optional[str], typer.Option("--shard", help="Only fetch shard i of n, e.g. 2/4. Targets are assigned to shards by a stable hash.")]=None,
+    groupByOwner: Annotated[Optional[bool], typer.Option("--group-by-owner", help="Serve owners with many targets from their paginated repository listing.(Watchers are not listed)")]=False,
+    workers: Annotated[int, typer.Option("--workers", "-w", min=1, help="Number of repositories fetched concurrently.")]=1,
+    poolSize: Annotated[Optional[int], typer.Option("--pool-size", min=1, help="Maximum number of kept-alive API connections.")]=None,
+    backend: Annotated[Backend, typer.Option("--backend", help="API used to fetch the repositories. GraphQL packs many repositories into one request and requires authorization.")]=Backend.rest,
+    auth: Annotated[Optional[List[str]], typer.Option("--auth", "-a", help="Your Github token for authorization. Repeat to spread requests across several tokens.")]=None,
+    authFile: Annotated[Optional[str], typer.Option("--auth-file", help="Path to a file with Github tokens — one per line.")]=None,
 ):
-    if not Path(source).is_file():
-        typer.secho(f"Source file '{source}' does not exist.", fg=typer.colors.RED)
+    _checkSource(source)
+    shard = _parseShard(shard)
+
+    if backend == Backend.graphql and not auth and not authFile:
+        typer.secho("The GraphQL backend requires authorization. Use --auth.", fg=typer.colors.RED)
         raise typer.Exit()
 
-    repos = getItems(source)
-    infos = []
-    
-    for repo in repos:
-        info = getRepoInfo(repo, auth)
+    snapshot = None
+    if sinceSnapshot:
+        carried = getCarriedFields(full, languages, branchCount)
+        if carried:
+            snapshot = Snapshot.load(sinceSnapshot, carried)
+        else:
+            typer.secho("--since-snapshot only saves requests with --full, --with-languages or --branches-count.", fg=typer.colors.YELLOW, err=True)
 
-        if full: 
-            releasesInfo = getReleasesInfo(repo, auth)
-            info.update(releasesInfo)
+    if groupByOwner and source == "-":
+        typer.secho("Grouping by owner requires a source file.", fg=typer.colors.RED)
+        raise typer.Exit()
+    if groupByOwner and backend == Backend.graphql:
+        typer.secho("--group-by-owner is ignored by the GraphQL backend, which already batches repositories.", fg=typer.colors.YELLOW, err=True)
+        groupByOwner = False
 
-            pRCountInfo = getOpenPRCount(repo, auth)
-            info.update(pRCountInfo)
+    # The daemon has neither the snapshot nor the planner, and keeps token pools to the CLI.
+    forwardable = snapshot is None and not groupByOwner and not authFile and len(auth or []) <= 1
 
-            branchesInfo = getBranchesInfo(repo, auth)
-            info.update(branchesInfo)
+    auth = _resolveAuth(auth, authFile)
 
-            langInfo = getLanguagesInfo(repo, auth)
-            info.update(langInfo)
-        
-        if languages:
-            langInfo = getLanguagesInfo(repo, auth)
-            info.update(langInfo)
+    transport.configure(poolSize or max(workers * (4 if full else 1), transport.DEFAULT_POOL_SIZE))
+    transport.setWaitForReset(True)
 
-        infos.append(info)
+    planner = OwnerPlanner(countOwners(_iterTargets(source, shard)), auth) if groupByOwner else None
 
-    if skipNotFound:
-        infos = removeNotFound(infos)
-    
-    printMultipleToFile(infos, output)
+    fetch = _fetchRepos(auth, full, languages, branchCount, backend, workers, snapshot, planner)
+    if forwardable:
+        params = {"auth": auth, "full": full, "languages": languages, "branchCount": branchCount, "backend": backend.value, "workers": workers}
+        fetch = _forwardRepos(fetch, params)
+    _runBatch(source, fetch, output, getRepoFields(full, languages, branchCount), skipNotFound, resume, failedFile, shard)
+
+    if planner is not None:
+        typer.secho(f"Served {planner.listed} repositories from owner listings.", fg=typer.colors.YELLOW, err=True)
+
+    if snapshot is not None:
+        typer.secho(f"Carried forward {snapshot.carried} unchanged repositories from the snapshot.", fg=typer.colors.YELLOW, err=True)
     
 @app.command()
 def user(
     target: Annotated[str, typer.Argument(help="Target Github username.")],
-    output: Annotated[Optional[str], typer.Option("--output", "-o", help="Name of output file. Supported file types: .txt|.csv|.json.")]=None,
+    output: Annotated[Optional[str], typer.Option("--output", "-o", help="Name of output file. Supported file types: .txt|.csv|.json|.sqlite|.db.")]=None,
     auth: Annotated[Optional[str], typer.Option("--auth", "-a", help="Your Github token for authorization.")]=None,
 ):
-    info = getUserInfo(target, auth)
+    info = daemon.forward("user", {"target": target, "auth": auth})
+    if info is None:
+        info = getUserInfo(target, auth)
 
     if "message" in info:
         msg = info["message"]
@@ -140,22 +406,204 @@ def user(
 
 @app.command()
 def userbatch(
-    source: Annotated[str, typer.Argument(help="Path to your .txt file with GitHub usernames — one per line.")],
-    output: Annotated[str, typer.Argument(help="Name of output file. Supported file types: .txt|.csv|.json.")],
+    source: Annotated[str, typer.Argument(help="Path to your .txt or .gz file with GitHub usernames — one per line. Use - for stdin.")],
+    output: Annotated[str, typer.Argument(help="Name of output file, or - for stdout. Supported file types: .txt|.csv|.json|.jsonl|.sqlite|.db.")],
     skipNotFound: Annotated[Optional[bool], typer.Option("--skip-not-found", help="Skip non-existing users.")]=False,
+    resume: Annotated[Optional[bool], typer.Option("--resume", help="Skip targets completed by an interrupted run with the same output file.")]=False,
+    failedFile: Annotated[Optional[str], typer.Option("--failed-file", help="Where targets that still fail after retries are listed.(Default: <output>.failed.txt)")]=None,
+    shard: Annotated[Optional[str], typer.Option("--shard", help="Only fetch shard i of n, e.g. 2/4. Targets are assigned to shards by a stable hash.")]=None,
+    workers: Annotated[int, typer.Option("--workers", "-w", min=1, help="Number of users fetched concurrently.")]=1,
+    poolSize: Annotated[Optional[int], typer.Option("--pool-size", min=1, help="Maximum number of kept-alive API connections.")]=None,
+    auth: Annotated[Optional[List[str]], typer.Option("--auth", "-a", help="Your Github token for authorization. Repeat to spread requests across several tokens.")]=None,
+    authFile: Annotated[Optional[str], typer.Option("--auth-file", help="Path to a file with Github tokens — one per line.")]=None,
+):
+    _checkSource(source)
+    shard = _parseShard(shard)
+
+    auth = _resolveAuth(auth, authFile)
+    transport.configure(poolSize or max(workers, transport.DEFAULT_POOL_SIZE))
+    transport.setWaitForReset(True)
+
+    fetch = lambda users: mapOrdered(lambda user: _tryFetch(lambda user: getUserInfo(user, auth), user), users, workers)
+    _runBatch(source, fetch, output, USER_FIELDS, skipNotFound, resume, failedFile, shard)
+
+def _listRepos(kind: str, owner: str, label: str, output: str, full: bool, languages: bool, branchCount: bool, failedFile: str, workers: int, poolSize: int, auth: list, authFile: str)-> None:
+    auth = _resolveAuth(auth, authFile)
+    transport.configure(poolSize or max(workers * (4 if full else 1), transport.DEFAULT_POOL_SIZE))
+    transport.setWaitForReset(True)
+
+    repos = getOwnerRepos(owner, auth, kind)
+    first = next(repos, None)
+    if first is not None and "message" in first:
+        msg = first["message"] or ""
+        if "Not Found" in msg:
+            typer.secho(f"{label} '{owner}' not found!", fg=typer.colors.RED)
+            return
+        elif "Bad credentials" in msg:
+            typer.secho(f"Authorization token incorrect!", fg=typer.colors.RED)
+            return
+        elif "rate limit exceeded" in msg.lower():
+            typer.secho("Rate limit exceeded! Try again tomorrow or use authorization.", fg=typer.colors.RED)
+            return
+    repos = itertools.chain([first] if first is not None else [], repos)
+
+    def enrich(info: dict)-> dict:
+        if "message" not in info:
+            info.update(_getDetails(info["full_name"], auth, full, languages, branchCount))
+        return info
+
+    deadLetter = DeadLetter(failedFile or getDeadLetterPath(output))
+    with deadLetter:
+        results = mapOrdered(lambda info: _tryFetch(lambda _: enrich(info), info.get("full_name")), repos, workers)
+        _writeResults((info for _, info in _succeeded(results, deadLetter)), output, getRepoFields(full, languages, branchCount), False)
+    _reportFailures(deadLetter)
+
+@app.command()
+def orgrepos(
+    org: Annotated[str, typer.Argument(help="Target Github organization.")],
+    output: Annotated[str, typer.Argument(help="Name of output file, or - for stdout. Supported file types: .txt|.csv|.json|.jsonl|.sqlite|.db.")],
+    full: Annotated[Optional[bool], typer.Option("--full", help="Retrieve full details about every repository.(Requires more requests)")]=False,
+    languages: Annotated[Optional[bool], typer.Option("--with-languages", help="Get full language breakdown.(Requires more requests)")]=False,
+    branchCount: Annotated[Optional[bool], typer.Option("--branches-count", help="Count branches instead of listing their names.(Requires one request)")]=False,
+    failedFile: Annotated[Optional[str], typer.Option("--failed-file", help="Where repositories whose details still fail after retries are listed.(Default: <output>.failed.txt)")]=None,
+    workers: Annotated[int, typer.Option("--workers", "-w", min=1, help="Number of repositories enriched concurrently.")]=1,
+    poolSize: Annotated[Optional[int], typer.Option("--pool-size", min=1, help="Maximum number of kept-alive API connections.")]=None,
+    auth: Annotated[Optional[List[str]], typer.Option("--auth", "-a", help="Your Github token for authorization. Repeat to spread requests across several tokens.")]=None,
+    authFile: Annotated[Optional[str], typer.Option("--auth-file", help="Path to a file with Github tokens — one per line.")]=None,
+):
+    _listRepos("orgs", org, "Organization", output, full, languages, branchCount, failedFile, workers, poolSize, auth, authFile)
+
+@app.command()
+def userrepos(
+    target: Annotated[str, typer.Argument(help="Target Github username.")],
+    output: Annotated[str, typer.Argument(help="Name of output file, or - for stdout. Supported file types: .txt|.csv|.json|.jsonl|.sqlite|.db.")],
+    full: Annotated[Optional[bool], typer.Option("--full", help="Retrieve full details about every repository.(Requires more requests)")]=False,
+    languages: Annotated[Optional[bool], typer.Option("--with-languages", help="Get full language breakdown.(Requires more requests)")]=False,
+    branchCount: Annotated[Optional[bool], typer.Option("--branches-count", help="Count branches instead of listing their names.(Requires one request)")]=False,
+    failedFile: Annotated[Optional[str], typer.Option("--failed-file", help="Where repositories whose details still fail after retries are listed.(Default: <output>.failed.txt)")]=None,
+    workers: Annotated[int, typer.Option("--workers", "-w", min=1, help="Number of repositories enriched concurrently.")]=1,
+    poolSize: Annotated[Optional[int], typer.Option("--pool-size", min=1, help="Maximum number of kept-alive API connections.")]=None,
+    auth: Annotated[Optional[List[str]], typer.Option("--auth", "-a", help="Your Github token for authorization. Repeat to spread requests across several tokens.")]=None,
+    authFile: Annotated[Optional[str], typer.Option("--auth-file", help="Path to a file with Github tokens — one per line.")]=None,
+):
+    _listRepos("users", target, "User", output, full, languages, branchCount, failedFile, workers, poolSize, auth, authFile)
+
+@app.command()
+def merge(
+    source: Annotated[str, typer.Argument(help="The .txt or .gz source file the shards were fetched from. It sets the order of the merged rows.")],
+    output: Annotated[str, typer.Argument(help="Name of the merged file, or - for stdout. Must have the same type as the shards: .json|.jsonl|.csv.")],
+    shards: Annotated[List[str], typer.Argument(help="Output files of the shards.")],
+):
+    _checkSource(source)
+    if source == "-":
+        typer.secho("Merging requires a source file, since it is read twice.", fg=typer.colors.RED)
+        raise typer.Exit()
+
+    fileType = checkShards(shards, output)
+    fieldnames = readFieldnames(shards) if fileType == "csv" else []
+    with openWriter(output, fieldnames) as writer:
+        for row in mergeShards(source, shards):
+            writer.write(row)
+
+@app.command()
+def langstats(
+    inputs: Annotated[List[str], typer.Argument(help="Outputs of repobatch, orgrepos or userrepos run with --with-languages or --full. Supported file types: .json|.jsonl|.csv.")],
+    output: Annotated[Optional[str], typer.Option("--output", "-o", help="Name of output file, or - for stdout. Supported file types: .txt|.csv|.json|.jsonl.")]=None,
+    top: Annotated[int, typer.Option("--top", min=1, help="Number of languages reported overall or per owner.")]=DEFAULT_TOP,
+    byOwner: Annotated[Optional[bool], typer.Option("--by-owner", help="Break the byte totals down by repository owner.")]=False,
+):
+    checkInputs(inputs)
+    if output and output != "-" and output.split(".")[-1] in SQLITE_TYPES:
+        typer.secho("Language statistics cannot be written to a database. Use .txt|.csv|.json|.jsonl.", fg=typer.colors.RED)
+        raise typer.Exit()
+
+    matrix = LanguageMatrix.load(inputs)
+    if matrix.skipped:
+        typer.secho(f"Skipped {matrix.skipped} repositories without language_bytes. Fetch them again with --with-languages.", fg=typer.colors.YELLOW, err=True)
+
+    rows = ownerTotals(matrix, top) if byOwner else languageTotals(matrix, top)
+    if not output:
+        printStats(rows)
+        return
+
+    fields = (["owner"] if byOwner else []) + ["language", "bytes", "share", "repos"]
+    with openWriter(output, fields) as writer:
+        for row in rows:
+            writer.write(row)
+
+@app.command()
+def watch(
+    source: Annotated[str, typer.Argument(help="Path to your .txt or .gz file with GitHub repositories — one per line.(owner/repository) Use - for stdin.")],
+    output: Annotated[Optional[str], typer.Option("--output", "-o", help="Append change events to this .jsonl file instead of printing them.")]=None,
+    interval: Annotated[float, typer.Option("--interval", min=0, help="Seconds between two polls of the same repository.")]=DEFAULT_INTERVAL,
+    releases: Annotated[bool, typer.Option("--releases/--no-releases", help="Also watch the latest release.(One more request per poll)")]=True,
+    fields: Annotated[Optional[str], typer.Option("--fields", help="Comma-separated fields to compare, e.g. stars,latest_release.(Default: all but updated_at)")]=None,
+    cycles: Annotated[Optional[int], typer.Option("--cycles", min=1, help="Stop after polling every repository this many times.")]=None,
     auth: Annotated[Optional[str], typer.Option("--auth", "-a", help="Your Github token for authorization.")]=None,
 ):
-    if not Path(source).is_file():
-        typer.secho(f"Source file '{source}' does not exist.", fg=typer.colors.RED)
+    _checkSource(source)
+
+    if output and output != "-" and output.split(".")[-1] != "jsonl":
+        typer.secho("Watch events are written as JSON lines. Use .jsonl or - for stdout.", fg=typer.colors.RED)
         raise typer.Exit()
+    if transport.getCache() is None:
+        typer.secho("Without the response cache every poll downloads the full responses and counts against the rate limit.", fg=typer.colors.YELLOW, err=True)
+
+    transport.setWaitForReset(True)
+
+    def fetch(target: str)-> dict | None:
+        try:
+            info = getRepoInfo(target, auth)
+            if releases and "error" not in info and "message" not in info:
+                info.update(getReleasesInfo(target, auth))
+            return info
+        except transport.ApiUnavailable:
+            return None
 
-    users = getItems(source)
-    infos = []
-    for user in users:
-        info = getUserInfo(user, auth)
-        infos.append(info)
+    watcher = Watcher(list(iterItems(source)), fetch, interval, [field.strip() for field in fields.split(",")] if fields else None)
+    writer = JsonlWriter(open(output, "a", encoding="utf-8") if output and output != "-" else sys.stdout)
+    with writer:
+        try:
+            watcher.run(writer.write, cycles)
+        except KeyboardInterrupt:
+            pass
 
-    if skipNotFound:
-        infos = removeNotFound(infos)
+def _serveRepobatch(params: dict):
+    fetch = _fetchRepos(params.get("auth"), params.get("full", False), params.get("languages", False), params.get("branchCount", False), Backend(params.get("backend", "rest")), params.get("workers", 1))
+    # Batches wait for the rate limit to reset like the CLI does, while single lookups of other clients do not.
+    with transport.waitingForReset():
+        for target, info in fetch(iter(params["targets"])):
+            yield {"target": target, "info": info}
+
+DAEMON_OPERATIONS = {
+    "repo": lambda params: _fetchRepo(params["target"], params.get("auth"), params.get("full", False), params.get("languages", False), params.get("branchCount", False)),
+    "user": lambda params: getUserInfo(params["target"], params.get("auth")),
+    "limit": lambda params: getRateLimit(params.get("auth")),
+    "repobatch": _serveRepobatch,
+}
+
+@app.command()
+def serve(
+    host: Annotated[str, typer.Option("--host", help="Interface the daemon listens on.")]="127.0.0.1",
+    port: Annotated[int, typer.Option("--port", min=0, help="Port the daemon listens on. 0 picks a free port.")]=daemon.DEFAULT_PORT,
+    poolSize: Annotated[int, typer.Option("--pool-size", min=1, help="Maximum number of kept-alive API connections.")]=transport.DEFAULT_POOL_SIZE * 2,
+):
+    running = daemon.getRunning()
+    if running is not None:
+        typer.secho(f"A gitfo daemon is already running on {running['url']}.", fg=typer.colors.RED)
+        raise typer.Exit()
+
+    transport.configure(poolSize)
+    try:
+        server = daemon.DaemonServer(DAEMON_OPERATIONS, host, port, getApiUrl(), daemon.getSettings())
+    except OSError as e:
+        typer.secho(f"Cannot listen on {host}:{port}: {e.strerror}", fg=typer.colors.RED)
+        raise typer.Exit()
 
-    printMultipleToFile(infos, output)
\ No newline at end of file
+    # shutdown() waits for serve_forever, so it has to be called from another thread.
+    signal.signal(signal.SIGTERM, lambda *args: threading.Thread(target=server.stop).start())
+    typer.secho(f"Serving gitfo on {server.url}. Press Ctrl+C to stop.", fg=typer.colors.GREEN, err=True)
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
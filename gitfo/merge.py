@@ -0,0 +1,113 @@
+import csv, json, hashlib, typer
+from pathlib import Path
+from .util import iterItems
+
+MERGE_TYPES = ["json", "jsonl", "csv"]
+KEY_FIELDS = ["full_name", "login"]
+CHUNK_SIZE = 1 << 16
+
+def _digest(key: str)-> bytes:
+    return hashlib.blake2b(key.lower().encode("utf-8"), digest_size=8).digest()
+
+def getKey(row: dict)-> str | None:
+    for field in KEY_FIELDS:
+        if row.get(field):
+            return row[field]
+    return None
+
+def _iterJsonArray(f):
+    # The array is decoded one element at a time, so a shard never has to fit in memory.
+    decoder = json.JSONDecoder()
+    buffer = f.read(CHUNK_SIZE).lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("expected a JSON array")
+    buffer = buffer[1:]
+
+    while True:
+        buffer = buffer.lstrip().lstrip(",").lstrip()
+        if buffer.startswith("]"):
+            return
+        try:
+            row, end = decoder.raw_decode(buffer)
+        except ValueError:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                raise
+            buffer += chunk
+            continue
+        yield row
+        buffer = buffer[end:]
+
+def iterRows(path: str):
+    fileType = path.split(".")[-1]
+    with open(path, "r", encoding="utf-8", newline="" if fileType == "csv" else None) as f:
+        match fileType:
+            case "json":
+                yield from _iterJsonArray(f)
+            case "jsonl":
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+            case "csv":
+                yield from csv.DictReader(f)
+
+def readFieldnames(paths: list)-> list:
+    fieldnames = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for field in next(csv.reader(f), []):
+                if field not in fieldnames:
+                    fieldnames.append(field)
+    return fieldnames
+
+def checkShards(paths: list, output: str)-> str:
+    types = {path.split(".")[-1] for path in paths}
+    if len(types) != 1 or next(iter(types)) not in MERGE_TYPES:
+        typer.secho("Shards must all be .json, all .jsonl or all .csv files.", fg=typer.colors.RED)
+        raise typer.Exit()
+
+    fileType = types.pop()
+    if (output == "-" and fileType != "jsonl") or (output != "-" and output.split(".")[-1] != fileType):
+        typer.secho(f"The merged file must have the same type as the shards ('.{fileType}').", fg=typer.colors.RED)
+        raise typer.Exit()
+
+    for path in paths:
+        if not Path(path).is_file():
+            typer.secho(f"Shard file '{path}' does not exist.", fg=typer.colors.RED)
+            raise typer.Exit()
+
+    return fileType
+
+class _Shard:
+    def __init__(self, path: str):
+        self.rows = iterRows(path)
+        self.head = None
+        self.advance()
+
+    def advance(self)-> None:
+        self.head = next(self.rows, None)
+
+def mergeShards(source: str, paths: list):
+    # Every shard is written in source order, so the next row for a target can only be at the head of one shard.
+    known = {_digest(target) for target in iterItems(source)}
+    shards = [_Shard(path) for path in paths]
+
+    def unmatched(shard):
+        # Rows keyed by something that is not in the source, such as renamed repositories or rate-limit messages, go out as they come up.
+        while shard.head is not None and (getKey(shard.head) is None or _digest(getKey(shard.head)) not in known):
+            yield shard.head
+            shard.advance()
+
+    for target in iterItems(source):
+        for shard in shards:
+            yield from unmatched(shard)
+            if shard.head is not None and getKey(shard.head).lower() == target.lower():
+                yield shard.head
+                shard.advance()
+                yield from unmatched(shard)
+                break
+
+    for shard in shards:
+        while shard.head is not None:
+            yield shard.head
+            shard.advance()
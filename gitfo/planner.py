@@ -0,0 +1,65 @@
+import threading
+from collections import Counter
+from .github_api import getRepoInfo, getUserInfo, getOwnerRepos, PER_PAGE
+
+MIN_GROUP = 3
+
+def countOwners(targets)-> Counter:
+    return Counter(target.split("/", 1)[0].lower() for target in targets if "/" in target)
+
+class OwnerPlanner:
+    def __init__(self, owners: Counter, token: str, minGroup: int=MIN_GROUP):
+        self.token = token
+        self.remaining = {owner: count for owner, count in owners.items() if count >= minGroup}
+        self.listings = {}
+        self.listed = 0
+        self._lock = threading.Lock()
+        self._ownerLocks = {owner: threading.Lock() for owner in self.remaining}
+
+    def _worthListing(self, owner: str, count: int)-> bool:
+        profile = getUserInfo(owner, self.token)
+        publicRepos = profile.get("public_repos")
+        if not isinstance(publicRepos, int):
+            return False
+
+        # One profile request plus one request per listing page has to beat one request per target.
+        pages = max((publicRepos + PER_PAGE - 1) // PER_PAGE, 1)
+        return 1 + pages < count
+
+    def _listing(self, key: str, owner: str)-> dict | None:
+        with self._ownerLocks[key]:
+            if key not in self.listings:
+                listing = None
+                if self._worthListing(owner, self.remaining[key]):
+                    listing = {}
+                    for info in getOwnerRepos(owner, self.token):
+                        if "message" in info:
+                            listing = None
+                            break
+                        listing[info["full_name"].lower()] = info
+                self.listings[key] = listing
+            return self.listings[key]
+
+    def _release(self, key: str)-> None:
+        with self._lock:
+            self.remaining[key] -= 1
+            # The listing is dropped once every target of its owner has been served.
+            if self.remaining[key] <= 0:
+                self.listings[key] = None
+
+    def getRepoInfo(self, target: str)-> dict:
+        owner = target.split("/", 1)[0]
+        key = owner.lower()
+        if key not in self.remaining:
+            return getRepoInfo(target, self.token)
+
+        listing = self._listing(key, owner)
+        info = listing.get(target.lower()) if listing else None
+        self._release(key)
+
+        if info is None:
+            return getRepoInfo(target, self.token)
+
+        with self._lock:
+            self.listed += 1
+        return info
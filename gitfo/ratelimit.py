@@ -0,0 +1,148 @@
+import threading, time, typer
+
+RESOURCES = ["core", "search", "graphql"]
+RESET_MARGIN = 1.0
+PACE_RESERVE = 0.1
+
+def getResource(url: str)-> str | None:
+    path = url.split("://", 1)[-1].split("?", 1)[0]
+    if path.endswith("/rate_limit"):
+        return None
+    if "/search/" in path:
+        return "search"
+    if path.endswith("/graphql"):
+        return "graphql"
+    return "core"
+
+def _headerNumber(headers, name: str)-> float | None:
+    value = headers.get(name)
+    if not isinstance(value, str):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+def getRetryAfter(headers)-> float | None:
+    return _headerNumber(headers, "Retry-After")
+
+def _hasRateLimitedError(req)-> bool:
+    try:
+        body = req.json()
+    except ValueError:
+        return False
+    if not isinstance(body, dict):
+        return False
+    return any(isinstance(error, dict) and error.get("type") == "RATE_LIMITED" for error in body.get("errors") or [])
+
+def isRateLimited(req, resource: str=None)-> bool:
+    remaining = _headerNumber(req.headers, "X-RateLimit-Remaining")
+    # GraphQL reports a spent primary quota as a 200 carrying a RATE_LIMITED error.
+    if resource == "graphql" and req.status_code == 200:
+        return remaining == 0 and _hasRateLimitedError(req)
+    if req.status_code not in (403, 429):
+        return False
+    return remaining == 0 or _headerNumber(req.headers, "Retry-After") is not None
+
+class Bucket:
+    def __init__(self):
+        self.limit = None
+        self.remaining = None
+        self.reset = None
+        self.nextSlot = None
+
+    def refill(self, now: float)-> None:
+        if self.reset is not None and now >= self.reset:
+            self.remaining = self.limit
+            self.reset = None
+            self.nextSlot = None
+
+    def pace(self, now: float)-> float:
+        # Once the quota runs low, the rest of it is spread evenly over the window instead of spent in one burst.
+        if not self.remaining or self.reset is None or self.limit is None or self.remaining > self.limit * PACE_RESERVE:
+            return 0.0
+
+        slot = max(now, self.nextSlot or now)
+        self.nextSlot = slot + (self.reset - now) / self.remaining
+        return slot - now
+
+class RateLimiter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.buckets = {resource: Bucket() for resource in RESOURCES}
+
+    def _bucket(self, resource: str)-> Bucket:
+        if resource not in self.buckets:
+            self.buckets[resource] = Bucket()
+        return self.buckets[resource]
+
+    def acquire(self, resource: str, wait: bool=True)-> None:
+        while True:
+            with self._lock:
+                bucket = self._bucket(resource)
+                now = time.time()
+                bucket.refill(now)
+                if bucket.remaining is None or bucket.remaining > 0 or bucket.reset is None or not wait:
+                    delay = bucket.pace(now) if wait else 0.0
+                    if bucket.remaining:
+                        bucket.remaining -= 1
+                    break
+                delay = bucket.reset - now + RESET_MARGIN
+
+            resumeAt = time.strftime("%H:%M:%S", time.localtime(time.time() + delay))
+            typer.secho(f"Rate limit for '{resource}' reached. Waiting until {resumeAt}.", fg=typer.colors.YELLOW, err=True)
+            time.sleep(delay)
+
+        if delay > 0:
+            time.sleep(delay)
+
+    def update(self, resource: str, headers)-> None:
+        resource = headers.get("X-RateLimit-Resource") if isinstance(headers.get("X-RateLimit-Resource"), str) else resource
+        limit = _headerNumber(headers, "X-RateLimit-Limit")
+        remaining = _headerNumber(headers, "X-RateLimit-Remaining")
+        reset = _headerNumber(headers, "X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+
+        with self._lock:
+            bucket = self._bucket(resource)
+            if limit is not None:
+                bucket.limit = int(limit)
+            # Responses of concurrent requests arrive out of order, so within one window the lowest count wins.
+            if bucket.reset == reset and bucket.remaining is not None:
+                bucket.remaining = min(bucket.remaining, int(remaining))
+            else:
+                bucket.remaining = int(remaining)
+            bucket.reset = reset
+
+    def block(self, resource: str, headers)-> None:
+        retryAfter = _headerNumber(headers, "Retry-After")
+        reset = _headerNumber(headers, "X-RateLimit-Reset")
+        until = time.time() + retryAfter if retryAfter is not None else reset
+        if until is None:
+            until = time.time() + 60
+
+        with self._lock:
+            bucket = self._bucket(resource)
+            bucket.remaining = 0
+            bucket.reset = max(until, bucket.reset or 0)
+
+    def seed(self, resource: str, limit: int, remaining: int, reset: float)-> None:
+        with self._lock:
+            bucket = self._bucket(resource)
+            bucket.limit = limit
+            bucket.remaining = remaining
+            bucket.reset = reset
+
+    def remaining(self, resource: str)-> tuple:
+        with self._lock:
+            bucket = self._bucket(resource)
+            bucket.refill(time.time())
+            return bucket.remaining, bucket.reset
+
+    def snapshot(self)-> dict:
+        with self._lock:
+            return {
+                resource: {"limit": bucket.limit, "remaining": bucket.remaining, "reset": bucket.reset}
+                for resource, bucket in self.buckets.items()
+            }
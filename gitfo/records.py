@@ -0,0 +1,125 @@
+import sys
+from collections.abc import Mapping, MutableMapping
+
+def intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+class Record(MutableMapping):
+    # Every field is a slot instead of a dict entry. Keys that are not fields, which older rows never had, go to _extra.
+    __slots__ = ("_extra",)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = frozenset(cls.__slots__)
+
+    def __init__(self, values: dict=None, **kwargs):
+        for key, value in {**(values or {}), **kwargs}.items():
+            self[key] = value
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+
+        extra = getattr(self, "_extra", None)
+        if extra is None or key not in extra:
+            raise KeyError(key)
+        return extra[key]
+
+    def __setitem__(self, key, value)-> None:
+        if key in self._fields:
+            setattr(self, key, value)
+            return
+
+        if getattr(self, "_extra", None) is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key)-> None:
+        if key in self._fields:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+            return
+
+        extra = getattr(self, "_extra", None)
+        if extra is None or key not in extra:
+            raise KeyError(key)
+        del extra[key]
+
+    def __iter__(self):
+        for key in self.__slots__:
+            if hasattr(self, key):
+                yield key
+        yield from getattr(self, "_extra", None) or ()
+
+    def __len__(self)-> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self)-> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+class OwnerRecord(Record):
+    __slots__ = ("login", "type")
+
+class ReleaseRecord(Record):
+    __slots__ = ("tag_name", "name", "published_at", "body", "html_url")
+
+class RepoRecord(Record):
+    __slots__ = (
+        "name", "full_name", "description", "html_url", "visibility", "license", "stars", "forks", "watchers",
+        "open_issues", "default_branch", "created_at", "updated_at", "pushed_at", "topics", "owner", "error",
+        "message", "latest_release", "open_pull_requests", "branches", "branches_count", "languages",
+        "language_bytes",
+    )
+
+class UserRecord(Record):
+    __slots__ = (
+        "login", "id", "type", "name", "company", "blog", "location", "email", "bio", "twitter_username",
+        "public_repos", "public_gists", "followers", "following", "created_at", "updated_at", "error", "message",
+    )
+
+class LanguagesRecord(Mapping):
+    # Language names repeat across nearly every repository, so they are interned and kept in one tuple.
+    __slots__ = ("_names", "_values")
+
+    def __init__(self, items=()):
+        items = items.items() if isinstance(items, Mapping) else items
+        pairs = [(intern(name), value) for name, value in items]
+        self._names = tuple(name for name, _ in pairs)
+        self._values = tuple(value for _, value in pairs)
+
+    def __getitem__(self, key):
+        try:
+            return self._values[self._names.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self)-> int:
+        return len(self._names)
+
+    def __repr__(self)-> str:
+        return f"LanguagesRecord({dict(self)!r})"
+
+def makeOwner(login: str, type_: str)-> OwnerRecord:
+    owner = OwnerRecord()
+    owner.login = intern(login)
+    owner.type = intern(type_)
+    return owner
+
+def makeRepo(values: dict)-> RepoRecord:
+    # Visibility, license and default branch come from a handful of values shared by millions of rows.
+    for key in ("visibility", "license", "default_branch"):
+        values[key] = intern(values.get(key))
+    values["topics"] = [intern(topic) for topic in values.get("topics") or []]
+    return RepoRecord(values)
+
+def makeUser(values: dict)-> UserRecord:
+    values["type"] = intern(values.get("type"))
+    return UserRecord(values)
@@ -0,0 +1,59 @@
+import json, typer
+from pathlib import Path
+from .util import REPO_FIELDS, getRepoFields
+
+SNAPSHOT_TYPES = ["json", "jsonl"]
+CHANGE_FIELDS = ["updated_at", "pushed_at"]
+
+def getCarriedFields(full: bool, languages: bool, branchCount: bool=False)-> list:
+    return [field for field in getRepoFields(full, languages, branchCount) if field not in REPO_FIELDS]
+
+def _iterRows(path: str):
+    fileType = path.split(".")[-1]
+    with open(path, "r", encoding="utf-8") as f:
+        match fileType:
+            case "json":
+                data = json.load(f)
+                yield from data if isinstance(data, list) else [data]
+            case "jsonl":
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+class Snapshot:
+    def __init__(self, fields: list):
+        self.fields = fields
+        self.rows = {}
+        self.carried = 0
+
+    @classmethod
+    def load(cls, path: str, fields: list):
+        fileType = path.split(".")[-1]
+        if fileType not in SNAPSHOT_TYPES:
+            typer.secho(f"File type '.{fileType}' is not supported as a snapshot. Use .json|.jsonl.", fg=typer.colors.RED)
+            raise typer.Exit()
+        if not Path(path).is_file():
+            typer.secho(f"Snapshot file '{path}' does not exist.", fg=typer.colors.RED)
+            raise typer.Exit()
+
+        snapshot = cls(fields)
+        for row in _iterRows(path):
+            if not isinstance(row, dict) or not row.get("full_name") or "error" in row or "message" in row:
+                continue
+            # Only the timestamps and the fields that can be carried forward are kept in memory.
+            snapshot.rows[row["full_name"].lower()] = {key: row[key] for key in CHANGE_FIELDS + fields if key in row}
+        return snapshot
+
+    def carryForward(self, info: dict)-> bool:
+        previous = self.rows.get((info.get("full_name") or "").lower())
+        if previous is None:
+            return False
+
+        if any(info.get(field) is None or info.get(field) != previous.get(field) for field in CHANGE_FIELDS):
+            return False
+        if any(field not in previous for field in self.fields):
+            return False
+
+        info.update({field: previous[field] for field in self.fields})
+        self.carried += 1
+        return True
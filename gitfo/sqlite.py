@@ -0,0 +1,142 @@
+import json, sqlite3
+from datetime import datetime, timezone
+from .util import _Writer, toPlain
+
+BATCH_ROWS = 500
+
+REPO_COLUMNS = {
+    "name": "TEXT", "owner": "TEXT", "owner_type": "TEXT", "description": "TEXT", "html_url": "TEXT", "visibility": "TEXT",
+    "license": "TEXT", "stars": "INTEGER", "forks": "INTEGER", "watchers": "INTEGER", "open_issues": "INTEGER",
+    "default_branch": "TEXT", "created_at": "TEXT", "updated_at": "TEXT", "pushed_at": "TEXT", "topics": "TEXT",
+    "latest_release": "TEXT", "open_pull_requests": "INTEGER", "branches": "TEXT", "branches_count": "INTEGER", "error": "TEXT",
+    "fetched_at": "TEXT",
+}
+USER_COLUMNS = {
+    "id": "INTEGER", "type": "TEXT", "name": "TEXT", "company": "TEXT", "blog": "TEXT", "location": "TEXT", "email": "TEXT",
+    "bio": "TEXT", "twitter_username": "TEXT", "public_repos": "INTEGER", "public_gists": "INTEGER", "followers": "INTEGER",
+    "following": "INTEGER", "created_at": "TEXT", "updated_at": "TEXT", "error": "TEXT", "fetched_at": "TEXT",
+}
+TABLES = {
+    "repos": ("full_name", REPO_COLUMNS),
+    "users": ("login", USER_COLUMNS),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (full_name TEXT PRIMARY KEY COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS users (login TEXT PRIMARY KEY COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS repo_languages (
+    full_name TEXT NOT NULL COLLATE NOCASE,
+    language TEXT NOT NULL,
+    percent REAL,
+    bytes INTEGER,
+    PRIMARY KEY (full_name, language)
+);
+CREATE INDEX IF NOT EXISTS repo_languages_language ON repo_languages (language);
+"""
+LANGUAGE_COLUMNS = {"bytes": "INTEGER"}
+INDEXES = {
+    "repos": ["owner", "stars", "updated_at"],
+    "users": ["updated_at"],
+}
+
+def _toColumn(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+def _repoRow(info: dict)-> dict:
+    row = {"full_name": info["full_name"]}
+    row.update((key, _toColumn(value)) for key, value in info.items() if key in REPO_COLUMNS and key != "owner")
+
+    owner = info.get("owner")
+    if isinstance(owner, dict):
+        row["owner"] = owner.get("login")
+        row["owner_type"] = owner.get("type")
+    else:
+        row["owner"] = info["full_name"].partition("/")[0]
+
+    return row
+
+def _userRow(info: dict)-> dict:
+    row = {"login": info["login"]}
+    row.update((key, _toColumn(value)) for key, value in info.items() if key in USER_COLUMNS)
+    return row
+
+class SqliteWriter(_Writer):
+    def __init__(self, path: str):
+        super().__init__(None)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._statements = {}
+        self.pending = []
+        self._createSchema()
+
+    def _createSchema(self)-> None:
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+            # Columns are added one by one, so databases written by older versions pick up new fields.
+            for table, columns in [*((table, columns) for table, (_, columns) in TABLES.items()), ("repo_languages", LANGUAGE_COLUMNS)]:
+                existing = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+                for column, columnType in columns.items():
+                    if column not in existing:
+                        self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {columnType}")
+            for table, columns in INDEXES.items():
+                for column in columns:
+                    self.conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_{column} ON {table} ({column})")
+
+    def _upsert(self, table: str, row: dict)-> None:
+        key = TABLES[table][0]
+        columns = tuple(row)
+        statement = self._statements.get((table, columns))
+        if statement is None:
+            # Only the columns present in the row are updated, so a plain run keeps fields stored by an earlier --full run.
+            updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column != key)
+            statement = (
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT ({key}) DO UPDATE SET {updates}"
+            )
+            self._statements[(table, columns)] = statement
+        self.conn.execute(statement, tuple(row.values()))
+
+    def _writeRow(self, info: dict, fetchedAt: str)-> None:
+        if "full_name" in info:
+            row = _repoRow(info)
+            if "error" not in info:
+                row["error"] = None
+            row["fetched_at"] = fetchedAt
+            self._upsert("repos", row)
+
+            languages = info.get("languages")
+            if isinstance(languages, dict):
+                sizes = info.get("language_bytes") or {}
+                self.conn.execute("DELETE FROM repo_languages WHERE full_name = ?", (info["full_name"],))
+                self.conn.executemany(
+                    "INSERT INTO repo_languages (full_name, language, percent, bytes) VALUES (?, ?, ?, ?)",
+                    [(info["full_name"], language, percent, sizes.get(language)) for language, percent in languages.items()],
+                )
+        elif "login" in info:
+            row = _userRow(info)
+            if "error" not in info:
+                row["error"] = None
+            row["fetched_at"] = fetchedAt
+            self._upsert("users", row)
+
+    def write(self, info: dict)-> None:
+        self.pending.append(toPlain(info))
+        if len(self.pending) >= BATCH_ROWS:
+            self.flush()
+
+    def flush(self)-> None:
+        if not self.pending:
+            return
+
+        fetchedAt = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        with self.conn:
+            for info in self.pending:
+                self._writeRow(info, fetchedAt)
+        self.pending = []
+
+    def close(self)-> None:
+        self.flush()
+        self.conn.close()
@@ -0,0 +1,165 @@
+import functools, inspect, json, threading, time, typer
+from array import array
+from collections import Counter
+from contextvars import ContextVar
+
+_collector = None
+_endpoint = ContextVar("endpoint", default="other")
+
+class EndpointStats:
+    def __init__(self):
+        self.calls = 0
+        self.latencies = array("d")
+        self.bytes = 0
+        self.statusCodes = Counter()
+        self.retries = 0
+        self.cacheHits = 0
+        self.rateLimitUnits = 0
+
+def percentile(values: list, pct: float)-> float | None:
+    if not values:
+        return None
+    index = max(int(round(pct / 100 * len(values))) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+class StatsCollector:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = {}
+        self.started = time.perf_counter()
+
+    def _get(self, endpoint: str)-> EndpointStats:
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = EndpointStats()
+            self.endpoints[endpoint] = stats
+        return stats
+
+    def recordCall(self, endpoint: str, seconds: float)-> None:
+        with self._lock:
+            stats = self._get(endpoint)
+            stats.calls += 1
+            stats.latencies.append(seconds)
+
+    def recordResponse(self, status: int, size: int, countsAgainstLimit: bool)-> None:
+        with self._lock:
+            stats = self._get(_endpoint.get())
+            stats.statusCodes[status] += 1
+            stats.bytes += size
+            if countsAgainstLimit:
+                stats.rateLimitUnits += 1
+
+    def recordRetry(self)-> None:
+        with self._lock:
+            self._get(_endpoint.get()).retries += 1
+
+    def recordCacheHit(self)-> None:
+        with self._lock:
+            self._get(_endpoint.get()).cacheHits += 1
+
+    def report(self)-> dict:
+        with self._lock:
+            endpoints = {}
+            for name, stats in sorted(self.endpoints.items()):
+                latencies = sorted(stats.latencies)
+                endpoints[name] = {
+                    "calls": stats.calls,
+                    "latency_ms": {
+                        label: round(value * 1000, 1) if value is not None else None
+                        for label, value in [
+                            ("p50", percentile(latencies, 50)),
+                            ("p90", percentile(latencies, 90)),
+                            ("p99", percentile(latencies, 99)),
+                            ("max", latencies[-1] if latencies else None),
+                        ]
+                    },
+                    "bytes": stats.bytes,
+                    "status_codes": {str(code): count for code, count in sorted(stats.statusCodes.items())},
+                    "retries": stats.retries,
+                    "cache_hits": stats.cacheHits,
+                    "rate_limit_units": stats.rateLimitUnits,
+                }
+
+            return {
+                "wall_s": round(time.perf_counter() - self.started, 3),
+                "endpoints": endpoints,
+            }
+
+def enable()-> StatsCollector:
+    global _collector
+    _collector = StatsCollector()
+    return _collector
+
+def disable()-> None:
+    global _collector
+    _collector = None
+
+def getCollector()-> StatsCollector | None:
+    return _collector
+
+def _instrumentGenerator(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        collector = _collector
+        if collector is None:
+            yield from func(*args, **kwargs)
+            return
+
+        # The endpoint is only set while the generator runs, otherwise it would leak into the consumer between items.
+        gen = func(*args, **kwargs)
+        elapsed = 0.0
+        try:
+            while True:
+                token = _endpoint.set(func.__name__)
+                start = time.perf_counter()
+                try:
+                    item = next(gen)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += time.perf_counter() - start
+                    _endpoint.reset(token)
+                yield item
+        finally:
+            gen.close()
+            collector.recordCall(func.__name__, elapsed)
+
+    return wrapper
+
+def instrument(func):
+    if inspect.isgeneratorfunction(func):
+        return _instrumentGenerator(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        collector = _collector
+        if collector is None:
+            return func(*args, **kwargs)
+
+        token = _endpoint.set(func.__name__)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            collector.recordCall(func.__name__, time.perf_counter() - start)
+            _endpoint.reset(token)
+
+    return wrapper
+
+def printReport(report: dict)-> None:
+    header = f"{'endpoint':<20}{'calls':>8}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'bytes':>12}{'retries':>9}{'cached':>8}{'units':>8}  status"
+    typer.secho(header, fg=typer.colors.GREEN, err=True)
+    for name, stats in report["endpoints"].items():
+        latency = stats["latency_ms"]
+        codes = " ".join(f"{code}:{count}" for code, count in stats["status_codes"].items())
+        cell = lambda value: "-" if value is None else value
+        typer.echo(
+            f"{name:<20}{stats['calls']:>8}{cell(latency['p50']):>9}{cell(latency['p90']):>9}{cell(latency['p99']):>9}"
+            f"{stats['bytes']:>12}{stats['retries']:>9}{stats['cache_hits']:>8}{stats['rate_limit_units']:>8}  {codes}",
+            err=True,
+        )
+    typer.echo(f"wall time: {report['wall_s']}s", err=True)
+
+def writeReport(report: dict, path: str)-> None:
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
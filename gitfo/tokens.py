@@ -0,0 +1,51 @@
+import hashlib, threading, typer
+from . import transport
+from .github_api import getRateLimitResources
+
+def readTokens(source: str)-> list:
+    with open(source, "r") as s:
+        return [line.strip() for line in s if line.strip() and not line.strip().startswith("#")]
+
+class TokenPool:
+    def __init__(self, tokens: list):
+        self._lock = threading.Lock()
+        self.tokens = list(dict.fromkeys(tokens))
+        self.key = "pool:" + hashlib.sha256("\n".join(sorted(self.tokens)).encode()).hexdigest()
+
+    def refresh(self)-> None:
+        for token in list(self.tokens):
+            resources = getRateLimitResources(token)
+            if "message" in resources:
+                self.drop(token)
+                continue
+
+            limiter = transport.getLimiter(token)
+            for resource, state in resources.items():
+                if state["remaining"] is not None:
+                    limiter.seed(resource, state["limit"], state["remaining"], state["reset"])
+
+    def choose(self, resource: str)-> str:
+        with self._lock:
+            tokens = list(self.tokens)
+        if not tokens:
+            # Falling back to anonymous requests would crawl along at 60 per hour.
+            typer.secho("Authorization token incorrect!", fg=typer.colors.RED, err=True)
+            raise typer.Exit()
+
+        def score(token):
+            remaining, reset = transport.getLimiter(token).remaining(resource)
+            if remaining is None:
+                return (float("inf"), 0)
+            return (remaining, -(reset or 0))
+
+        return max(tokens, key=score)
+
+    def drop(self, token: str)-> bool:
+        with self._lock:
+            if token not in self.tokens:
+                return bool(self.tokens)
+            self.tokens.remove(token)
+            remaining = len(self.tokens)
+
+        typer.secho(f"Dropped a token with bad credentials. {remaining} token(s) left.", fg=typer.colors.YELLOW, err=True)
+        return remaining > 0
@@ -0,0 +1,243 @@
+import threading, random, time, typer
+from contextlib import contextmanager
+from contextvars import ContextVar
+from . import stats
+from .util import getHeaders
+from .cache import makeKey
+from .ratelimit import RateLimiter, getResource, isRateLimited, getRetryAfter
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 4
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+SECONDARY_LIMIT_WAIT = 60.0
+RETRY_STATUSES = {500, 502, 503, 504}
+
+class ApiUnavailable(typer.Exit):
+    def __init__(self, url: str):
+        super().__init__()
+        self.url = url
+
+_lock = threading.Lock()
+_session = None
+_poolSize = DEFAULT_POOL_SIZE
+_headers = {}
+_cache = None
+_limiters = {}
+_waitForReset = False
+_waitOverride = ContextVar("waitForReset", default=None)
+_tokenPool = None
+_retries = DEFAULT_RETRIES
+
+CACHED_HEADERS = ["Content-Type", "ETag", "Last-Modified", "Link"]
+
+def configure(poolSize: int=DEFAULT_POOL_SIZE)-> None:
+    global _session, _poolSize
+    with _lock:
+        _poolSize = max(poolSize, 1)
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def getSession():
+    global _session
+    with _lock:
+        if _session is None:
+            # requests costs more to import than the rest of the CLI, so it loads with the first session.
+            import requests
+            from requests.adapters import HTTPAdapter
+            adapter = HTTPAdapter(pool_connections=_poolSize, pool_maxsize=_poolSize)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+def getPoolSize()-> int:
+    return _poolSize
+
+def configureCache(cache)-> None:
+    global _cache
+    _cache = cache
+
+def getCache():
+    return _cache
+
+def setWaitForReset(wait: bool)-> None:
+    global _waitForReset
+    _waitForReset = wait
+
+@contextmanager
+def waitingForReset(wait: bool=True):
+    # Overrides setWaitForReset for the current context only, e.g. one request of a long-running server.
+    token = _waitOverride.set(wait)
+    try:
+        yield
+    finally:
+        _waitOverride.reset(token)
+
+def _shouldWait()-> bool:
+    wait = _waitOverride.get()
+    return _waitForReset if wait is None else wait
+
+def getLimiter(token: str)-> RateLimiter:
+    with _lock:
+        limiter = _limiters.get(token)
+        if limiter is None:
+            limiter = RateLimiter()
+            _limiters[token] = limiter
+        return limiter
+
+def useTokenPool(pool)-> None:
+    global _tokenPool
+    _tokenPool = pool
+
+def getTokenPool():
+    return _tokenPool
+
+def configureRetries(retries: int=DEFAULT_RETRIES)-> None:
+    global _retries
+    _retries = max(retries, 0)
+
+def getBackoff(attempt: int)-> float:
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+def _isSecondaryLimit(req)-> bool:
+    return req.status_code == 403 and isinstance(req.text, str) and "secondary rate limit" in req.text.lower()
+
+def _fail(url: str, message: str=None):
+    typer.secho(message or "Api not responding. Try again later.", fg=typer.colors.RED, err=True)
+    raise ApiUnavailable(url)
+
+def _send(method: str, url: str, token: str, extraHeaders: dict, timeout: int, **kwargs):
+    from requests.exceptions import RequestException
+
+    resource = getResource(url)
+    pool = _tokenPool
+    wait = _shouldWait()
+    attempt = 0
+
+    while True:
+        if pool is not None:
+            token = pool.choose(resource or "core")
+        headers = _getCachedHeaders(token)
+        if extraHeaders:
+            headers = {**headers, **extraHeaders}
+
+        limiter = getLimiter(token)
+        if resource is not None:
+            limiter.acquire(resource, wait)
+
+        collector = stats.getCollector()
+        if collector is not None and attempt:
+            collector.recordRetry()
+
+        try:
+            req = getSession().request(method, url, headers=headers, timeout=timeout, **kwargs)
+        except RequestException:
+            if attempt >= _retries:
+                _fail(url)
+            time.sleep(getBackoff(attempt))
+            attempt += 1
+            continue
+
+        if collector is not None:
+            collector.recordResponse(req.status_code, len(req.content or b""), resource is not None and req.status_code != 304)
+
+        if pool is not None and req.status_code == 401:
+            # Another token is tried; once none is left, choose stops the run.
+            pool.drop(token)
+            continue
+
+        if resource is not None:
+            limiter.update(resource, req.headers)
+
+        secondaryLimit = _isSecondaryLimit(req)
+        if req.status_code in RETRY_STATUSES or secondaryLimit:
+            if attempt >= _retries:
+                _fail(url, "Secondary rate limit still exceeded. Try again later." if secondaryLimit else None)
+
+            delay = getRetryAfter(req.headers)
+            if delay is None:
+                delay = getBackoff(attempt)
+            if secondaryLimit:
+                delay = max(delay, SECONDARY_LIMIT_WAIT)
+            time.sleep(delay)
+            attempt += 1
+            continue
+
+        if resource is None or not isRateLimited(req, resource):
+            return req
+
+        limiter.block(resource, req.headers)
+        if not wait:
+            return req
+
+def _getCachedHeaders(token: str)-> dict:
+    headers = _headers.get(token)
+    if headers is None:
+        headers = getHeaders(token)
+        _headers[token] = headers
+    return headers
+
+def _fromCache(entry: dict, req):
+    from requests import Response
+    from requests.structures import CaseInsensitiveDict
+
+    response = Response()
+    response.status_code = entry["status"]
+    response.url = entry["url"]
+    response.encoding = "utf-8"
+    response._content = entry["body"].encode("utf-8")
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response.headers.update(req.headers)
+    response.fromCache = True
+
+    return response
+
+def _store(cache, key: str, req)-> None:
+    if req.status_code != 200:
+        return
+
+    etag = req.headers.get("ETag")
+    lastModified = req.headers.get("Last-Modified")
+    if not isinstance(etag, str) and not isinstance(lastModified, str):
+        return
+
+    cache.put(key, {
+        "url": req.url,
+        "status": req.status_code,
+        "headers": {name: req.headers[name] for name in CACHED_HEADERS if isinstance(req.headers.get(name), str)},
+        "body": req.text,
+    })
+
+def get(url: str, token: str, timeout: int=10):
+    cache = _cache
+    headers = {}
+    entry = None
+
+    if cache is not None:
+        key = makeKey(url, _tokenPool.key if _tokenPool is not None else token)
+        entry = cache.get(key)
+        if entry is not None:
+            if entry["headers"].get("ETag"):
+                headers["If-None-Match"] = entry["headers"]["ETag"]
+            if entry["headers"].get("Last-Modified"):
+                headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+    req = _send("GET", url, token, headers, timeout)
+
+    if cache is None:
+        return req
+
+    if req.status_code == 304 and entry is not None:
+        collector = stats.getCollector()
+        if collector is not None:
+            collector.recordCacheHit()
+        return _fromCache(entry, req)
+
+    _store(cache, key, req)
+    return req
+
+def post(url: str, token: str, payload: dict, timeout: int=30):
+    return _send("POST", url, token, None, timeout, json=payload)
@@ -1,4 +1,40 @@
-import csv, json, typer, os
+import csv, json, typer, os, sys, gzip, hashlib, contextvars
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+OUTPUT_TYPES = ["txt", "csv", "json", "jsonl", "sqlite", "db"]
+SQLITE_TYPES = ["sqlite", "db"]
+
+REPO_FIELDS = [
+    "name", "full_name", "description", "html_url", "visibility", "license", "stars", "forks", "watchers",
+    "open_issues", "default_branch", "created_at", "updated_at", "pushed_at", "topics", "owner", "error",
+    "message",
+]
+REPO_FULL_FIELDS = ["latest_release", "open_pull_requests", "branches", "languages", "language_bytes"]
+REPO_LANGUAGE_FIELDS = ["languages", "language_bytes"]
+USER_FIELDS = [
+    "login", "id", "type", "name", "company", "blog", "location", "email", "bio", "twitter_username",
+    "public_repos", "public_gists", "followers", "following", "created_at", "updated_at", "error", "message",
+]
+
+def getRepoFields(full: bool, languages: bool, branchCount: bool=False)-> list:
+    fields = list(REPO_FIELDS)
+    if full:
+        fields += REPO_FULL_FIELDS
+    elif languages:
+        fields += REPO_LANGUAGE_FIELDS
+    if branchCount:
+        fields = [field for field in fields if field != "branches"] + ["branches_count"]
+    return fields
+
+def toPlain(value):
+    # Results are compact records until they reach a writer, which needs plain dicts and lists.
+    if isinstance(value, Mapping):
+        return {key: toPlain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [toPlain(item) for item in value]
+    return value
 
 def prepareForCsv(info: dict)-> dict:
     out = {}
@@ -13,6 +49,7 @@ def prepareForCsv(info: dict)-> dict:
     return out
 
 def printOutput(info: dict)-> None:
+    info = toPlain(info)
     for key, value in info.items():
         key = typer.style(key, fg=typer.colors.GREEN)
         if isinstance(value, list):
@@ -28,7 +65,13 @@ def printOutput(info: dict)-> None:
             typer.echo(f"{key}: {value}")
 
 def printOutputToFile(info: dict, outputFile: str)-> None:
+    info = toPlain(info)
     fileType = outputFile.split(".")[-1]
+    if fileType in SQLITE_TYPES:
+        with openWriter(outputFile, info.keys()) as writer:
+            writer.write(info)
+        return
+
     with open(outputFile, "w+") as f:
         match fileType:
             case "txt":
@@ -44,37 +87,102 @@ def printOutputToFile(info: dict, outputFile: str)-> None:
             case "json":
                 json.dump(info, f, ensure_ascii=False, indent=2)
             case _:
-                typer.secho(f"File type '.{fileType}' is not supported. Use .txt|.csv|.json.", fg=typer.colors.RED)
+                typer.secho(f"File type '.{fileType}' is not supported. Use .txt|.csv|.json|.sqlite|.db.", fg=typer.colors.RED)
                 f.close()
                 os.remove(outputFile)
                 raise typer.Exit()
 
-def printMultipleToFile(infos: list, outputFile: str)-> None:
+class _Writer:
+    def __init__(self, f):
+        self.f = f
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, info: dict)-> None:
+        self._write(toPlain(info))
+        self.f.flush()
+
+    def close(self)-> None:
+        if self.f is not sys.stdout:
+            self.f.close()
+
+class TxtWriter(_Writer):
+    def _write(self, info: dict)-> None:
+        for key, value in info.items():
+            self.f.write(f"{key}: {value}\n")
+        self.f.write("\n")
+
+class CsvWriter(_Writer):
+    def __init__(self, f, fieldnames: list):
+        super().__init__(f)
+        self.writer = csv.DictWriter(f, sorted(fieldnames), extrasaction="ignore")
+        self.writer.writeheader()
+
+    def _write(self, info: dict)-> None:
+        self.writer.writerow(prepareForCsv(info))
+
+class JsonWriter(_Writer):
+    def __init__(self, f):
+        super().__init__(f)
+        self.count = 0
+
+    def _write(self, info: dict)-> None:
+        item = json.dumps(info, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+        self.f.write(("[\n  " if self.count == 0 else ",\n  ") + item)
+        self.count += 1
+
+    def close(self)-> None:
+        self.f.write("\n]" if self.count else "[]")
+        super().close()
+
+class JsonlWriter(_Writer):
+    def _write(self, info: dict)-> None:
+        self.f.write(json.dumps(info, ensure_ascii=False) + "\n")
+
+def checkOutputType(outputFile: str)-> None:
+    if outputFile == "-":
+        return
+
     fileType = outputFile.split(".")[-1]
-    with open(outputFile, "w+") as f:
-        match fileType:
-            case "txt":
-                for info in infos:
-                    for key, value in info.items():
-                        f.write(f"{key}: {value}\n")
-                    f.write("\n")
-            case "csv":
-                fieldnames = set()
-                for info in infos:
-                    fieldnames.update(info.keys())
-                for i in range(len(infos)):
-                    infos[i] = prepareForCsv(infos[i])
+    if fileType not in OUTPUT_TYPES:
+        typer.secho(f"File type '.{fileType}' is not supported. Use .txt|.csv|.json|.jsonl|.sqlite|.db.", fg=typer.colors.RED)
+        raise typer.Exit()
 
-                writer = csv.DictWriter(f, sorted(fieldnames))
-                writer.writeheader()
-                writer.writerows(infos)
-            case "json":
-                json.dump(infos, f, ensure_ascii=False, indent=2)
-            case _:
-                typer.secho(f"File type '.{fileType}' is not supported. Use .txt|.csv|.json.", fg=typer.colors.RED)
-                f.close()
-                os.remove(outputFile)
-                raise typer.Exit()
+def openWriter(outputFile: str, fieldnames: list):
+    if outputFile == "-":
+        return JsonlWriter(sys.stdout)
+
+    checkOutputType(outputFile)
+    fileType = outputFile.split(".")[-1]
+
+    if fileType in SQLITE_TYPES:
+        # Imported here so sqlite3 is only loaded when a database is written.
+        from .sqlite import SqliteWriter
+        return SqliteWriter(outputFile)
+
+    f = open(outputFile, "w+", newline="" if fileType == "csv" else None)
+    match fileType:
+        case "txt":
+            return TxtWriter(f)
+        case "csv":
+            return CsvWriter(f, fieldnames)
+        case "json":
+            return JsonWriter(f)
+        case "jsonl":
+            return JsonlWriter(f)
+
+def printMultipleToFile(infos: list, outputFile: str)-> None:
+    fieldnames = set()
+    for info in infos:
+        fieldnames.update(info.keys())
+
+    with openWriter(outputFile, fieldnames) as writer:
+        for info in infos:
+            writer.write(info)
 
 def getHeaders(token: str)-> dict:
     headers = {
@@ -86,21 +194,83 @@ def getHeaders(token: str)-> dict:
 
     return headers
 
-def getItems(source: str)-> list:
+def _openSource(source: str):
+    if source == "-":
+        return sys.stdin
+
     fileType = source.split(".")[-1]
-    if fileType != "txt":
-        typer.secho(f"File type '.{fileType}' is not supported as a source file. Use .txt.", fg=typer.colors.RED)
-        raise typer.Exit()
-    
-    with open(source, "r") as s:
-        out = [line.strip() for line in s]
+    match fileType:
+        case "txt":
+            return open(source, "r", encoding="utf-8")
+        case "gz":
+            return gzip.open(source, "rt", encoding="utf-8")
+        case _:
+            typer.secho(f"File type '.{fileType}' is not supported as a source file. Use .txt|.gz or - for stdin.", fg=typer.colors.RED)
+            raise typer.Exit()
 
-    return out
+def iterItems(source: str):
+    s = _openSource(source)
+    # Only a 64-bit digest of every target is kept, which stays small for inputs with millions of lines.
+    seen = set()
+    try:
+        for line in s:
+            item = line.strip()
+            if not item or item.startswith("#"):
+                continue
+
+            digest = hashlib.blake2b(item.lower().encode("utf-8"), digest_size=8).digest()
+            if digest in seen:
+                continue
+            seen.add(digest)
+
+            yield item
+    finally:
+        if s is not sys.stdin:
+            s.close()
+
+def inShard(item: str, shard: tuple)-> bool:
+    # A stable hash instead of hash(), which is salted per process, so every machine splits the source the same way.
+    digest = hashlib.blake2b(item.lower().encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard[1] == shard[0] - 1
+
+def getItems(source: str)-> list:
+    return list(iterItems(source))
+
+def isNotFound(info: dict)-> bool:
+    return "error" in info and "not found" in info["error"].lower()
 
 def removeNotFound(infos: list)-> list:
     out = []
     for info in infos:
-        if "error" in info and "not found" in info["error"].lower():
+        if isNotFound(info):
             continue
         out.append(info)
-    return out
\ No newline at end of file
+    return out
+
+def chunked(items, size: int):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def mapOrdered(func, items, workers: int):
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(contextvars.copy_context().run, func, item))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
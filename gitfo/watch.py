@@ -0,0 +1,75 @@
+import time
+from datetime import datetime, timezone
+
+DEFAULT_INTERVAL = 300.0
+# updated_at moves with every star and fork, so by default it is not reported on its own.
+IGNORED_FIELDS = {"updated_at"}
+
+def diffInfo(old: dict, new: dict, fields: list=None)-> dict:
+    keys = fields or [key for key in {**new, **old} if key not in IGNORED_FIELDS]
+
+    changes = {}
+    for key in keys:
+        before, after = old.get(key), new.get(key)
+        if before == after:
+            continue
+
+        change = {"old": before, "new": after}
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in (before, after)):
+            change["delta"] = after - before
+        changes[key] = change
+
+    return changes
+
+class Watcher:
+    def __init__(self, targets: list, fetch, interval: float=DEFAULT_INTERVAL, fields: list=None, clock=time.monotonic, sleep=time.sleep):
+        self.targets = targets
+        self.fetch = fetch
+        self.interval = interval
+        self.fields = fields
+        self.clock = clock
+        self.sleep = sleep
+        self.state = {}
+
+    def poll(self, target: str)-> dict | None:
+        info = self.fetch(target)
+        # Failed polls keep the previous state, so the next successful one reports everything that changed meanwhile.
+        if info is None or "message" in info:
+            return None
+
+        key = target.lower()
+        previous = self.state.get(key)
+        self.state[key] = info
+        if previous is None:
+            return None
+
+        changes = diffInfo(previous, info, self.fields)
+        if not changes:
+            return None
+
+        return {
+            "time": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "target": target,
+            "changes": changes,
+        }
+
+    def run(self, emit, cycles: int=None)-> None:
+        if not self.targets:
+            return
+
+        cycle = 0
+        start = self.clock()
+        while cycles is None or cycle < cycles:
+            # Polls are spread evenly across the interval instead of bursting at its start.
+            for i, target in enumerate(self.targets):
+                delay = start + self.interval * i / len(self.targets) - self.clock()
+                if delay > 0:
+                    self.sleep(delay)
+
+                event = self.poll(target)
+                if event is not None:
+                    emit(event)
+
+            cycle += 1
+            # A cycle that overran its interval is followed by the next one straight away.
+            start = max(start + self.interval, self.clock())
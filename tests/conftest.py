@@ -0,0 +1,17 @@
+import pytest
+from gitfo import transport, stats, daemon
+from gitfo.github_api import setApiUrl, DEFAULT_API_URL
+
+@pytest.fixture(autouse=True)
+def isolatedTransport(tmp_path, monkeypatch):
+    monkeypatch.setenv("GITFO_CACHE_DIR", str(tmp_path/"cache"))
+    yield
+    transport.configureCache(None)
+    transport.configure()
+    transport.setWaitForReset(False)
+    transport._limiters.clear()
+    transport.useTokenPool(None)
+    transport.configureRetries()
+    setApiUrl(DEFAULT_API_URL)
+    stats.disable()
+    daemon.setForwarding(False)
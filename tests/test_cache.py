@@ -0,0 +1,97 @@
+##################################
+#       Tests for cache.py       #
+##################################
+
+import pytest, os, time
+from unittest.mock import patch, MagicMock
+from requests.structures import CaseInsensitiveDict
+from gitfo import transport
+from gitfo.cache import ResponseCache, makeKey
+from gitfo.github_api import getRepoInfo
+
+def testPutAndGet(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache.put("key", {"body": "{}"})
+
+    assert cache.get("key")["body"] == "{}"
+    assert cache.get("missing") == None
+
+def testMakeKeySeparatesTokens():
+    assert makeKey("url", "tokenA") != makeKey("url", "tokenB")
+    assert makeKey("url", None) != makeKey("url", "tokenA")
+
+def testPruneEvictsLeastRecentlyUsed(tmp_path):
+    cache = ResponseCache(tmp_path)
+    for i in range(3):
+        cache.put(f"key{i}", {"body": "x" * 100})
+
+    now = time.time()
+    for i, age in enumerate([30, 10, 20]):
+        path = cache._path(f"key{i}")
+        os.utime(path, (now - age, now - age))
+
+    size = cache._path("key0").stat().st_size
+    removed = cache.prune(size * 2)
+
+    assert removed == 1
+    assert cache.get("key0") == None
+    assert cache.get("key1") != None
+
+def testPutIsPrivate(tmp_path):
+    cache = ResponseCache(tmp_path/"gitfo")
+    cache.put("key", {"body": "{}"})
+
+    path = cache._path("key")
+    assert path.stat().st_mode & 0o777 == 0o600
+    assert path.parent.stat().st_mode & 0o777 == 0o700
+    assert cache.directory.stat().st_mode & 0o777 == 0o700
+
+def testPruneSweepsStaleTmp(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache.put("key", {"body": "{}"})
+    stale = cache._path("key").with_suffix(".dead.tmp")
+    fresh = cache._path("key").with_suffix(".live.tmp")
+    stale.write_text("partial")
+    fresh.write_text("partial")
+    old = time.time() - 2 * 3600
+    os.utime(stale, (old, old))
+
+    cache.prune()
+
+    assert not stale.exists()
+    assert fresh.exists()
+    assert cache.get("key") != None
+
+def testPutRespectsMaxBytes(tmp_path):
+    cache = ResponseCache(tmp_path, maxBytes=1000)
+    for i in range(20):
+        cache.put(f"key{i}", {"body": "x" * 100})
+
+    assert cache.stats()["size_bytes"] <= 1000
+
+def testStats(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache.put("key", {"body": "{}"})
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["size_bytes"] > 0
+
+@patch("requests.Session.request")
+def testConditionalRevalidation(mockGet, tmp_path):
+    transport.configureCache(ResponseCache(tmp_path))
+    body = '{"name": "Hello-World", "owner": {"login": "octocat", "type": "User"}}'
+
+    first = MagicMock(status_code=200, url="https://api.github.com/repos/octocat/Hello-World", text=body)
+    first.headers = CaseInsensitiveDict({"ETag": '"abc"'})
+    first.json = lambda: {"name": "Hello-World", "owner": {"login": "octocat", "type": "User"}}
+    notModified = MagicMock(status_code=304)
+    notModified.headers = CaseInsensitiveDict({"X-RateLimit-Remaining": "4999"})
+    mockGet.side_effect = [first, notModified]
+
+    getRepoInfo("octocat/Hello-World", "TestToken")
+    result = getRepoInfo("octocat/Hello-World", "TestToken")
+
+    _, kwargs = mockGet.call_args
+    assert kwargs["headers"]["If-None-Match"] == '"abc"'
+    assert result["name"] == "Hello-World"
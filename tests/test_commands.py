@@ -2,14 +2,19 @@
 #       Tests for main.py       #
 #################################
 
-import pytest, typer
+import pytest, typer, json, requests
 from typer.testing import CliRunner
 from unittest.mock import patch
 from gitfo import __appName__, __version__
+from gitfo import transport
 from gitfo.main import version, limit, repo, user, repobatch, userbatch, app
 
 runner = CliRunner()
 
+def writtenRows(mockOpenWriter):
+    writer = mockOpenWriter.return_value.__enter__.return_value
+    return [args[0] for args, _ in writer.write.call_args_list]
+
 def testVersionOption():
     result = runner.invoke(app, ["--version"])
 
@@ -184,26 +189,26 @@ def testUserRateLimitExceeded(mockGetUserInfo):
     assert result.exit_code == 0
     assert "rate limit exceeded" in result.output.lower()
 
-@patch("gitfo.main.printMultipleToFile")
+@patch("gitfo.main.openWriter")
 @patch("gitfo.main.getLanguagesInfo")
 @patch("gitfo.main.getBranchesInfo")
 @patch("gitfo.main.getOpenPRCount")
 @patch("gitfo.main.getReleasesInfo")
 @patch("gitfo.main.getRepoInfo")
-@patch("gitfo.main.getItems")
+@patch("gitfo.main.iterItems")
 @patch("pathlib.Path.is_file")
 def testRepobatch(
     mockIsFile,
-    mockGetItems,
+    mockIterItems,
     mockGetRepoInfo,
     mockGetReleasesInfo,
     mockGetOpenPRCount,
     mockGetBranchesInfo,
     mockGetLanguagesInfo,
-    mockPrintMultipleToFile,
+    mockOpenWriter,
 ):
     mockIsFile.return_value = True
-    mockGetItems.return_value = ["owner/repo1", "owner/repo2"]
+    mockIterItems.return_value = ["owner/repo1", "owner/repo2"]
 
     mockGetRepoInfo.side_effect = lambda repo, auth: {"repo": repo, "basic": True}
     mockGetReleasesInfo.return_value = {"releases": "data"}
@@ -218,16 +223,16 @@ def testRepobatch(
 
     assert result.exit_code == 0
     mockIsFile.assert_called_once_with()
-    mockGetItems.assert_called_once_with("repos.txt")
+    mockIterItems.assert_called_once_with("repos.txt")
     assert mockGetRepoInfo.call_count == 2
     assert mockGetReleasesInfo.call_count == 2
     assert mockGetOpenPRCount.call_count == 2
     assert mockGetBranchesInfo.call_count == 2
     assert mockGetLanguagesInfo.call_count >= 2
-    mockPrintMultipleToFile.assert_called_once()
-    args, _ = mockPrintMultipleToFile.call_args
-    assert isinstance(args[0], list)
-    assert args[1] == "output.json"
+    mockOpenWriter.assert_called_once()
+    args, _ = mockOpenWriter.call_args
+    assert args[0] == "output.json"
+    assert len(writtenRows(mockOpenWriter)) == 2
 
 @patch("pathlib.Path.is_file")
 def testRepobatchBadSource(mockIsFile):
@@ -238,27 +243,23 @@ def testRepobatchBadSource(mockIsFile):
 
     assert "does not exist" in result.output
 
-@patch("gitfo.main.printMultipleToFile")
-@patch("gitfo.main.removeNotFound")
+@patch("gitfo.main.openWriter")
 @patch("gitfo.main.getRepoInfo")
-@patch("gitfo.main.getItems")
+@patch("gitfo.main.iterItems")
 @patch("pathlib.Path.is_file")
 def testRepobatchSkipNotFound(
     mockIsFile,
-    mockGetItems,
+    mockIterItems,
     mockGetRepoInfo,
-    mockRemoveNotFound,
-    mockPrintMultipleToFile,
+    mockOpenWriter,
 ):
     mockIsFile.return_value = True
-    mockGetItems.return_value = ["owner/repo1", "owner/repo2"]
+    mockIterItems.return_value = ["owner/repo1", "owner/repo2"]
     
     mockGetRepoInfo.side_effect = [
         {"name": "repo1"},
         {"error": "Not Found"}
     ]
-    
-    mockRemoveNotFound.return_value = [{"name": "repo1"}]
 
     runner = CliRunner()
     result = runner.invoke(
@@ -267,27 +268,21 @@ def testRepobatchSkipNotFound(
     )
 
     assert result.exit_code == 0
-    mockRemoveNotFound.assert_called_once_with([
-        {"name": "repo1"},
-        {"error": "Not Found"}
-    ])
-    mockPrintMultipleToFile.assert_called_once_with(
-        [{"name": "repo1"}], "output.json"
-    )
+    assert writtenRows(mockOpenWriter) == [{"name": "repo1"}]
     assert mockGetRepoInfo.call_count == 2
 
-@patch("gitfo.main.printMultipleToFile")
+@patch("gitfo.main.openWriter")
 @patch("gitfo.main.getUserInfo")
-@patch("gitfo.main.getItems")
+@patch("gitfo.main.iterItems")
 @patch("pathlib.Path.is_file")
 def testUserbatch(
     mockIsFile,
-    mockGetItems,
+    mockIterItems,
     mockGetUserInfo,
-    mockPrintMultipleToFile,
+    mockOpenWriter,
 ):
     mockIsFile.return_value = True
-    mockGetItems.return_value = ["user1", "user2"]
+    mockIterItems.return_value = ["user1", "user2"]
     mockGetUserInfo.side_effect = lambda user, auth: {"user": user, "info": True}
 
     result = runner.invoke(
@@ -297,14 +292,14 @@ def testUserbatch(
 
     assert result.exit_code == 0
     mockIsFile.assert_called_once_with()
-    mockGetItems.assert_called_once_with("users.txt")
+    mockIterItems.assert_called_once_with("users.txt")
     assert mockGetUserInfo.call_count == 2
     mockGetUserInfo.assert_any_call("user1", "mytoken")
     mockGetUserInfo.assert_any_call("user2", "mytoken")
-    mockPrintMultipleToFile.assert_called_once()
-    args, _ = mockPrintMultipleToFile.call_args
-    assert isinstance(args[0], list)
-    assert args[1] == "output.json"
+    mockOpenWriter.assert_called_once()
+    args, _ = mockOpenWriter.call_args
+    assert args[0] == "output.json"
+    assert len(writtenRows(mockOpenWriter)) == 2
 
 @patch("pathlib.Path.is_file")
 def testUserbatchBadSource(mockIsFile):
@@ -315,27 +310,23 @@ def testUserbatchBadSource(mockIsFile):
 
     assert "does not exist" in result.output
 
-@patch("gitfo.main.printMultipleToFile")
-@patch("gitfo.main.removeNotFound")
+@patch("gitfo.main.openWriter")
 @patch("gitfo.main.getUserInfo")
-@patch("gitfo.main.getItems")
+@patch("gitfo.main.iterItems")
 @patch("pathlib.Path.is_file")
 def testUserbatchSkipNotFound(
     mockIsFile,
-    mockGetItems,
+    mockIterItems,
     mockGetUserInfo,
-    mockRemoveNotFound,
-    mockPrintMultipleToFile,
+    mockOpenWriter,
 ):
     mockIsFile.return_value = True
-    mockGetItems.return_value = ["user1", "user2"]
+    mockIterItems.return_value = ["user1", "user2"]
     
     mockGetUserInfo.side_effect = [
         {"name": "user1"},
         {"error": "Not Found"}
     ]
-    
-    mockRemoveNotFound.return_value = [{"name": "user1"}]
 
     runner = CliRunner()
     result = runner.invoke(
@@ -344,11 +335,329 @@ def testUserbatchSkipNotFound(
     )
 
     assert result.exit_code == 0
-    mockRemoveNotFound.assert_called_once_with([
-        {"name": "user1"},
-        {"error": "Not Found"}
-    ])
-    mockPrintMultipleToFile.assert_called_once_with(
-        [{"name": "user1"}], "output.json"
+    assert writtenRows(mockOpenWriter) == [{"name": "user1"}]
+    assert mockGetUserInfo.call_count == 2
+
+@patch("gitfo.main.openWriter")
+@patch("gitfo.main.getUserInfo")
+@patch("gitfo.main.iterItems")
+@patch("pathlib.Path.is_file")
+def testUserbatchWorkers(
+    mockIsFile,
+    mockIterItems,
+    mockGetUserInfo,
+    mockOpenWriter,
+):
+    mockIsFile.return_value = True
+    mockIterItems.return_value = [f"user{i}" for i in range(10)]
+    mockGetUserInfo.side_effect = lambda user, auth: {"login": user}
+
+    result = runner.invoke(
+        app,
+        ["userbatch", "users.txt", "output.json", "--workers", "4"]
     )
-    assert mockGetUserInfo.call_count == 2
\ No newline at end of file
+
+    assert result.exit_code == 0
+    assert mockGetUserInfo.call_count == 10
+    assert writtenRows(mockOpenWriter) == [{"login": f"user{i}"} for i in range(10)]
+
+
+@patch("gitfo.main.printOutput")
+@patch("gitfo.main.getRepoInfo")
+@patch("gitfo.main.getReleasesInfo")
+@patch("gitfo.main.getOpenPRCount")
+@patch("gitfo.main.getBranchesInfo")
+@patch("gitfo.main.getLanguagesInfo")
+def testRepoFullMergeOrder(
+    mockGetLanguages,
+    mockGetBranches,
+    mockGetPRS,
+    mockGetReleases,
+    mockGetRepoInfo,
+    mockPrintOutput
+):
+    mockGetRepoInfo.return_value = {"name": "Repo"}
+    mockGetReleases.return_value = {"latest_release": None}
+    mockGetPRS.return_value = {"open_pull_requests": 42}
+    mockGetBranches.return_value = {"branches": "main"}
+    mockGetLanguages.return_value = {"languages": {"Python": 95}}
+
+    result = runner.invoke(app, ["repo", "octocat/Hello-World", "--full", "--with-languages"])
+
+    assert result.exit_code == 0
+    assert mockGetLanguages.call_count == 1
+    args, _ = mockPrintOutput.call_args
+    assert list(args[0].keys()) == ["name", "latest_release", "open_pull_requests", "branches", "languages"]
+
+@patch("gitfo.main.openWriter")
+@patch("gitfo.main.getReleasesInfo")
+@patch("gitfo.main.getRepoInfo")
+@patch("gitfo.main.iterItems")
+@patch("pathlib.Path.is_file")
+def testRepobatchFullSkipsDetailsForMissing(
+    mockIsFile,
+    mockIterItems,
+    mockGetRepoInfo,
+    mockGetReleasesInfo,
+    mockOpenWriter,
+):
+    mockIsFile.return_value = True
+    mockIterItems.return_value = ["owner/missing"]
+    mockGetRepoInfo.return_value = {"full_name": "owner/missing", "error": "Not Found"}
+
+    result = runner.invoke(app, ["repobatch", "repos.txt", "output.json", "--full"])
+
+    assert result.exit_code == 0
+    mockGetReleasesInfo.assert_not_called()
+    assert writtenRows(mockOpenWriter) == [{"full_name": "owner/missing", "error": "Not Found"}]
+
+def testCacheStats(tmp_path):
+    result = runner.invoke(app, ["cache", "stats"])
+
+    assert result.exit_code == 0
+    assert "entries" in result.output
+
+def testCachePrune():
+    result = runner.invoke(app, ["cache", "prune", "--max-size", "0"])
+
+    assert result.exit_code == 0
+    assert "removed 0" in result.output.lower()
+
+@patch("gitfo.main.openWriter")
+@patch("gitfo.main.getRepoInfoBatch")
+@patch("gitfo.main.iterItems")
+@patch("pathlib.Path.is_file")
+def testRepobatchGraphqlBackend(
+    mockIsFile,
+    mockIterItems,
+    mockGetRepoInfoBatch,
+    mockOpenWriter,
+):
+    mockIsFile.return_value = True
+    mockIterItems.return_value = [f"owner/repo{i}" for i in range(60)]
+    mockGetRepoInfoBatch.side_effect = lambda batch, auth, full, languages, branchCount: [{"full_name": repo} for repo in batch]
+
+    result = runner.invoke(app, ["repobatch", "repos.txt", "output.json", "--backend", "graphql", "-a", "token"])
+
+    assert result.exit_code == 0
+    assert mockGetRepoInfoBatch.call_count == 2
+    assert writtenRows(mockOpenWriter) == [{"full_name": f"owner/repo{i}"} for i in range(60)]
+
+@patch("pathlib.Path.is_file")
+def testRepobatchGraphqlRequiresAuth(mockIsFile):
+    mockIsFile.return_value = True
+
+    result = runner.invoke(app, ["repobatch", "repos.txt", "output.json", "--backend", "graphql"])
+
+    assert "requires authorization" in result.output.lower()
+
+@patch("gitfo.main.openWriter")
+@patch("gitfo.main.getUserInfo")
+@patch("gitfo.main.iterItems")
+@patch("gitfo.main.TokenPool")
+@patch("pathlib.Path.is_file")
+def testUserbatchTokenPool(
+    mockIsFile,
+    mockTokenPool,
+    mockIterItems,
+    mockGetUserInfo,
+    mockOpenWriter,
+):
+    mockIsFile.return_value = True
+    mockTokenPool.return_value.tokens = ["tokenA", "tokenB"]
+    mockIterItems.return_value = ["user1"]
+    mockGetUserInfo.side_effect = lambda user, auth: {"login": user}
+
+    result = runner.invoke(app, ["userbatch", "users.txt", "output.json", "-a", "tokenA", "-a", "tokenB"])
+
+    assert result.exit_code == 0
+    mockTokenPool.assert_called_once_with(["tokenA", "tokenB"])
+    mockTokenPool.return_value.refresh.assert_called_once()
+    mockGetUserInfo.assert_called_once_with("user1", None)
+
+@patch("gitfo.main.getUserInfo")
+def testUserbatchResume(mockGetUserInfo, tmp_path):
+    source = tmp_path/"users.txt"
+    source.write_text("user1\nuser2\n")
+    output = tmp_path/"output.json"
+    journal = tmp_path/"output.json.journal"
+    journal.write_text(json.dumps({"target": "user1", "info": {"login": "user1"}}) + "\n")
+    mockGetUserInfo.side_effect = lambda user, auth: {"login": user}
+
+    result = runner.invoke(app, ["userbatch", str(source), str(output), "--resume"])
+
+    assert result.exit_code == 0
+    mockGetUserInfo.assert_called_once_with("user2", None)
+    assert json.loads(output.read_text()) == [{"login": "user1"}, {"login": "user2"}]
+    assert not journal.exists()
+
+@patch("gitfo.main.getUserInfo")
+def testUserbatchResumeUnsupportedOutput(mockGetUserInfo, tmp_path):
+    source = tmp_path/"users.txt"
+    source.write_text("user1\nuser2\n")
+    output = tmp_path/"output.xlsx"
+
+    result = runner.invoke(app, ["userbatch", str(source), str(output), "--resume"])
+
+    assert "not supported" in result.output
+    mockGetUserInfo.assert_not_called()
+    assert not (tmp_path/"output.xlsx.journal").exists()
+
+@patch("gitfo.main.getUserInfo")
+def testUserbatchDeadLetter(mockGetUserInfo, tmp_path):
+    source = tmp_path/"users.txt"
+    source.write_text("user1\nuser2\nuser3\n")
+    output = tmp_path/"output.json"
+
+    def fetch(user, auth):
+        if user == "user2":
+            raise transport.ApiUnavailable("https://api.github.com/users/user2")
+        return {"login": user}
+    mockGetUserInfo.side_effect = fetch
+
+    result = runner.invoke(app, ["userbatch", str(source), str(output)])
+
+    assert result.exit_code == 0
+    assert json.loads(output.read_text()) == [{"login": "user1"}, {"login": "user3"}]
+    assert (tmp_path/"output.json.failed.txt").read_text() == "user2\n"
+
+@patch("gitfo.main.getUserInfo")
+def testUserbatchUndecodableBody(mockGetUserInfo, tmp_path):
+    source = tmp_path/"users.txt"
+    source.write_text("user1\nuser2\n")
+    output = tmp_path/"output.json"
+
+    def fetch(user, auth):
+        if user == "user1":
+            raise requests.exceptions.JSONDecodeError("Expecting value", "<html>", 0)
+        return {"login": user}
+    mockGetUserInfo.side_effect = fetch
+
+    result = runner.invoke(app, ["userbatch", str(source), str(output)])
+
+    assert result.exit_code == 0
+    assert json.loads(output.read_text()) == [{"login": "user2"}]
+    assert (tmp_path/"output.json.failed.txt").read_text() == "user1\n"
+
+@patch("gitfo.main.getUserInfo")
+def testUserbatchClearsStaleDeadLetter(mockGetUserInfo, tmp_path):
+    source = tmp_path/"users.txt"
+    source.write_text("user1\n")
+    output = tmp_path/"output.json"
+    failed = tmp_path/"output.json.failed.txt"
+    failed.write_text("user1\n")
+    mockGetUserInfo.side_effect = lambda user, auth: {"login": user}
+
+    result = runner.invoke(app, ["userbatch", str(source), str(output)])
+
+    assert result.exit_code == 0
+    assert not failed.exists()
+
+@pytest.mark.parametrize("explicit", [False, True])
+@patch("gitfo.main.getUserInfo")
+def testUserbatchRetriesDeadLetter(mockGetUserInfo, explicit, tmp_path):
+    output = tmp_path/"output.json"
+    failed = tmp_path/"output.json.failed.txt"
+    failed.write_text("user1\nuser2\n")
+
+    def fetch(user, auth):
+        if user == "user2":
+            raise transport.ApiUnavailable("https://api.github.com/users/user2")
+        return {"login": user}
+    mockGetUserInfo.side_effect = fetch
+
+    args = ["--failed-file", str(failed)] if explicit else []
+    result = runner.invoke(app, ["userbatch", str(failed), str(output), *args])
+
+    assert result.exit_code == 0
+    assert json.loads(output.read_text()) == [{"login": "user1"}]
+    assert failed.read_text() == "user2\n"
+
+@patch("gitfo.main.openWriter")
+@patch("gitfo.main.getLanguagesInfo")
+@patch("gitfo.main.getBranchesInfo")
+@patch("gitfo.main.getOpenPRCount")
+@patch("gitfo.main.getReleasesInfo")
+@patch("gitfo.main.getRepoInfo")
+@patch("gitfo.main.iterItems")
+def testRepobatchSinceSnapshot(
+    mockIterItems,
+    mockGetRepoInfo,
+    mockGetReleasesInfo,
+    mockGetOpenPRCount,
+    mockGetBranchesInfo,
+    mockGetLanguagesInfo,
+    mockOpenWriter,
+    tmp_path,
+):
+    source = tmp_path/"repos.txt"
+    source.write_text("")
+    snapshot = tmp_path/"previous.jsonl"
+    previous = {"updated_at": "2025-01-01", "pushed_at": "2025-01-01", "latest_release": None, "open_pull_requests": 1, "branches": "main", "languages": {"C": 100.0}, "language_bytes": {"C": 10}}
+    snapshot.write_text("\n".join(json.dumps({"full_name": name, **previous}) for name in ["owner/same", "owner/changed"]))
+
+    mockIterItems.return_value = ["owner/same", "owner/changed", "owner/new"]
+    mockGetRepoInfo.side_effect = lambda repo, auth: {"full_name": repo, "updated_at": "2025-01-01", "pushed_at": "2025-02-01" if repo == "owner/changed" else "2025-01-01"}
+    mockGetReleasesInfo.return_value = {"latest_release": {"tag_name": "v2"}}
+    mockGetOpenPRCount.return_value = {"open_pull_requests": 5}
+    mockGetBranchesInfo.return_value = {"branches": "main|dev"}
+    mockGetLanguagesInfo.return_value = {"languages": {"Go": 100.0}, "language_bytes": {"Go": 10}}
+
+    result = runner.invoke(app, ["repobatch", str(source), "output.json", "--full", "--since-snapshot", str(snapshot)])
+
+    rows = writtenRows(mockOpenWriter)
+    assert result.exit_code == 0
+    assert mockGetRepoInfo.call_count == 3
+    assert mockGetReleasesInfo.call_count == 2
+    assert rows[0]["branches"] == "main" and rows[0]["languages"] == {"C": 100.0}
+    assert rows[1]["branches"] == "main|dev" and rows[1]["open_pull_requests"] == 5
+    assert rows[2]["branches"] == "main|dev"
+    assert "Carried forward 1" in result.output
+
+@patch("gitfo.main.openWriter")
+@patch("gitfo.main.getRepoInfoBatch")
+@patch("gitfo.main.iterItems")
+def testRepobatchGraphqlSinceSnapshot(mockIterItems, mockGetRepoInfoBatch, mockOpenWriter, tmp_path):
+    source = tmp_path/"repos.txt"
+    source.write_text("")
+    snapshot = tmp_path/"previous.json"
+    snapshot.write_text(json.dumps([{"full_name": "owner/same", "updated_at": "1", "pushed_at": "1", "languages": {"C": 100.0}, "language_bytes": {"C": 10}}]))
+
+    mockIterItems.return_value = ["owner/same", "owner/changed"]
+    def fetchBatch(batch, auth, full=False, languages=False, branchCount=False):
+        return [{"full_name": repo, "updated_at": "1", "pushed_at": "1" if repo == "owner/same" else "2", **({"languages": {"Go": 100.0}, "language_bytes": {"Go": 10}} if languages else {})} for repo in batch]
+    mockGetRepoInfoBatch.side_effect = fetchBatch
+
+    result = runner.invoke(app, ["repobatch", str(source), "output.json", "--with-languages", "--backend", "graphql", "-a", "TOKEN", "--since-snapshot", str(snapshot)])
+
+    rows = writtenRows(mockOpenWriter)
+    assert result.exit_code == 0
+    assert [args[0] for args, _ in mockGetRepoInfoBatch.call_args_list] == [["owner/same", "owner/changed"], ["owner/changed"]]
+    assert [row["languages"] for row in rows] == [{"C": 100.0}, {"Go": 100.0}]
+
+@patch("gitfo.main.getUserInfo")
+def testUserbatchShardsMergeBackInSourceOrder(mockGetUserInfo, tmp_path):
+    source = tmp_path/"users.txt"
+    source.write_text("".join(f"user{i}\n" for i in range(40)))
+    mockGetUserInfo.side_effect = lambda user, auth: {"login": user}
+    outputs = [str(tmp_path/f"shard{i}.jsonl") for i in (1, 2, 3)]
+
+    for i, output in enumerate(outputs, 1):
+        result = runner.invoke(app, ["userbatch", str(source), output, "--shard", f"{i}/3"])
+        assert result.exit_code == 0
+    result = runner.invoke(app, ["merge", str(source), str(tmp_path/"merged.jsonl"), *outputs])
+
+    merged = [json.loads(line)["login"] for line in (tmp_path/"merged.jsonl").read_text().splitlines()]
+    assert result.exit_code == 0
+    assert mockGetUserInfo.call_count == 40
+    assert merged == [f"user{i}" for i in range(40)]
+
+@patch("gitfo.main.getUserInfo")
+def testUserbatchBadShard(mockGetUserInfo, tmp_path):
+    source = tmp_path/"users.txt"
+    source.write_text("user1\n")
+
+    result = runner.invoke(app, ["userbatch", str(source), "output.json", "--shard", "3/2"])
+
+    assert "Invalid shard" in result.output
+    mockGetUserInfo.assert_not_called()
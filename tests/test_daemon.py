@@ -0,0 +1,136 @@
+###################################
+#       Tests for daemon.py       #
+###################################
+
+import pytest, json, os, threading, time
+from typer.testing import CliRunner
+from unittest.mock import patch
+from gitfo import daemon, transport
+from gitfo.github_api import getApiUrl, setApiUrl
+from gitfo.main import app, DAEMON_OPERATIONS
+from benchmarks.mockserver import MockGitHub
+
+runner = CliRunner()
+
+# Settings of a daemon started without global options, matching a command run without them.
+SETTINGS = {"cache": True, "cache_size": 256, "retries": transport.DEFAULT_RETRIES}
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(operations: dict):
+        server = daemon.DaemonServer(operations, "127.0.0.1", 0, getApiUrl(), SETTINGS)
+        thread = threading.Thread(target=server.serve, daemon=True)
+        thread.start()
+        # The state file is written before the server starts accepting connections.
+        while daemon.readState() is None:
+            time.sleep(0.01)
+        servers.append((server, thread))
+        return server
+
+    yield start
+    for server, thread in servers:
+        server.stop()
+        thread.join()
+
+def testForwardRoundTrip(serve):
+    server = serve({"user": lambda params: {"login": params["target"], "pid": os.getpid()}})
+    daemon.setForwarding(True, SETTINGS)
+
+    assert daemon.forward("user", {"target": "octocat"}) == {"login": "octocat", "pid": os.getpid()}
+    assert daemon.readState()["url"] == server.url
+    assert oct(daemon.getStatePath().stat().st_mode & 0o777) == "0o600"
+
+def testForwardingDisabled(serve):
+    serve({"user": lambda params: {"login": "daemon"}})
+
+    assert daemon.forward("user", {"target": "octocat"}) is None
+
+def testForwardStream(serve):
+    serve({"repobatch": lambda params: ({"target": target, "info": {"full_name": target}} for target in params["targets"])})
+    daemon.setForwarding(True, SETTINGS)
+
+    rows = list(daemon.forward("repobatch", {"targets": ["a/b", "c/d"]}, stream=True))
+
+    assert [row["target"] for row in rows] == ["a/b", "c/d"]
+
+def testWrongKeyIsRejected(serve):
+    server = serve({"user": lambda params: {"login": "daemon"}})
+    server.key = "other"
+    daemon.setForwarding(True, SETTINGS)
+
+    assert daemon.forward("user", {"target": "octocat"}) is None
+
+def testOtherApiUrlIsNotForwarded(serve):
+    serve({"user": lambda params: {"login": "daemon"}})
+    daemon.setForwarding(True, SETTINGS)
+    setApiUrl("http://127.0.0.1:1")
+
+    assert daemon.forward("user", {"target": "octocat"}) is None
+
+@patch("gitfo.main.getUserInfo")
+@pytest.mark.parametrize("option", [["--no-cache"], ["--retries", "0"], ["--cache-size", "16"]])
+def testOtherSettingsRunLocally(mockGetUserInfo, option, serve):
+    serve({"user": lambda params: {"login": params["target"], "name": "From Daemon"}})
+    mockGetUserInfo.return_value = {"login": "octocat", "name": "Local"}
+
+    result = runner.invoke(app, [*option, "user", "octocat"])
+
+    assert "Local" in result.output
+    mockGetUserInfo.assert_called_once()
+
+def testStaleStateIsRemoved():
+    daemon._writeState({"url": "http://127.0.0.1:1", "pid": 2 ** 22 + 1, "key": "k", "api_url": getApiUrl(), "settings": SETTINGS})
+    daemon.setForwarding(True, SETTINGS)
+
+    assert daemon.forward("user", {"target": "octocat"}) is None
+    assert daemon.readState() is None
+
+def testStateIsRemovedOnStop(serve):
+    server = serve({})
+    server.stop()
+
+    for _ in range(100):
+        if daemon.readState() is None:
+            break
+        time.sleep(0.01)
+
+    assert daemon.readState() is None
+
+@patch("gitfo.main.getUserInfo")
+def testUserCommandForwards(mockGetUserInfo, serve):
+    serve({"user": lambda params: {"login": params["target"], "name": "From Daemon"}})
+
+    result = runner.invoke(app, ["user", "octocat"])
+
+    assert result.exit_code == 0
+    assert "From Daemon" in result.output
+    mockGetUserInfo.assert_not_called()
+
+@patch("gitfo.main.getUserInfo")
+def testNoDaemonRunsLocally(mockGetUserInfo, serve):
+    serve({"user": lambda params: {"login": params["target"], "name": "From Daemon"}})
+    mockGetUserInfo.return_value = {"login": "octocat", "name": "Local"}
+
+    result = runner.invoke(app, ["--no-daemon", "user", "octocat"])
+
+    assert "Local" in result.output
+    mockGetUserInfo.assert_called_once()
+
+def testRepobatchThroughDaemonAgainstMock(serve, tmp_path):
+    with MockGitHub() as mock:
+        source = tmp_path/"repos.txt"
+        source.write_text("owner/repo1\nowner/missing\nowner/repo2\n")
+        output = tmp_path/"output.jsonl"
+        setApiUrl(mock.url)
+        calls = []
+        serve({**DAEMON_OPERATIONS, "repobatch": lambda params: calls.append(params) or DAEMON_OPERATIONS["repobatch"](params)})
+
+        result = runner.invoke(app, ["--api-url", mock.url, "repobatch", str(source), str(output), "--with-languages"])
+
+        rows = [json.loads(line) for line in output.read_text().splitlines()]
+        assert result.exit_code == 0
+        assert calls[0]["targets"] == ["owner/repo1", "owner/missing", "owner/repo2"]
+        assert [row["full_name"] for row in rows] == ["owner/repo1", "owner/missing", "owner/repo2"]
+        assert "Python" in rows[0]["languages"]
@@ -0,0 +1,116 @@
+###################################################
+#       End-to-end tests against a mock API       #
+###################################################
+
+import pytest, json
+from typer.testing import CliRunner
+from gitfo.main import app
+from benchmarks.mockserver import MockGitHub, MockSettings, _number
+
+runner = CliRunner()
+
+@pytest.fixture
+def mock():
+    with MockGitHub(MockSettings(branches=250)) as server:
+        yield server
+
+def testRepobatchAgainstMock(mock, tmp_path):
+    source = tmp_path/"repos.txt"
+    source.write_text("\n".join([f"owner/repo{i}" for i in range(20)] + ["owner/missing"]))
+    output = tmp_path/"output.jsonl"
+
+    result = runner.invoke(app, ["--api-url", mock.url, "repobatch", str(source), str(output), "--full", "--workers", "4"])
+
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert result.exit_code == 0
+    assert [row["full_name"] for row in rows] == [f"owner/repo{i}" for i in range(20)] + ["owner/missing"]
+    assert len(rows[0]["branches"].split("|")) == 250
+    assert rows[-1]["error"] == "Not Found"
+
+def testConditionalRequestsAgainstMock(mock, tmp_path):
+    source = tmp_path/"users.txt"
+    source.write_text("octocat\nhubot\n")
+
+    for _ in range(2):
+        result = runner.invoke(app, ["--api-url", mock.url, "userbatch", str(source), str(tmp_path/"output.json")])
+        assert result.exit_code == 0
+
+    assert mock.requests == 4
+    assert mock.notModified == 2
+    assert json.loads((tmp_path/"output.json").read_text())[0]["login"] == "octocat"
+
+def testRetriesAgainstMock(tmp_path, monkeypatch):
+    monkeypatch.setattr("gitfo.transport.time.sleep", lambda seconds: None)
+    source = tmp_path/"users.txt"
+    source.write_text("\n".join(f"user{i}" for i in range(30)))
+    output = tmp_path/"output.json"
+
+    with MockGitHub(MockSettings(errorRate=0.3, seed=1)) as mock:
+        result = runner.invoke(app, ["--api-url", mock.url, "--retries", "10", "userbatch", str(source), str(output)])
+
+    assert result.exit_code == 0
+    assert len(json.loads(output.read_text())) == 30
+
+def testOrgreposAgainstMock(mock, tmp_path):
+    output = tmp_path/"output.jsonl"
+
+    result = runner.invoke(app, ["--api-url", mock.url, "orgrepos", "owner", str(output), "--with-languages", "--workers", "4"])
+
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert result.exit_code == 0
+    assert [row["full_name"] for row in rows] == [f"owner/repo{i}" for i in range(150)]
+    assert rows[0]["watchers"] is None
+    assert "Python" in rows[0]["languages"]
+    # Two listing pages plus one languages request per repository.
+    assert mock.requests == 2 + 150
+
+def testUserreposNotFoundAgainstMock(mock, tmp_path):
+    output = tmp_path/"output.jsonl"
+
+    result = runner.invoke(app, ["--api-url", mock.url, "userrepos", "missing-user", str(output)])
+
+    assert result.exit_code == 0
+    assert "not found" in result.output
+    assert not output.exists()
+
+def testRepobatchGroupByOwnerAgainstMock(mock, tmp_path):
+    source = tmp_path/"repos.txt"
+    source.write_text("\n".join([f"owner/repo{i}" for i in range(40)] + ["owner/private", "other/repo1"]))
+    grouped = tmp_path/"grouped.jsonl"
+    plain = tmp_path/"plain.jsonl"
+
+    result = runner.invoke(app, ["--api-url", mock.url, "--no-cache", "repobatch", str(source), str(grouped), "--group-by-owner", "--workers", "4"])
+    groupedRequests = mock.requests
+    runner.invoke(app, ["--api-url", mock.url, "--no-cache", "repobatch", str(source), str(plain)])
+
+    groupedRows = [json.loads(line) for line in grouped.read_text().splitlines()]
+    plainRows = [json.loads(line) for line in plain.read_text().splitlines()]
+    assert result.exit_code == 0
+    # One profile request, two listing pages and two direct calls instead of 42 direct calls.
+    assert groupedRequests == 1 + 2 + 2
+    assert [{**row, "watchers": None} for row in groupedRows] == [{**row, "watchers": None} for row in plainRows]
+
+def testRepobatchGraphqlAgainstMock(mock, tmp_path):
+    source = tmp_path/"repos.txt"
+    source.write_text("\n".join([f"owner/repo{i}" for i in range(20)] + ["owner/missing"]))
+    graphql = tmp_path/"graphql.jsonl"
+    rest = tmp_path/"rest.jsonl"
+
+    result = runner.invoke(app, ["--api-url", mock.url, "--no-cache", "repobatch", str(source), str(graphql), "--full", "--backend", "graphql", "-a", "token"])
+    runner.invoke(app, ["--api-url", mock.url, "--no-cache", "repobatch", str(source), str(rest), "--full", "-a", "token"])
+
+    graphqlRows = [json.loads(line) for line in graphql.read_text().splitlines()]
+    restRows = {row["full_name"]: row for row in map(json.loads, rest.read_text().splitlines())}
+    assert result.exit_code == 0
+    assert [row["full_name"] for row in graphqlRows] == [f"owner/repo{i}" for i in range(20)] + ["owner/missing"]
+    assert graphqlRows[-1]["error"] == "Not Found"
+    for row in graphqlRows[:-1]:
+        expected = restRows[row["full_name"]]
+        for field in ["stars", "watchers", "open_pull_requests", "languages", "branches", "latest_release"]:
+            assert row[field] == expected[field]
+
+def testOpenPRCountGraphqlAgainstMock(mock):
+    result = runner.invoke(app, ["--api-url", mock.url, "repo", "owner/repo1", "--full", "-a", "token"])
+
+    assert result.exit_code == 0
+    assert f"open_pull_requests: {_number('owner/repo1', 50)}" in result.output
@@ -4,9 +4,10 @@
 
 import pytest
 from unittest.mock import patch, MagicMock
-from gitfo.github_api import getRepoInfo, getLanguagesInfo, getReleasesInfo, getOpenPRCount, getRateLimit, getUserInfo
+from requests.structures import CaseInsensitiveDict
+from gitfo.github_api import getRepoInfo, getLanguagesInfo, getReleasesInfo, getOpenPRCount, getBranchesInfo, getRateLimit, getUserInfo, getLastPage, getOwnerRepos
 
-@patch("gitfo.github_api.requests.get")
+@patch("requests.Session.request")
 def testGetRepoInfo(mockGet):
     mockResponse = {
         "name": "Hello-World",
@@ -22,6 +23,7 @@ def testGetRepoInfo(mockGet):
         "default_branch": "master",
         "created_at": "2011-01-26T19:01:12Z",
         "updated_at": "2025-06-29T14:19:20Z",
+        "pushed_at": "2025-06-28T10:00:00Z",
         "topics": [],
         "owner": {
             "login": "octocat",
@@ -35,9 +37,10 @@ def testGetRepoInfo(mockGet):
     assert result["name"] == "Hello-World"
     assert result["license"] == None
     assert result["stars"] == 3004
+    assert result["pushed_at"] == "2025-06-28T10:00:00Z"
     assert result["owner"]["login"] == "octocat"
 
-@patch("gitfo.github_api.requests.get")
+@patch("requests.Session.request")
 def testGetRepoInfoNotFound(mockGet):
     mockResponse = {"message": "Not Found"}
 
@@ -46,7 +49,7 @@ def testGetRepoInfoNotFound(mockGet):
 
     assert result == {"message": "Not Found"}
 
-@patch("gitfo.github_api.requests.get")
+@patch("requests.Session.request")
 def testGetRepoInfoBadCredentials(mockGet):
     mockResponse = {"message": "Bad credentials"}
 
@@ -55,7 +58,7 @@ def testGetRepoInfoBadCredentials(mockGet):
 
     assert result == {"message": "Bad credentials"}
 
-@patch("gitfo.github_api.requests.get")
+@patch("requests.Session.request")
 def testGetRepoInfoRateLimitExceeded(mockGet):
     mockResponse = {"message": "API rate limit exceeded for user."}
 
@@ -64,7 +67,7 @@ def testGetRepoInfoRateLimitExceeded(mockGet):
 
     assert result == {"message": "API rate limit exceeded for user."}
 
-@patch("gitfo.github_api.requests.get")
+@patch("requests.Session.request")
 def testGetLanguageInfo(mockGet):
     mockResponse = {
         "HTML": 58.1,
@@ -76,8 +79,9 @@ def testGetLanguageInfo(mockGet):
 
     assert result["languages"]["HTML"] == 58.1
     assert result["languages"]["CSS"] == 41.9
+    assert result["language_bytes"] == {"HTML": 58.1, "CSS": 41.9}
 
-@patch("gitfo.github_api.requests.get")
+@patch("requests.Session.request")
 def testGetReleasesInfo(mockGet):
     mockResponse = {
         "tag_name": "v2.3.1",
@@ -96,7 +100,7 @@ def testGetReleasesInfo(mockGet):
     assert result["latest_release"]["body"] == "# NumPy 2.3.1 Release Notes\r"
     assert result["latest_release"]["html_url"] == "https://github.com/numpy/numpy/releases/tag/v2.3.1"
 
-@patch("gitfo.github_api.requests.get")
+@patch("requests.Session.request")
 def testGetOpenPRCount(mockGet):
     mockResponse = {
         "total_count": 600,
@@ -108,7 +112,40 @@ def testGetOpenPRCount(mockGet):
 
     assert result["open_pull_requests"] == 600
 
-@patch("gitfo.github_api.requests.get")
+@patch("requests.Session.request")
+def testGetOpenPRCountGraphql(mockGet):
+    mockResponse = {"data": {"repository": {"pullRequests": {"totalCount": 42}}}}
+
+    mockGet.return_value = MagicMock(status_code=200, json=lambda: mockResponse)
+    result = getOpenPRCount("octocat/Hello-World", "TestToken")
+
+    args, kwargs = mockGet.call_args
+    assert args[0] == "POST"
+    assert kwargs["json"]["variables"] == {"owner": "octocat", "name": "Hello-World"}
+    assert result["open_pull_requests"] == 42
+
+@patch("requests.Session.request")
+def testGetOpenPRCountSearchWithoutToken(mockGet):
+    mockResponse = {"total_count": 7, "items": []}
+
+    mockGet.return_value = MagicMock(status_code=200, json=lambda: mockResponse)
+    result = getOpenPRCount("octocat/Hello-World", None)
+
+    args, _ = mockGet.call_args
+    assert args[0] == "GET"
+    assert "/search/issues" in args[1]
+    assert result["open_pull_requests"] == 7
+
+@patch("requests.Session.request")
+def testGetOpenPRCountSearchFailure(mockGet):
+    mockResponse = {"message": "API rate limit exceeded for user."}
+
+    mockGet.return_value = MagicMock(status_code=403, json=lambda: mockResponse)
+    result = getOpenPRCount("octocat/Hello-World", None)
+
+    assert result["open_pull_requests"] == None
+
+@patch("requests.Session.request")
 def testGetRateLimit(mockGet):
     mockResponse = {
         "resources": {
@@ -127,7 +164,7 @@ def testGetRateLimit(mockGet):
     assert result["used"] == 0
     assert result["remaining"] == 5000
 
-@patch("gitfo.github_api.requests.get")
+@patch("requests.Session.request")
 def testGetRateLimitBadCredentials(mockGet):
     mockResponse = {"message": "Bad credentials"}
 
@@ -136,7 +173,7 @@ def testGetRateLimitBadCredentials(mockGet):
 
     assert result == {"message": "Bad credentials"}
 
-@patch("gitfo.github_api.requests.get")
+@patch("requests.Session.request")
 def testGetUserInfo(mockGet):
     mockResponse = {
         "login": "octocat",
@@ -167,7 +204,7 @@ def testGetUserInfo(mockGet):
     assert result["followers"] == 18464
     assert result["created_at"] == "2011-01-25T18:44:36Z"
 
-@patch("gitfo.github_api.requests.get")
+@patch("requests.Session.request")
 def testGetUserInfoNotFound(mockGet):
     mockResponse = {"message": "Not Found"}
 
@@ -176,7 +213,7 @@ def testGetUserInfoNotFound(mockGet):
 
     assert result == {"message": "Not Found"}
 
-@patch("gitfo.github_api.requests.get")
+@patch("requests.Session.request")
 def testGetUserInfoBadCredentials(mockGet):
     mockResponse = {"message": "Bad credentials"}
 
@@ -185,11 +222,71 @@ def testGetUserInfoBadCredentials(mockGet):
 
     assert result == {"message": "Bad credentials"}
 
-@patch("gitfo.github_api.requests.get")
+@patch("requests.Session.request")
 def testGetUserInfoRateLimitExceeded(mockGet):
     mockResponse = {"message": "API rate limit exceeded for user."}
 
     mockGet.return_value = MagicMock(status_code=404, json=lambda: mockResponse)
     result = getUserInfo("octocat", "TestToken")
 
-    assert result == {"message": "API rate limit exceeded for user."}
\ No newline at end of file
+    assert result == {"message": "API rate limit exceeded for user."}
+
+def testGetLastPage():
+    link = '<https://api.github.com/repositories/1/branches?per_page=100&page=2>; rel="next", <https://api.github.com/repositories/1/branches?per_page=100&page=4>; rel="last"'
+
+    assert getLastPage(link) == 4
+    assert getLastPage(None) == None
+
+@patch("requests.Session.request")
+def testGetBranchesInfoPaginated(mockGet):
+    link = '<https://api.github.com/repositories/1/branches?per_page=100&page=3>; rel="last"'
+
+    def respond(method, url, headers, timeout):
+        page = int(url.split("page=")[-1]) if "&page=" in url else 1
+        names = [{"name": f"b{page}-{i}"} for i in range(100 if page < 3 else 5)]
+        return MagicMock(status_code=200, json=lambda: names, headers=CaseInsensitiveDict({"Link": link}))
+    mockGet.side_effect = respond
+
+    result = getBranchesInfo("octocat/Hello-World", "TestToken")
+
+    branches = result["branches"].split("|")
+    assert mockGet.call_count == 3
+    assert len(branches) == 205
+    assert branches[0] == "b1-0"
+    assert branches[-1] == "b3-4"
+    assert "per_page=100" in mockGet.call_args_list[0][0][1]
+
+@patch("requests.Session.request")
+def testGetBranchesInfoCountOnly(mockGet):
+    link = '<https://api.github.com/repositories/1/branches?per_page=1&page=2>; rel="next", <https://api.github.com/repositories/1/branches?per_page=1&page=742>; rel="last"'
+    mockGet.return_value = MagicMock(status_code=200, json=lambda: [{"name": "main"}], headers=CaseInsensitiveDict({"Link": link}))
+
+    result = getBranchesInfo("octocat/Hello-World", "TestToken", countOnly=True)
+
+    assert mockGet.call_count == 1
+    assert result == {"branches_count": 742}
+
+@patch("requests.Session.request")
+def testGetOwnerRepos(mockGet):
+    link = '<https://api.github.com/organizations/1/repos?per_page=100&page=2>; rel="last"'
+    listed = lambda name: {"name": name, "full_name": f"octo-org/{name}", "stargazers_count": 3, "pushed_at": "2025-01-01T00:00:00Z", "owner": {"login": "octo-org", "type": "Organization"}}
+
+    def respond(method, url, headers, timeout):
+        page = 2 if "&page=2" in url else 1
+        return MagicMock(status_code=200, json=lambda: [listed(f"repo{page}")], headers=CaseInsensitiveDict({"Link": link}))
+    mockGet.side_effect = respond
+
+    result = list(getOwnerRepos("octo-org", "TestToken", "orgs"))
+
+    assert "/orgs/octo-org/repos" in mockGet.call_args_list[0][0][1]
+    assert [repo["full_name"] for repo in result] == ["octo-org/repo1", "octo-org/repo2"]
+    assert result[0]["stars"] == 3
+    assert result[0]["watchers"] == None
+    assert result[0]["pushed_at"] == "2025-01-01T00:00:00Z"
+    assert result[0]["owner"] == {"login": "octo-org", "type": "Organization"}
+
+@patch("requests.Session.request")
+def testGetOwnerReposNotFound(mockGet):
+    mockGet.return_value = MagicMock(status_code=404, json=lambda: {"message": "Not Found"}, headers=CaseInsensitiveDict())
+
+    assert list(getOwnerRepos("missing", "TestToken")) == [{"message": "Not Found"}]
@@ -0,0 +1,79 @@
+####################################
+#       Tests for graphql.py       #
+####################################
+
+import pytest
+from unittest.mock import patch, MagicMock
+from gitfo.graphql import buildQuery, getRepoInfoBatch
+
+NODE = {
+    "name": "Hello-World",
+    "nameWithOwner": "octocat/Hello-World",
+    "description": "My first repository on GitHub!",
+    "url": "https://github.com/octocat/Hello-World",
+    "visibility": "PUBLIC",
+    "licenseInfo": None,
+    "stargazerCount": 3004,
+    "forkCount": 3158,
+    "watchers": {"totalCount": 1732},
+    "issues": {"totalCount": 1000},
+    "pullRequests": {"totalCount": 764},
+    "defaultBranchRef": {"name": "master"},
+    "createdAt": "2011-01-26T19:01:12Z",
+    "updatedAt": "2025-06-29T14:19:20Z",
+    "pushedAt": "2025-06-28T10:00:00Z",
+    "repositoryTopics": {"nodes": [{"topic": {"name": "demo"}}]},
+    "owner": {"login": "octocat", "__typename": "User"},
+    "latestRelease": None,
+    "refs": {"totalCount": 2, "nodes": [{"name": "master"}, {"name": "test"}]},
+    "languages": {"totalSize": 100, "edges": [{"size": 75, "node": {"name": "Python"}}, {"size": 25, "node": {"name": "C"}}]},
+}
+
+def testBuildQueryUsesAliases():
+    query, variables = buildQuery(["octocat/Hello-World", "octocat/Spoon-Knife"], False, False)
+
+    assert "r0: repository(owner: $o0, name: $n0)" in query
+    assert "r1: repository(owner: $o1, name: $n1)" in query
+    assert "latestRelease" not in query
+    assert variables == {"o0": "octocat", "n0": "Hello-World", "o1": "octocat", "n1": "Spoon-Knife"}
+
+@patch("gitfo.graphql.transport.post")
+def testGetRepoInfoBatchShape(mockPost):
+    mockPost.return_value = MagicMock(status_code=200, json=lambda: {"data": {"r0": NODE, "r1": None}})
+
+    result = getRepoInfoBatch(["octocat/Hello-World", "octocat/missing", "invalid"], "TestToken", full=True)
+
+    assert mockPost.call_count == 1
+    assert list(result[0].keys()) == [
+        "name", "full_name", "description", "html_url", "visibility", "license", "stars", "forks", "watchers",
+        "open_issues", "default_branch", "created_at", "updated_at", "pushed_at", "topics", "owner",
+        "latest_release", "open_pull_requests", "branches", "languages", "language_bytes",
+    ]
+    assert result[0]["visibility"] == "public"
+    assert result[0]["open_issues"] == 1764
+    assert result[0]["owner"] == {"login": "octocat", "type": "User"}
+    assert result[0]["branches"] == "master|test"
+    assert result[0]["languages"] == {"Python": 75.0, "C": 25.0}
+    assert result[0]["language_bytes"] == {"Python": 75, "C": 25}
+    assert result[1] == {"full_name": "octocat/missing", "error": "Not Found"}
+    assert result[2] == {"full_name": "invalid", "error": "Not Found"}
+
+@patch("gitfo.graphql.getBranchesInfo")
+@patch("gitfo.graphql.transport.post")
+def testGetRepoInfoBatchManyBranchesFallsBack(mockPost, mockGetBranches):
+    node = dict(NODE, refs={"totalCount": 250, "nodes": [{"name": "a"}]})
+    mockPost.return_value = MagicMock(status_code=200, json=lambda: {"data": {"r0": node}})
+    mockGetBranches.return_value = {"branches": "a|b"}
+
+    result = getRepoInfoBatch(["octocat/Hello-World"], "TestToken", full=True)
+
+    mockGetBranches.assert_called_once_with("octocat/Hello-World", "TestToken")
+    assert result[0]["branches"] == "a|b"
+
+@patch("gitfo.graphql.transport.post")
+def testGetRepoInfoBatchBadCredentials(mockPost):
+    mockPost.return_value = MagicMock(status_code=401, json=lambda: {"message": "Bad credentials"})
+
+    result = getRepoInfoBatch(["octocat/Hello-World"], "BadToken")
+
+    assert result == [{"message": "Bad credentials"}]
@@ -0,0 +1,39 @@
+####################################
+#       Tests for journal.py       #
+####################################
+
+import pytest, json, os
+from gitfo.journal import Journal, getJournalPath
+
+def testRecordAndRead(tmp_path):
+    path = str(tmp_path/"out.json.journal")
+
+    with Journal(path) as journal:
+        journal.record("octocat", {"login": "octocat"})
+        journal.record("hubot", {"login": "hubot"})
+
+        assert journal.read("octocat") == {"login": "octocat"}
+        assert journal.read("hubot") == {"login": "hubot"}
+
+def testLoadSkipsTruncatedLine(tmp_path):
+    path = tmp_path/"out.json.journal"
+    path.write_text(json.dumps({"target": "octocat", "info": {"login": "octocat"}}) + '\n{"target": "hub')
+
+    with Journal(str(path)) as journal:
+        done = journal.load()
+        journal.record("hubot", {"login": "hubot"})
+
+        assert list(done) == ["octocat", "hubot"]
+        assert journal.read("hubot") == {"login": "hubot"}
+
+def testRemove(tmp_path):
+    path = str(tmp_path/"out.json.journal")
+    journal = Journal(path)
+    journal.record("octocat", {"login": "octocat"})
+
+    journal.remove()
+
+    assert not os.path.exists(path)
+
+def testGetJournalPath():
+    assert getJournalPath("out.json") == "out.json.journal"
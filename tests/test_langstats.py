@@ -0,0 +1,97 @@
+##################################
+#     Tests for langstats.py     #
+##################################
+
+import pytest, json, click
+from typer.testing import CliRunner
+from gitfo.main import app
+from gitfo.langstats import LanguageMatrix, languageTotals, ownerTotals, importNumpy
+from gitfo.util import CsvWriter
+
+runner = CliRunner()
+
+ROWS = [
+    {"full_name": "acme/api", "language_bytes": {"Go": 900, "Shell": 100}},
+    {"full_name": "acme/web", "language_bytes": {"TypeScript": 600, "Shell": 400}},
+    {"full_name": "Other/tool", "language_bytes": {"Python": 1000}},
+    {"full_name": "acme/empty", "language_bytes": {}},
+    {"full_name": "acme/old", "languages": {"C": 100.0}},
+    {"full_name": "acme/missing", "error": "Not Found"},
+]
+
+def buildMatrix(rows=ROWS)-> LanguageMatrix:
+    matrix = LanguageMatrix()
+    for row in rows:
+        matrix.add(row)
+    return matrix
+
+def testLanguageMatrixSkipsRowsWithoutBytes():
+    matrix = buildMatrix()
+
+    assert matrix.repoCount == 4
+    assert matrix.skipped == 1
+    assert list(matrix.languages) == ["Go", "Shell", "TypeScript", "Python"]
+
+def testLanguageTotalsAreByteWeighted():
+    pytest.importorskip("numpy")
+
+    rows = languageTotals(buildMatrix(), top=3)
+
+    assert rows == [
+        {"language": "Python", "bytes": 1000, "share": 33.33, "repos": 1},
+        {"language": "Go", "bytes": 900, "share": 30.0, "repos": 1},
+        {"language": "TypeScript", "bytes": 600, "share": 20.0, "repos": 1},
+    ]
+
+def testOwnerTotals():
+    pytest.importorskip("numpy")
+
+    rows = ownerTotals(buildMatrix(), top=2)
+
+    assert rows == [
+        {"owner": "acme", "language": "Go", "bytes": 900, "share": 45.0, "repos": 1},
+        {"owner": "acme", "language": "TypeScript", "bytes": 600, "share": 30.0, "repos": 1},
+        {"owner": "other", "language": "Python", "bytes": 1000, "share": 100.0, "repos": 1},
+    ]
+
+def testTotalsOfEmptyMatrix():
+    pytest.importorskip("numpy")
+
+    assert languageTotals(LanguageMatrix()) == []
+    assert ownerTotals(LanguageMatrix()) == []
+
+def testMissingNumpy(monkeypatch, capsys):
+    monkeypatch.setitem(__import__("sys").modules, "numpy", None)
+
+    with pytest.raises(click.exceptions.Exit):
+        importNumpy()
+
+    assert "pip install numpy" in capsys.readouterr().out
+
+def testLangstatsCommand(tmp_path):
+    pytest.importorskip("numpy")
+    jsonl = tmp_path/"part1.jsonl"
+    jsonl.write_text("".join(json.dumps(row) + "\n" for row in ROWS[:2]))
+    csvFile = tmp_path/"part2.csv"
+    with CsvWriter(open(csvFile, "w", newline=""), ["full_name", "language_bytes"]) as writer:
+        writer.write(ROWS[2])
+    output = tmp_path/"stats.json"
+
+    result = runner.invoke(app, ["langstats", str(jsonl), str(csvFile), "-o", str(output), "--top", "1", "--by-owner"])
+
+    assert result.exit_code == 0
+    assert json.loads(output.read_text()) == [
+        {"owner": "acme", "language": "Go", "bytes": 900, "share": 45.0, "repos": 1},
+        {"owner": "other", "language": "Python", "bytes": 1000, "share": 100.0, "repos": 1},
+    ]
+
+def testLangstatsPrintsAndWarns(tmp_path):
+    pytest.importorskip("numpy")
+    jsonl = tmp_path/"repos.jsonl"
+    jsonl.write_text("".join(json.dumps(row) + "\n" for row in ROWS))
+
+    result = runner.invoke(app, ["langstats", str(jsonl), "--top", "2"])
+
+    assert result.exit_code == 0
+    assert "Skipped 1 repositories" in result.output
+    assert "Python: 1000 bytes, 33.33%, 1 repositories" in result.output
@@ -0,0 +1,72 @@
+##################################
+#       Tests for merge.py       #
+##################################
+
+import pytest, json, csv, click
+from gitfo.merge import mergeShards, iterRows, checkShards, readFieldnames
+from gitfo.util import JsonWriter, CsvWriter
+
+def writeJson(path, rows):
+    with JsonWriter(open(path, "w")) as writer:
+        for row in rows:
+            writer.write(row)
+
+def testIterRowsStreamsJsonArray(tmp_path, monkeypatch):
+    monkeypatch.setattr("gitfo.merge.CHUNK_SIZE", 7)
+    path = tmp_path/"shard.json"
+    rows = [{"full_name": f"o/r{i}", "topics": ["a", "b"], "owner": {"login": "o"}} for i in range(5)]
+    writeJson(path, rows)
+
+    assert list(iterRows(str(path))) == rows
+
+def testIterRowsEmptyJsonArray(tmp_path):
+    path = tmp_path/"shard.json"
+    writeJson(path, [])
+
+    assert list(iterRows(str(path))) == []
+
+def testMergeShardsKeepsSourceOrder(tmp_path):
+    source = tmp_path/"repos.txt"
+    source.write_text("o/a\no/b\no/c\no/d\no/e\n")
+    first, second = tmp_path/"1.jsonl", tmp_path/"2.jsonl"
+    first.write_text("".join(json.dumps({"full_name": name}) + "\n" for name in ["o/a", "O/D"]))
+    second.write_text("".join(json.dumps({"full_name": name}) + "\n" for name in ["o/b", "o/e"]))
+
+    merged = [row["full_name"] for row in mergeShards(str(source), [str(first), str(second)])]
+
+    assert merged == ["o/a", "o/b", "O/D", "o/e"]
+
+def testMergeShardsEmitsUnknownRowsInPlace(tmp_path):
+    source = tmp_path/"repos.txt"
+    source.write_text("o/a\no/old\no/c\n")
+    first = tmp_path/"1.jsonl"
+    first.write_text("".join(json.dumps(row) + "\n" for row in [{"full_name": "o/a"}, {"full_name": "o/new"}, {"message": "API rate limit exceeded"}, {"full_name": "o/c"}]))
+
+    merged = list(mergeShards(str(source), [str(first)]))
+
+    assert merged == [{"full_name": "o/a"}, {"full_name": "o/new"}, {"message": "API rate limit exceeded"}, {"full_name": "o/c"}]
+
+def testMergeCsvShards(tmp_path):
+    source = tmp_path/"users.txt"
+    source.write_text("u1\nu2\n")
+    paths = []
+    for i, row in enumerate([{"login": "u2", "id": 2}, {"login": "u1", "name": "One"}]):
+        path = tmp_path/f"{i}.csv"
+        with CsvWriter(open(path, "w", newline=""), row.keys()) as writer:
+            writer.write(row)
+        paths.append(str(path))
+
+    assert readFieldnames(paths) == ["id", "login", "name"]
+    assert [row["login"] for row in mergeShards(str(source), paths)] == ["u1", "u2"]
+
+def testCheckShardsRejectsMixedTypes(tmp_path, capsys):
+    with pytest.raises(click.exceptions.Exit):
+        checkShards(["a.json", "b.jsonl"], "out.json")
+
+    assert "Shards must" in capsys.readouterr().out
+
+def testCheckShardsRequiresSameOutputType(tmp_path, capsys):
+    with pytest.raises(click.exceptions.Exit):
+        checkShards(["a.json", "b.json"], "out.csv")
+
+    assert "same type" in capsys.readouterr().out
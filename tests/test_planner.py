@@ -0,0 +1,67 @@
+####################################
+#       Tests for planner.py       #
+####################################
+
+import pytest
+from unittest.mock import patch
+from gitfo.planner import OwnerPlanner, countOwners
+
+def listed(owner: str, count: int)-> list:
+    return [{"full_name": f"{owner}/repo{i}", "stars": i} for i in range(count)]
+
+def testCountOwners():
+    counts = countOwners(["Octocat/a", "octocat/b", "hubot/c", "invalid"])
+
+    assert counts == {"octocat": 2, "hubot": 1}
+
+@patch("gitfo.planner.getRepoInfo")
+@patch("gitfo.planner.getOwnerRepos")
+@patch("gitfo.planner.getUserInfo")
+def testServesGroupedOwnersFromListing(mockGetUserInfo, mockGetOwnerRepos, mockGetRepoInfo):
+    mockGetUserInfo.return_value = {"login": "octocat", "public_repos": 150}
+    mockGetOwnerRepos.return_value = iter(listed("octocat", 150))
+    mockGetRepoInfo.side_effect = lambda target, token: {"full_name": target, "direct": True}
+    targets = ["octocat/repo1", "OCTOCAT/Repo2", "octocat/private", "octocat/repo3", "hubot/solo"]
+    planner = OwnerPlanner(countOwners(targets), "TestToken")
+
+    infos = [planner.getRepoInfo(target) for target in targets]
+
+    assert mockGetOwnerRepos.call_count == 1
+    assert [info.get("stars") for info in infos[:2]] == [1, 2]
+    assert infos[2] == {"full_name": "octocat/private", "direct": True}
+    assert infos[4] == {"full_name": "hubot/solo", "direct": True}
+    assert planner.listed == 3
+    assert planner.listings == {"octocat": None}
+
+@patch("gitfo.planner.getRepoInfo")
+@patch("gitfo.planner.getOwnerRepos")
+@patch("gitfo.planner.getUserInfo")
+def testLargeOwnersAreFetchedIndividually(mockGetUserInfo, mockGetOwnerRepos, mockGetRepoInfo):
+    # Listing 5000 repositories takes 50 pages, more than fetching the 3 targets directly.
+    mockGetUserInfo.return_value = {"login": "big-org", "public_repos": 5000}
+    mockGetRepoInfo.side_effect = lambda target, token: {"full_name": target}
+    targets = ["big-org/a", "big-org/b", "big-org/c"]
+    planner = OwnerPlanner(countOwners(targets), "TestToken")
+
+    infos = [planner.getRepoInfo(target) for target in targets]
+
+    mockGetUserInfo.assert_called_once_with("big-org", "TestToken")
+    mockGetOwnerRepos.assert_not_called()
+    assert mockGetRepoInfo.call_count == 3
+    assert planner.listed == 0
+
+@patch("gitfo.planner.getRepoInfo")
+@patch("gitfo.planner.getOwnerRepos")
+@patch("gitfo.planner.getUserInfo")
+def testFailedListingFallsBack(mockGetUserInfo, mockGetOwnerRepos, mockGetRepoInfo):
+    mockGetUserInfo.return_value = {"login": "octocat", "public_repos": 10}
+    mockGetOwnerRepos.return_value = iter([{"message": "API rate limit exceeded"}])
+    mockGetRepoInfo.side_effect = lambda target, token: {"full_name": target}
+    targets = [f"octocat/repo{i}" for i in range(4)]
+    planner = OwnerPlanner(countOwners(targets), "TestToken")
+
+    infos = [planner.getRepoInfo(target) for target in targets]
+
+    assert mockGetOwnerRepos.call_count == 1
+    assert mockGetRepoInfo.call_count == 4
+    assert infos[0] == {"full_name": "octocat/repo0"}
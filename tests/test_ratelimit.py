@@ -0,0 +1,137 @@
+######################################
+#       Tests for ratelimit.py       #
+######################################
+
+import pytest, time
+from unittest.mock import patch, MagicMock
+from requests.structures import CaseInsensitiveDict
+from gitfo import transport
+from gitfo.ratelimit import RateLimiter, getResource, isRateLimited
+
+def headers(remaining, reset, resource="core", limit=5000):
+    return CaseInsensitiveDict({
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(reset),
+        "X-RateLimit-Resource": resource,
+    })
+
+def testGetResource():
+    assert getResource("https://api.github.com/repos/octocat/Hello-World") == "core"
+    assert getResource("https://api.github.com/search/issues?q=repo:a/b") == "search"
+    assert getResource("https://api.github.com/graphql") == "graphql"
+
+def testIsRateLimited():
+    assert isRateLimited(MagicMock(status_code=403, headers=headers(0, 1)))
+    assert isRateLimited(MagicMock(status_code=429, headers=CaseInsensitiveDict({"Retry-After": "5"})))
+    assert not isRateLimited(MagicMock(status_code=403, headers=headers(10, 1)))
+    assert not isRateLimited(MagicMock(status_code=200, headers=headers(0, 1)))
+
+def testIsRateLimitedGraphql():
+    limited = {"errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]}
+
+    assert isRateLimited(MagicMock(status_code=200, headers=headers(0, 1, resource="graphql"), json=lambda: limited), "graphql")
+    assert not isRateLimited(MagicMock(status_code=200, headers=headers(0, 1, resource="graphql"), json=lambda: {"data": {}}), "graphql")
+    assert not isRateLimited(MagicMock(status_code=200, headers=headers(10, 1, resource="graphql"), json=lambda: limited), "graphql")
+
+def testBucketsAreSeparate():
+    limiter = RateLimiter()
+    limiter.update("core", headers(100, time.time() + 60))
+    limiter.update("search", headers(0, time.time() + 60, resource="search", limit=30))
+
+    snapshot = limiter.snapshot()
+    assert snapshot["core"]["remaining"] == 100
+    assert snapshot["search"]["remaining"] == 0
+    assert snapshot["graphql"]["remaining"] == None
+
+def testUpdateKeepsLowestInWindow():
+    limiter = RateLimiter()
+    reset = time.time() + 60
+    limiter.update("core", headers(10, reset))
+    limiter.update("core", headers(12, reset))
+
+    assert limiter.snapshot()["core"]["remaining"] == 10
+
+@patch("gitfo.ratelimit.time.sleep")
+def testAcquireSpendsTokens(mockSleep):
+    limiter = RateLimiter()
+    limiter.update("core", headers(2, time.time() + 60))
+
+    limiter.acquire("core")
+    limiter.acquire("core")
+
+    assert limiter.snapshot()["core"]["remaining"] == 0
+
+def testAcquireDoesNotPaceHealthyQuota():
+    limiter = RateLimiter()
+    limiter.update("core", headers(4000, time.time() + 3600))
+
+    start = time.time()
+    for _ in range(10):
+        limiter.acquire("core")
+
+    assert time.time() - start < 1
+
+@patch("gitfo.ratelimit.time.sleep")
+def testAcquirePacesLowQuota(mockSleep):
+    limiter = RateLimiter()
+    limiter.update("core", headers(100, time.time() + 100))
+
+    for _ in range(3):
+        limiter.acquire("core")
+
+    delays = [call[0][0] for call in mockSleep.call_args_list]
+    assert len(delays) == 2
+    assert 0.9 <= delays[0] <= 1.1
+    assert 1.9 <= delays[1] <= 2.1
+
+@patch("gitfo.ratelimit.time.sleep")
+def testAcquireWaitsUntilReset(mockSleep):
+    limiter = RateLimiter()
+    limiter.update("core", headers(0, time.time() + 30))
+    mockSleep.side_effect = lambda seconds: limiter.update("core", headers(5000, time.time() + 3600))
+
+    limiter.acquire("core")
+
+    mockSleep.assert_called_once()
+    assert 29 <= mockSleep.call_args[0][0] <= 32
+
+@patch("gitfo.ratelimit.time.sleep")
+@patch("requests.Session.request")
+def testTransportRetriesAfterRateLimit(mockRequest, mockSleep):
+    transport.setWaitForReset(True)
+    limited = MagicMock(status_code=403, headers=headers(0, time.time() + 5))
+    ok = MagicMock(status_code=200, headers=headers(4999, time.time() + 3600))
+    mockRequest.side_effect = [limited, ok]
+    mockSleep.side_effect = lambda seconds: transport.getLimiter("TestToken").update("core", headers(5000, time.time() + 3600))
+
+    result = transport.get("https://api.github.com/repos/octocat/Hello-World", "TestToken")
+
+    assert result is ok
+    assert mockRequest.call_count == 2
+    mockSleep.assert_called_once()
+
+@patch("gitfo.ratelimit.time.sleep")
+@patch("requests.Session.request")
+def testTransportRetriesGraphqlRateLimit(mockRequest, mockSleep):
+    transport.setWaitForReset(True)
+    limited = MagicMock(status_code=200, headers=headers(0, time.time() + 5, resource="graphql"), json=lambda: {"errors": [{"type": "RATE_LIMITED"}]})
+    ok = MagicMock(status_code=200, headers=headers(4999, time.time() + 3600, resource="graphql"), json=lambda: {"data": {}})
+    mockRequest.side_effect = [limited, ok]
+    mockSleep.side_effect = lambda seconds: transport.getLimiter("TestToken").update("graphql", headers(5000, time.time() + 3600, resource="graphql"))
+
+    result = transport.post("https://api.github.com/graphql", "TestToken", {"query": "{}"})
+
+    assert result is ok
+    assert mockRequest.call_count == 2
+    mockSleep.assert_called_once()
+
+@patch("requests.Session.request")
+def testTransportReturnsRateLimitWithoutWaiting(mockRequest):
+    limited = MagicMock(status_code=403, headers=headers(0, time.time() + 5))
+    mockRequest.return_value = limited
+
+    result = transport.get("https://api.github.com/repos/octocat/Hello-World", "TestToken")
+
+    assert result is limited
+    assert mockRequest.call_count == 1
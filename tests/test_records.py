@@ -0,0 +1,69 @@
+##################################
+#      Tests for records.py      #
+##################################
+
+import pytest, json
+from gitfo.records import RepoRecord, ReleaseRecord, LanguagesRecord, makeRepo, makeOwner, makeUser
+from gitfo.util import toPlain, JsonlWriter
+
+def testRecordBehavesLikeDict():
+    info = RepoRecord(full_name="octocat/Hello-World", stars=10)
+
+    info.update({"latest_release": None, "open_pull_requests": 2})
+    info["stars"] += 1
+
+    assert info == {"full_name": "octocat/Hello-World", "stars": 11, "latest_release": None, "open_pull_requests": 2}
+    assert "message" not in info
+    assert info.get("error") is None
+    assert list(info) == ["full_name", "stars", "latest_release", "open_pull_requests"]
+    with pytest.raises(KeyError):
+        info["forks"]
+
+def testRecordKeepsUnknownKeys():
+    info = RepoRecord(full_name="octocat/Hello-World")
+
+    info["custom"] = 1
+    del info["full_name"]
+
+    assert info == {"custom": 1}
+    assert len(info) == 1
+
+def testRecordHasNoInstanceDict():
+    assert not hasattr(RepoRecord(), "__dict__")
+    assert not hasattr(LanguagesRecord(), "__dict__")
+
+def testRepeatedStringsAreInterned():
+    first = makeRepo({"visibility": "".join(["pub", "lic"]), "topics": ["".join(["c", "li"])], "owner": makeOwner("a", "".join(["Organ", "ization"]))})
+    second = makeRepo({"visibility": "".join(["pub", "lic"]), "topics": ["".join(["c", "li"])], "owner": makeOwner("b", "".join(["Organ", "ization"]))})
+
+    assert first["visibility"] is second["visibility"]
+    assert first["topics"][0] is second["topics"][0]
+    assert first["owner"]["type"] is second["owner"]["type"]
+    assert makeUser({"type": "".join(["Us", "er"])})["type"] is makeUser({"type": "".join(["Us", "er"])})["type"]
+
+def testLanguagesRecord():
+    languages = LanguagesRecord([("Python", 80.0), ("Shell", 20.0)])
+
+    assert languages == {"Python": 80.0, "Shell": 20.0}
+    assert list(languages) == ["Python", "Shell"]
+    assert languages["Shell"] == 20.0
+    assert LanguagesRecord() == {}
+
+def testToPlainConvertsNestedRecords():
+    info = makeRepo({"full_name": "a/b", "topics": ["x"], "owner": makeOwner("a", "User")})
+    info["latest_release"] = ReleaseRecord(tag_name="v1")
+    info["languages"] = LanguagesRecord({"Python": 100.0})
+
+    plain = toPlain(info)
+
+    assert type(plain) is dict
+    assert type(plain["owner"]) is dict
+    assert type(plain["languages"]) is dict
+    assert json.loads(json.dumps(plain))["latest_release"] == {"tag_name": "v1"}
+
+def testWritersAcceptRecords(tmp_path):
+    path = tmp_path/"out.jsonl"
+    with JsonlWriter(open(path, "w")) as writer:
+        writer.write(makeRepo({"full_name": "a/b", "owner": makeOwner("a", "User")}))
+
+    assert json.loads(path.read_text())["owner"] == {"login": "a", "type": "User"}
@@ -0,0 +1,56 @@
+#####################################
+#       Tests for snapshot.py       #
+#####################################
+
+import pytest, click, json
+from gitfo.snapshot import Snapshot, getCarriedFields
+
+ROW = {"full_name": "octocat/Hello-World", "updated_at": "2025-01-01T00:00:00Z", "pushed_at": "2025-01-02T00:00:00Z", "languages": {"C": 100.0}}
+
+def testCarriedFields():
+    assert getCarriedFields(True, False) == ["latest_release", "open_pull_requests", "branches", "languages", "language_bytes"]
+    assert getCarriedFields(False, True, True) == ["languages", "language_bytes", "branches_count"]
+    assert getCarriedFields(False, False) == []
+
+def testLoadSkipsErrorRows(tmp_path):
+    path = tmp_path/"previous.json"
+    path.write_text(json.dumps([ROW, {"full_name": "octocat/missing", "error": "Not Found"}, {"message": "Bad credentials"}]))
+
+    snapshot = Snapshot.load(str(path), ["languages"])
+
+    assert list(snapshot.rows) == ["octocat/hello-world"]
+
+def testCarryForwardUnchanged(tmp_path):
+    path = tmp_path/"previous.jsonl"
+    path.write_text(json.dumps(ROW) + "\n")
+    snapshot = Snapshot.load(str(path), ["languages"])
+
+    info = {"full_name": "OctoCat/Hello-World", "updated_at": ROW["updated_at"], "pushed_at": ROW["pushed_at"]}
+
+    assert snapshot.carryForward(info)
+    assert info["languages"] == {"C": 100.0}
+    assert snapshot.carried == 1
+
+@pytest.mark.parametrize("change", [{"pushed_at": "2025-03-01T00:00:00Z"}, {"updated_at": "2025-03-01T00:00:00Z"}, {"pushed_at": None}])
+def testChangedRepositoryIsRefetched(tmp_path, change):
+    path = tmp_path/"previous.jsonl"
+    path.write_text(json.dumps(ROW) + "\n")
+    snapshot = Snapshot.load(str(path), ["languages"])
+
+    info = {"full_name": ROW["full_name"], "updated_at": ROW["updated_at"], "pushed_at": ROW["pushed_at"], **change}
+
+    assert not snapshot.carryForward(info)
+    assert "languages" not in info
+
+def testMissingFieldsAreRefetched(tmp_path):
+    path = tmp_path/"previous.jsonl"
+    path.write_text(json.dumps(ROW) + "\n")
+    snapshot = Snapshot.load(str(path), ["languages", "branches"])
+
+    assert not snapshot.carryForward({key: ROW[key] for key in ["full_name", "updated_at", "pushed_at"]})
+
+def testBadSnapshotType(tmp_path, capsys):
+    with pytest.raises(click.exceptions.Exit):
+        Snapshot.load(str(tmp_path/"previous.csv"), ["languages"])
+
+    assert "not supported" in capsys.readouterr().out
@@ -0,0 +1,115 @@
+###################################
+#       Tests for sqlite.py       #
+###################################
+
+import sqlite3, json
+from gitfo import sqlite
+from gitfo.util import openWriter, printOutputToFile, getRepoFields, USER_FIELDS
+
+REPO = {
+    "name": "Hello-World", "full_name": "octocat/Hello-World", "description": "My first repository", "stars": 80,
+    "topics": ["demo", "git"], "updated_at": "2024-01-01T00:00:00Z", "owner": {"login": "octocat", "type": "User"},
+    "latest_release": {"tag_name": "v1.0"}, "languages": {"C": 75.0, "Shell": 25.0},
+}
+
+def query(path, sql: str, *args)-> list:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(sql, args).fetchall()
+    finally:
+        conn.close()
+
+def testWritesTypedRepoRows(tmp_path):
+    path = tmp_path/"output.sqlite"
+
+    with openWriter(str(path), getRepoFields(True, False)) as writer:
+        writer.write(REPO)
+
+    assert query(path, "SELECT full_name, owner, owner_type, stars, error FROM repos") == [("octocat/Hello-World", "octocat", "User", 80, None)]
+    assert json.loads(query(path, "SELECT topics FROM repos")[0][0]) == ["demo", "git"]
+    assert query(path, "SELECT language, percent FROM repo_languages ORDER BY language") == [("C", 75.0), ("Shell", 25.0)]
+    assert query(path, "PRAGMA journal_mode") == [("wal",)]
+
+def testUpsertKeepsFieldsOfEarlierRuns(tmp_path):
+    path = tmp_path/"output.db"
+
+    with openWriter(str(path), getRepoFields(True, False)) as writer:
+        writer.write(REPO)
+    with openWriter(str(path), getRepoFields(False, False)) as writer:
+        writer.write({"full_name": "OCTOCAT/hello-world", "stars": 81, "owner": {"login": "octocat", "type": "User"}})
+
+    rows = query(path, "SELECT full_name, stars, latest_release FROM repos")
+    assert len(rows) == 1
+    assert rows[0][1] == 81
+    assert json.loads(rows[0][2]) == {"tag_name": "v1.0"}
+
+def testLanguagesAreReplaced(tmp_path):
+    path = tmp_path/"output.db"
+
+    with openWriter(str(path), getRepoFields(False, True)) as writer:
+        writer.write(REPO)
+        writer.write({**REPO, "languages": {"Go": 100.0}})
+
+    assert query(path, "SELECT language FROM repo_languages") == [("Go",)]
+
+def testErrorAndMessageRows(tmp_path):
+    path = tmp_path/"output.db"
+
+    with openWriter(str(path), USER_FIELDS) as writer:
+        writer.write({"login": "octocat", "followers": 10})
+        writer.write({"login": "ghost-user", "error": "Not Found"})
+        writer.write({"message": "API rate limit exceeded"})
+
+    assert query(path, "SELECT login, followers, error FROM users ORDER BY login") == [("ghost-user", None, "Not Found"), ("octocat", 10, None)]
+    assert query(path, "SELECT COUNT(*) FROM repos") == [(0,)]
+
+def testRowsAreWrittenInBatches(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite, "BATCH_ROWS", 2)
+    path = tmp_path/"output.db"
+
+    with openWriter(str(path), USER_FIELDS) as writer:
+        writer.write({"login": "a"})
+        assert query(path, "SELECT COUNT(*) FROM users") == [(0,)]
+        writer.write({"login": "b"})
+        assert query(path, "SELECT COUNT(*) FROM users") == [(2,)]
+        writer.write({"login": "c"})
+
+    assert query(path, "SELECT COUNT(*) FROM users") == [(3,)]
+
+def testIndexes(tmp_path):
+    path = tmp_path/"output.db"
+
+    with openWriter(str(path), USER_FIELDS):
+        pass
+
+    names = {row[0] for row in query(path, "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"repos_owner", "repos_stars", "repos_updated_at"} <= names
+
+def testAddsMissingColumns(tmp_path):
+    path = tmp_path/"output.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE repos (full_name TEXT PRIMARY KEY COLLATE NOCASE, stars INTEGER)")
+    conn.close()
+
+    with openWriter(str(path), getRepoFields(False, False)) as writer:
+        writer.write(REPO)
+
+    assert query(path, "SELECT description FROM repos") == [("My first repository",)]
+
+def testLanguageBytes(tmp_path):
+    path = tmp_path/"output.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE repo_languages (full_name TEXT NOT NULL COLLATE NOCASE, language TEXT NOT NULL, percent REAL, PRIMARY KEY (full_name, language))")
+    conn.close()
+
+    with openWriter(str(path), getRepoFields(False, True)) as writer:
+        writer.write({**REPO, "language_bytes": {"C": 300, "Shell": 100}})
+
+    assert query(path, "SELECT language, percent, bytes FROM repo_languages ORDER BY language") == [("C", 75.0, 300), ("Shell", 25.0, 100)]
+
+def testPrintOutputToSqlite(tmp_path):
+    path = tmp_path/"output.sqlite"
+
+    printOutputToFile(REPO, str(path))
+
+    assert query(path, "SELECT stars FROM repos") == [(80,)]
@@ -0,0 +1,37 @@
+##############################################
+#       Import-time budget for the CLI       #
+##############################################
+
+import subprocess, sys
+
+# Gitfo's own share of startup, excluding typer (and the rich it pulls in).
+IMPORT_BUDGET_US = 100_000
+DEFERRED_MODULES = {"requests", "urllib3", "charset_normalizer", "idna"}
+
+def importTimes(*args: str)-> dict:
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], capture_output=True, text=True, check=True)
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times.setdefault(name.strip(), int(cumulative))
+    return times
+
+def testImportingMainDefersRequests():
+    times = importTimes("-c", "import gitfo.main")
+
+    assert "gitfo.main" in times
+    assert DEFERRED_MODULES.isdisjoint(times)
+
+def testVersionDefersRequests():
+    times = importTimes("-m", "gitfo", "--version")
+
+    assert DEFERRED_MODULES.isdisjoint(times)
+
+def testImportTimeWithinBudget():
+    # Best of a few runs, so a busy machine does not fail the test.
+    own = min(times["gitfo.main"] - times["typer"] for times in (importTimes("-c", "import gitfo.main") for _ in range(3)))
+
+    assert own < IMPORT_BUDGET_US
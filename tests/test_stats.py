@@ -0,0 +1,64 @@
+##################################
+#       Tests for stats.py       #
+##################################
+
+import pytest, json
+from unittest.mock import patch, MagicMock
+from typer.testing import CliRunner
+from gitfo import stats
+from gitfo.main import app
+from gitfo.github_api import getUserInfo, getOwnerRepos
+
+runner = CliRunner()
+
+def testPercentile():
+    values = list(range(1, 101))
+
+    assert stats.percentile(values, 50) == 50
+    assert stats.percentile(values, 99) == 99
+    assert stats.percentile([], 50) == None
+
+def testInstrumentDisabled():
+    func = stats.instrument(lambda: 42)
+
+    assert func() == 42
+    assert stats.getCollector() == None
+
+@patch("requests.Session.request")
+def testEndpointAttribution(mockGet):
+    collector = stats.enable()
+    mockGet.return_value = MagicMock(status_code=200, content=b'{"login": "octocat"}', json=lambda: {"login": "octocat"})
+
+    getUserInfo("octocat", "TestToken")
+    getUserInfo("hubot", "TestToken")
+
+    report = collector.report()["endpoints"]["getUserInfo"]
+    assert report["calls"] == 2
+    assert report["bytes"] == 40
+    assert report["status_codes"] == {"200": 2}
+    assert report["rate_limit_units"] == 2
+    assert report["latency_ms"]["p50"] != None
+
+@patch("requests.Session.request")
+def testListingAttribution(mockGet):
+    collector = stats.enable()
+    repo = {"name": "Hello-World", "full_name": "octocat/Hello-World", "owner": {"login": "octocat", "type": "User"}}
+    mockGet.return_value = MagicMock(status_code=200, content=b"[]", headers={}, json=lambda: [repo])
+
+    repos = list(getOwnerRepos("octocat", "TestToken"))
+
+    report = collector.report()["endpoints"]
+    assert len(repos) == 1
+    assert report["getOwnerRepos"]["calls"] == 1
+    assert report["getOwnerRepos"]["status_codes"] == {"200": 1}
+    assert "other" not in report
+
+@patch("gitfo.main.getUserInfo")
+def testStatsFileOption(mockGetUserInfo, tmp_path):
+    mockGetUserInfo.return_value = {"login": "octocat"}
+    statsFile = tmp_path/"stats.json"
+
+    result = runner.invoke(app, ["--stats-file", str(statsFile), "user", "octocat"])
+
+    assert result.exit_code == 0
+    assert "endpoints" in json.loads(statsFile.read_text())
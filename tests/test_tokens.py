@@ -0,0 +1,69 @@
+###################################
+#       Tests for tokens.py       #
+###################################
+
+import pytest, time, typer
+from unittest.mock import patch, MagicMock
+from requests.structures import CaseInsensitiveDict
+from gitfo import transport
+from gitfo.tokens import TokenPool, readTokens
+
+def resources(remaining):
+    return {
+        resource: {"limit": 5000, "used": 5000 - remaining, "remaining": remaining, "reset": time.time() + 3600}
+        for resource in ["core", "search", "graphql"]
+    }
+
+def testReadTokens(tmp_path):
+    file = tmp_path/"tokens.txt"
+    file.write_text("tokenA\n\n# comment\ntokenB\n")
+
+    assert readTokens(str(file)) == ["tokenA", "tokenB"]
+
+@patch("gitfo.tokens.getRateLimitResources")
+def testChooseMostRemaining(mockResources):
+    mockResources.side_effect = lambda token: resources({"tokenA": 10, "tokenB": 4000}[token])
+
+    pool = TokenPool(["tokenA", "tokenB"])
+    pool.refresh()
+
+    assert pool.choose("core") == "tokenB"
+
+@patch("gitfo.tokens.getRateLimitResources")
+def testRefreshDropsBadCredentials(mockResources):
+    mockResources.side_effect = lambda token: {"message": "Bad credentials"} if token == "bad" else resources(100)
+
+    pool = TokenPool(["bad", "good"])
+    pool.refresh()
+
+    assert pool.tokens == ["good"]
+
+@patch("requests.Session.request")
+def testTransportDropsTokenOnBadCredentials(mockRequest):
+    pool = TokenPool(["bad", "good"])
+    transport.useTokenPool(pool)
+    transport.getLimiter("bad").seed("core", 5000, 5000, time.time() + 3600)
+    transport.getLimiter("good").seed("core", 5000, 10, time.time() + 3600)
+
+    def respond(method, url, headers, timeout):
+        if headers["Authorization"] == "token bad":
+            return MagicMock(status_code=401, headers=CaseInsensitiveDict())
+        return MagicMock(status_code=200, headers=CaseInsensitiveDict())
+    mockRequest.side_effect = respond
+
+    result = transport.get("https://api.github.com/users/octocat", None)
+
+    assert result.status_code == 200
+    assert pool.tokens == ["good"]
+
+@patch("requests.Session.request")
+def testTransportStopsWhenPoolIsEmpty(mockRequest, capsys):
+    pool = TokenPool(["bad"])
+    transport.useTokenPool(pool)
+    mockRequest.return_value = MagicMock(status_code=401, headers=CaseInsensitiveDict())
+
+    with pytest.raises(typer.Exit):
+        transport.get("https://api.github.com/users/octocat", None)
+
+    assert mockRequest.call_count == 1
+    assert "authorization token incorrect" in capsys.readouterr().err.lower()
@@ -0,0 +1,124 @@
+######################################
+#       Tests for transport.py       #
+######################################
+
+import pytest, click, requests, time
+from unittest.mock import patch, MagicMock
+from requests.structures import CaseInsensitiveDict
+from gitfo import transport
+
+def testSessionIsShared():
+    transport.configure()
+
+    assert transport.getSession() is transport.getSession()
+
+def testConfigurePoolSize():
+    transport.configure(25)
+    adapter = transport.getSession().get_adapter("https://api.github.com")
+
+    assert transport.getPoolSize() == 25
+    assert adapter._pool_maxsize == 25
+
+    transport.configure()
+
+@patch("requests.Session.request")
+def testGetSendsHeaders(mockGet):
+    mockGet.return_value = MagicMock(status_code=200)
+
+    transport.get("https://api.github.com/users/octocat", "TestToken")
+
+    _, kwargs = mockGet.call_args
+    assert kwargs["headers"]["Authorization"] == "token TestToken"
+    assert kwargs["timeout"] == 10
+
+@patch("gitfo.transport.time.sleep")
+@patch("requests.Session.request")
+def testGetNotResponding(mockGet, mockSleep, capsys):
+    mockGet.side_effect = requests.exceptions.ConnectionError()
+
+    with pytest.raises(click.exceptions.Exit):
+        transport.get("https://api.github.com/users/octocat", None)
+
+    captured = capsys.readouterr()
+    assert "api not responding" in captured.err.lower()
+    assert mockGet.call_count == transport.DEFAULT_RETRIES + 1
+
+@patch("gitfo.transport.time.sleep")
+@patch("requests.Session.request")
+def testGetRetriesServerErrors(mockGet, mockSleep):
+    ok = MagicMock(status_code=200)
+    mockGet.side_effect = [requests.exceptions.ConnectionError(), MagicMock(status_code=502), ok]
+
+    result = transport.get("https://api.github.com/users/octocat", None)
+
+    assert result is ok
+    assert mockSleep.call_count == 2
+
+@patch("gitfo.transport.time.sleep")
+@patch("requests.Session.request")
+def testGetHonoursRetryAfter(mockGet, mockSleep):
+    unavailable = MagicMock(status_code=503, headers=CaseInsensitiveDict({"Retry-After": "7"}))
+    mockGet.side_effect = [unavailable, MagicMock(status_code=200)]
+
+    transport.get("https://api.github.com/users/octocat", None)
+
+    mockSleep.assert_called_once_with(7.0)
+
+@patch("gitfo.transport.time.sleep")
+@patch("requests.Session.request")
+def testGetSecondaryRateLimit(mockGet, mockSleep):
+    limited = MagicMock(status_code=403, text='{"message": "You have exceeded a secondary rate limit."}', headers=CaseInsensitiveDict())
+    mockGet.side_effect = [limited, MagicMock(status_code=200)]
+
+    transport.get("https://api.github.com/users/octocat", None)
+
+    assert mockSleep.call_args[0][0] >= transport.SECONDARY_LIMIT_WAIT
+
+@patch("gitfo.transport.time.sleep")
+@patch("requests.Session.request")
+def testGetSecondaryRateLimitExhausted(mockGet, mockSleep, capsys):
+    transport.configureRetries(1)
+    mockGet.return_value = MagicMock(status_code=403, text='{"message": "You have exceeded a secondary rate limit."}', headers=CaseInsensitiveDict())
+
+    with pytest.raises(transport.ApiUnavailable):
+        transport.get("https://api.github.com/users/octocat", None)
+
+    assert "secondary rate limit" in capsys.readouterr().err.lower()
+    assert mockGet.call_count == 2
+
+def rateLimited(reset):
+    return MagicMock(status_code=403, text="", headers=CaseInsensitiveDict({
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset": str(reset),
+    }))
+
+@patch("gitfo.transport.time.sleep")
+@patch("requests.Session.request")
+def testRetryKeepsNoWaitMode(mockGet, mockSleep):
+    unavailable = MagicMock(status_code=502, headers=CaseInsensitiveDict({"Retry-After": "1"}))
+    limited = rateLimited(time.time() + 3600)
+    mockGet.side_effect = [unavailable, limited]
+
+    result = transport.get("https://api.github.com/repos/octocat/Hello-World", "TestToken")
+
+    assert result is limited
+    mockSleep.assert_called_once_with(1.0)
+
+@patch("gitfo.transport.time.sleep")
+@patch("requests.Session.request")
+def testRetryKeepsWaitMode(mockGet, mockSleep):
+    transport.setWaitForReset(True)
+    unavailable = MagicMock(status_code=502, headers=CaseInsensitiveDict({"Retry-After": "0"}))
+    ok = MagicMock(status_code=200, headers=CaseInsensitiveDict())
+    mockGet.side_effect = [unavailable, rateLimited(time.time() + 5), ok]
+    mockSleep.side_effect = lambda seconds: transport.getLimiter("TestToken").seed("core", 5000, 5000, time.time() + 3600)
+
+    result = transport.get("https://api.github.com/repos/octocat/Hello-World", "TestToken")
+
+    assert result is ok
+    assert mockGet.call_count == 3
+
+def testGetBackoffIsBounded():
+    for attempt in range(20):
+        assert 0 <= transport.getBackoff(attempt) <= transport.BACKOFF_MAX
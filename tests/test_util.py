@@ -2,8 +2,8 @@
 #       Tests for util.py       #
 #################################
 
-import pytest, typer, os, shutil, csv, json, click
-from gitfo.util import prepareForCsv, printOutput, printOutputToFile, getHeaders, getItems, printMultipleToFile, removeNotFound
+import pytest, typer, os, shutil, csv, json, click, time, gzip, io
+from gitfo.util import prepareForCsv, printOutput, printOutputToFile, getHeaders, getItems, iterItems, inShard, printMultipleToFile, removeNotFound, mapOrdered, openWriter, getRepoFields, USER_FIELDS
 
 TEST_DATA = {
   "name": "Test",
@@ -121,6 +121,40 @@ def testGetItems(tmp_path):
     result = getItems(str(file))
     assert result == ["octocat/Hello-World", "octocat/Spoon-Knife"]
 
+def testIterItemsSkipsBlanksCommentsAndDuplicates(tmp_path):
+    file = tmp_path/"repos.txt"
+    file.write_text("# owners\noctocat/Hello-World\n\n  \nOctocat/hello-world\noctocat/Spoon-Knife\n")
+
+    result = iterItems(str(file))
+
+    assert not isinstance(result, list)
+    assert list(result) == ["octocat/Hello-World", "octocat/Spoon-Knife"]
+
+def testIterItemsGzip(tmp_path):
+    file = tmp_path/"repos.txt.gz"
+    with gzip.open(file, "wt") as f:
+        f.write("octocat/Hello-World\noctocat/Spoon-Knife\n")
+
+    assert list(iterItems(str(file))) == ["octocat/Hello-World", "octocat/Spoon-Knife"]
+
+def testIterItemsStdin(monkeypatch):
+    monkeypatch.setattr("sys.stdin", io.StringIO("octocat\nhubot\n"))
+
+    assert list(iterItems("-")) == ["octocat", "hubot"]
+
+def testInShardPartitionsTargets():
+    targets = [f"owner/repo{i}" for i in range(200)]
+
+    shards = [[target for target in targets if inShard(target, (i, 3))] for i in (1, 2, 3)]
+
+    assert sorted(sum(shards, [])) == sorted(targets)
+    assert all(shard for shard in shards)
+
+def testInShardIsStableAndIgnoresCase():
+    assert inShard("Owner/Repo", (2, 4)) == inShard("owner/repo", (2, 4))
+    assert [inShard("octocat/Hello-World", (i, 4)) for i in (1, 2, 3, 4)].count(True) == 1
+    assert inShard("octocat/Hello-World", (1, 1))
+
 def testGetItemsBadFileType(tmp_path, capsys):
     file = tmp_path/"repos.csv"
     file.write_text("octocat/Hello-World\n")
@@ -187,4 +221,68 @@ def testRemoveNotFound():
 
     filtered = removeNotFound(infos)
 
-    assert filtered == expected
\ No newline at end of file
+    assert filtered == expected
+
+def testMapOrderedSequential():
+    result = list(mapOrdered(lambda x: x * 2, [1, 2, 3], 1))
+
+    assert result == [2, 4, 6]
+
+def testMapOrderedKeepsOrder():
+    def slow(x):
+        time.sleep(0.01 * (5 - x))
+        return x
+
+    result = list(mapOrdered(slow, range(5), 4))
+
+    assert result == [0, 1, 2, 3, 4]
+
+
+def testWriterJsonl(tmp_path):
+    outputFile = tmp_path/"output.jsonl"
+
+    with openWriter(str(outputFile), USER_FIELDS) as writer:
+        writer.write({"login": "octocat"})
+        assert outputFile.read_text() == '{"login": "octocat"}\n'
+        writer.write({"login": "hubot"})
+
+    lines = outputFile.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [{"login": "octocat"}, {"login": "hubot"}]
+
+def testWriterCsvFixedSchema(tmp_path):
+    outputFile = tmp_path/"output.csv"
+
+    with openWriter(str(outputFile), getRepoFields(False, True)) as writer:
+        writer.write({"full_name": "octocat/Hello-World", "languages": {"C": 100.0}})
+        writer.write({"full_name": "octocat/missing", "error": "Not Found"})
+
+    with open(outputFile, newline="") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+
+    assert reader.fieldnames == sorted(getRepoFields(False, True))
+    assert rows[0]["languages"] == "C:100.0"
+    assert rows[1]["error"] == "Not Found"
+
+def testWriterJsonEmpty(tmp_path):
+    outputFile = tmp_path/"output.json"
+
+    with openWriter(str(outputFile), USER_FIELDS):
+        pass
+
+    assert json.loads(outputFile.read_text()) == []
+
+def testWriterStdout(capsys):
+    with openWriter("-", USER_FIELDS) as writer:
+        writer.write({"login": "octocat"})
+
+    assert json.loads(capsys.readouterr().out) == {"login": "octocat"}
+
+def testWriterBadFileType(tmp_path, capsys):
+    outputFile = tmp_path/"output.test"
+
+    with pytest.raises(click.exceptions.Exit):
+        openWriter(str(outputFile), USER_FIELDS)
+
+    assert not outputFile.exists()
+    assert "not supported" in capsys.readouterr().out.lower()
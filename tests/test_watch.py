@@ -0,0 +1,96 @@
+##################################
+#       Tests for watch.py       #
+##################################
+
+import pytest, json
+from typer.testing import CliRunner
+from unittest.mock import patch
+from gitfo.main import app
+from gitfo.watch import Watcher, diffInfo
+
+runner = CliRunner()
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self)-> float:
+        return self.now
+
+    def sleep(self, seconds: float)-> None:
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+def testDiffInfo():
+    old = {"stars": 10, "forks": 2, "updated_at": "a", "latest_release": {"tag_name": "v1"}, "archived": False}
+    new = {"stars": 13, "forks": 2, "updated_at": "b", "latest_release": {"tag_name": "v2"}, "archived": True}
+
+    changes = diffInfo(old, new)
+
+    assert changes == {
+        "stars": {"old": 10, "new": 13, "delta": 3},
+        "latest_release": {"old": {"tag_name": "v1"}, "new": {"tag_name": "v2"}},
+        "archived": {"old": False, "new": True},
+    }
+    assert diffInfo(old, new, ["forks", "updated_at"]) == {"updated_at": {"old": "a", "new": "b"}}
+
+def testPollsAreSpreadAcrossInterval():
+    clock = FakeClock()
+    polled = []
+    def fetch(target):
+        polled.append((target, clock.now))
+        return {"full_name": target}
+
+    Watcher(["a/1", "a/2", "a/3", "a/4"], fetch, 60, clock=clock, sleep=clock.sleep).run(lambda event: None, cycles=2)
+
+    assert [when for _, when in polled] == [0, 15, 30, 45, 60, 75, 90, 105]
+
+def testOverrunCycleStartsNextImmediately():
+    clock = FakeClock()
+    def fetch(target):
+        clock.now += 40
+        return {"full_name": target}
+
+    Watcher(["a/1", "a/2"], fetch, 60, clock=clock, sleep=clock.sleep).run(lambda event: None, cycles=2)
+
+    assert clock.sleeps == []
+    assert clock.now == 160
+
+def testEmitsOnlyChanges():
+    clock = FakeClock()
+    responses = iter([{"stars": 1}, {"stars": 1}, {"message": "API rate limit exceeded"}, {"stars": 4}])
+    events = []
+
+    Watcher(["a/1"], lambda target: next(responses), 10, clock=clock, sleep=clock.sleep).run(events.append, cycles=4)
+
+    assert len(events) == 1
+    assert events[0]["target"] == "a/1"
+    assert events[0]["changes"] == {"stars": {"old": 1, "new": 4, "delta": 3}}
+
+@patch("gitfo.main.getReleasesInfo")
+@patch("gitfo.main.getRepoInfo")
+def testWatchCommand(mockGetRepoInfo, mockGetReleasesInfo, tmp_path):
+    source = tmp_path/"repos.txt"
+    source.write_text("octocat/Hello-World\n")
+    output = tmp_path/"events.jsonl"
+    stars = iter([10, 12])
+    tags = iter(["v1", "v2"])
+    mockGetRepoInfo.side_effect = lambda target, auth: {"full_name": target, "stars": next(stars), "updated_at": "x"}
+    mockGetReleasesInfo.side_effect = lambda target, auth: {"latest_release": {"tag_name": next(tags)}}
+
+    result = runner.invoke(app, ["watch", str(source), "-o", str(output), "--interval", "0", "--cycles", "2"])
+
+    events = [json.loads(line) for line in output.read_text().splitlines()]
+    assert result.exit_code == 0
+    assert len(events) == 1
+    assert events[0]["changes"]["stars"]["delta"] == 2
+    assert events[0]["changes"]["latest_release"]["new"] == {"tag_name": "v2"}
+
+def testWatchRejectsOtherOutputTypes(tmp_path):
+    source = tmp_path/"repos.txt"
+    source.write_text("octocat/Hello-World\n")
+
+    result = runner.invoke(app, ["watch", str(source), "-o", "events.csv"])
+
+    assert "Use .jsonl" in result.output